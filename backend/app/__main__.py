@@ -1 +1,58 @@
-from .seed import run; run()
+import argparse
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app")
+    sub = parser.add_subparsers(dest="command")
+    sub.add_parser("seed", help="demo 데이터 초기화 (기본 명령)")
+
+    ingest = sub.add_parser("ingest", help="월별 통계/센터 파일 대량 적재")
+    ingest.add_argument("path", help=".csv, .jsonl/.ndjson, .parquet (gzip 압축 .gz 가능)")
+    ingest.add_argument("--kind", choices=("stats", "centers"), default="stats")
+    ingest.add_argument("--batch-size", type=int, default=5000)
+
+    rollup = sub.add_parser("rollup", help="하위 레벨 통계로 상위 레벨(시군구/시도/전국) 다시 집계")
+    rollup.add_argument("--month", action="append", help="YYYY-MM (여러 번 지정 가능, 기본 전체 월)")
+
+    backfill = sub.add_parser("backfill-centers", help="위경도로 센터 region_code 채우기 (기존 값과 다르면 목록 출력)")
+    backfill.add_argument("--overwrite", action="store_true", help="이미 있는 region_code도 해석 결과로 바꾼다")
+
+    serve = sub.add_parser("serve", help="운영 서버 (gunicorn + uvicorn 워커, fork 전 캐시 워밍)")
+    serve.add_argument("--host", default="0.0.0.0")
+    serve.add_argument("--port", type=int, default=8000)
+    serve.add_argument("--workers", type=int, default=None, help="기본 WEB_CONCURRENCY 또는 CPU 수")
+    serve.add_argument("--timeout", type=int, default=60)
+
+    args = parser.parse_args(argv)
+    if args.command == "serve":
+        from .server import run
+        run(args.host, args.port, args.workers, args.timeout)
+    elif args.command == "rollup":
+        from .db import analyze, init_db
+        from .kpi import month_range
+        from .rollup import rollup
+        from .versioning import bump_data_version
+        init_db()
+        months = [month_range(m)[0] for m in args.month] if args.month else None
+        print(f"Rolled up {rollup(months):,} rows")
+        analyze()
+        bump_data_version()  # 실행 중인 서버 워커들이 poll로 캐시를 비우도록
+    elif args.command == "backfill-centers":
+        from sqlmodel import Session
+        from .db import engine, init_db
+        from .resolver import backfill_center_regions
+        init_db()
+        with Session(engine) as session:
+            filled, mismatched = backfill_center_regions(session, overwrite=args.overwrite)
+        print(f"Filled {filled:,} centers")
+        for center_id, stored, resolved in mismatched:
+            print(f"  center {center_id}: stored {stored}, resolved {resolved}")
+    elif args.command == "ingest":
+        from .ingest import run
+        run(args.path, kind=args.kind, batch_size=args.batch_size)
+    else:
+        from .seed import run
+        run()
+
+# 로그인 검증 프로세스 풀(spawn)이 이 모듈을 다시 import해도 명령이 재실행되지 않도록
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+from __future__ import annotations
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Generic, Hashable, TypeVar
+
+T = TypeVar("T")
+
+# 이름 있는 캐시 목록 (/metrics 적중률 노출용)
+CACHES: dict[str, "LRUCache"] = {}
+
+class LRUCache:
+    """스레드 안전한 크기 제한 LRU 캐시 (프로세스 로컬)"""
+
+    def __init__(self, maxsize: int = 128, name: str | None = None):
+        if name:
+            CACHES[name] = self
+        self.maxsize = max(1, maxsize)
+        self._data: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            return self._data.pop(key, default)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+class LazyValue(Generic[T]):
+    """처음 접근할 때 load()로 만들어 두는 값 (지역 트리, 센터 인덱스 등 프로세스 로컬 1개짜리 캐시).
+
+    invalidate()는 세대를 올리므로, 무효화 전에 시작한 load()의 결과는 그 호출에만 쓰고 보관하지 않는다
+    (커밋 전 데이터로 만든 값이 무효화 뒤에 다시 자리 잡지 않도록).
+    """
+
+    def __init__(self, load: Callable[[], T]):
+        self._load = load
+        self.value: T | None = None
+        self.generation = 0
+        self._load_lock = threading.Lock()
+        self._lock = threading.Lock()
+
+    def get(self) -> T:
+        value = self.value
+        if value is None:
+            with self._load_lock:
+                value = self.value
+                if value is None:
+                    generation = self.generation
+                    value = self._load()
+                    with self._lock:
+                        if generation == self.generation:
+                            self.value = value
+        return value
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self.value = None
+
+class TTLCache(LRUCache):
+    """항목마다 만료 시각을 갖는 LRU 캐시"""
+
+    def __init__(self, maxsize: int = 128, ttl: float = 60.0, name: str | None = None):
+        super().__init__(maxsize, name)
+        self.ttl = ttl
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = super().get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            with self._lock:
+                self._data.pop(key, None)
+                self.hits -= 1
+                self.misses += 1
+            return default
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        super().set(key, (time.monotonic() + ttl, value))
@@ -0,0 +1,120 @@
+"""
+컬럼 형식 응답 (Arrow IPC stream / MessagePack)
+
+Accept 헤더로 형식을 고르며, 조회 결과나 KPI 스냅샷 배열을 행 dict 없이 컬럼 단위로 그대로 인코딩한다.
+- application/vnd.apache.arrow.stream: 레코드 배치 하나. 반복 값이 많은 컬럼은 dictionary 인코딩,
+  응답 단위 값(KPI computed_at 등)은 스키마 메타데이터
+- application/msgpack: {"columns": {이름: 배열}, "metadata": {...}}
+pyarrow, msgpack은 requirements.txt에 포함되지만 import는 선택적으로 하며, 없는 형식만 요청하면 406을 돌려준다.
+"""
+from __future__ import annotations
+from datetime import date, datetime
+from typing import Mapping, Sequence
+
+import numpy as np
+from fastapi import HTTPException, Response
+
+from .metrics import timed_serialization
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+except ImportError:  # 선택 의존성
+    pa = None
+
+try:
+    import msgpack
+except ImportError:  # 선택 의존성
+    msgpack = None
+
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+MEDIA_FORMATS = {
+    ARROW_MEDIA_TYPE: "arrow",
+    MSGPACK_MEDIA_TYPE: "msgpack",
+    "application/x-msgpack": "msgpack",
+}
+FORMAT_MEDIA_TYPES = {"arrow": ARROW_MEDIA_TYPE, "msgpack": MSGPACK_MEDIA_TYPE}
+JSON_MEDIA_TYPES = ("application/json", "application/*", "*/*")
+
+def available(fmt: str) -> bool:
+    return (pa if fmt == "arrow" else msgpack) is not None
+
+def negotiate(accept: str | None) -> str | None:
+    """Accept -> 'arrow' | 'msgpack' | None(JSON). 고를 수 있는 형식이 설치되지 않은 바이너리뿐이면 406"""
+    if not accept:
+        return None
+    candidates: list[tuple[float, int, str | None]] = []
+    missing = []
+    for index, part in enumerate(accept.split(",")):
+        media, *params = (p.strip() for p in part.split(";"))
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        media = media.lower()
+        if q <= 0:
+            continue
+        fmt = MEDIA_FORMATS.get(media)
+        if fmt is None:
+            if media in JSON_MEDIA_TYPES:
+                candidates.append((q, -index, None))
+        elif available(fmt):
+            candidates.append((q, -index, fmt))
+        else:
+            missing.append(media)
+    if candidates:
+        return max(candidates, key=lambda c: c[:2])[2]
+    if missing:
+        raise HTTPException(406, f"{', '.join(missing)} is not available on this server (install pyarrow/msgpack)")
+    return None
+
+def _nullable_list(values) -> list:
+    # NaN -> None (JSON 응답의 null과 같게)
+    if isinstance(values, np.ndarray) and values.dtype.kind == "f":
+        out = values.astype(object)
+        out[np.isnan(values)] = None
+        return out.tolist()
+    return values.tolist() if isinstance(values, np.ndarray) else list(values)
+
+def _msgpack_default(obj):
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Cannot serialize {type(obj).__name__}")
+
+def encode_arrow(columns: Mapping[str, Sequence], metadata: Mapping[str, str] | None, dictionary: Sequence[str]) -> bytes:
+    arrays = []
+    for name, values in columns.items():
+        array = pa.array(values, from_pandas=True)  # NaN -> null
+        arrays.append(array.dictionary_encode() if name in dictionary else array)
+    batch = pa.RecordBatch.from_arrays(arrays, names=list(columns), metadata=dict(metadata or {}))
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, batch.schema) as writer:
+        writer.write_batch(batch)
+    return sink.getvalue().to_pybytes()
+
+def encode_msgpack(columns: Mapping[str, Sequence], metadata: Mapping[str, str] | None) -> bytes:
+    body = {"columns": {name: _nullable_list(values) for name, values in columns.items()}, "metadata": dict(metadata or {})}
+    return msgpack.packb(body, default=_msgpack_default)
+
+def encode_columns(
+    fmt: str, columns: Mapping[str, Sequence], metadata: Mapping[str, str] | None = None, dictionary: Sequence[str] = (),
+) -> bytes:
+    """컬럼 이름 -> 값 배열(list/tuple/ndarray, 모두 같은 길이)"""
+    with timed_serialization():
+        if fmt == "arrow":
+            return encode_arrow(columns, metadata, dictionary)
+        return encode_msgpack(columns, metadata)
+
+def columnar_response(
+    fmt: str, columns: Mapping[str, Sequence], metadata: Mapping[str, str] | None = None,
+    dictionary: Sequence[str] = (), headers: Mapping[str, str] | None = None,
+) -> Response:
+    body = encode_columns(fmt, columns, metadata, dictionary)
+    return Response(content=body, media_type=FORMAT_MEDIA_TYPES[fmt], headers=headers)
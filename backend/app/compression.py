@@ -0,0 +1,50 @@
+"""
+사전 압축 본문
+
+캐시에 오래 남는 본문(벡터 타일, KPI 스냅샷)은 한 번만 gzip(가능하면 brotli)으로 압축해 두고
+요청의 Accept-Encoding에 맞춰 고른다. 이 경로들은 범용 gzip 미들웨어가 매번 다시 압축하지 않도록 건너뛴다.
+"""
+from __future__ import annotations
+import gzip
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성
+    brotli = None
+
+PRECOMPRESSED_PATHS = ("/geo/kpi",)
+PRECOMPRESSED_PREFIXES = ("/geo/tiles/",)
+
+def is_precompressed(path: str) -> bool:
+    return path in PRECOMPRESSED_PATHS or path.startswith(PRECOMPRESSED_PREFIXES)
+
+def accepted_encodings(accept_encoding: str) -> set[str]:
+    """Accept-Encoding -> 허용된 인코딩 이름 (q=0 제외)"""
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        name, *params = (p.strip() for p in part.split(";"))
+        q = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if name and q > 0:
+            accepted.add(name)
+    return accepted
+
+def choose_encoding(accept_encoding: str) -> str | None:
+    """'br' | 'gzip' | None(원본)"""
+    accepted = accepted_encodings(accept_encoding)
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+def compress(raw: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(raw)
+    return gzip.compress(raw, compresslevel=9, mtime=0)
@@ -1,11 +1,44 @@
 from pydantic import BaseModel
+from pathlib import Path
 import os
 
 class Settings(BaseModel):
     db_url: str = os.getenv("DB_URL", "sqlite:///./demo.db")
+    db_pool_size: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    db_max_overflow: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    # SQLite 운영 프로필: WAL(읽기가 쓰기를 기다리지 않음) + synchronous=NORMAL, 연결마다 mmap/페이지 캐시 크기
+    sqlite_wal: bool = os.getenv("SQLITE_WAL", "1") == "1"  # 네트워크 파일시스템 등 WAL을 못 쓰는 곳에서는 0
+    sqlite_mmap_mb: int = int(os.getenv("SQLITE_MMAP_MB", "256"))
+    sqlite_cache_mb: int = int(os.getenv("SQLITE_CACHE_MB", "64"))
+    sqlite_busy_timeout_ms: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))  # 쓰기 잠금 대기 (다른 프로세스의 쓰기)
     jwt_secret: str = os.getenv("JWT_SECRET", "dev-secret-change-me")
     jwt_algorithm: str = os.getenv("JWT_ALG", "HS256")
+    # 첫 번째가 새 해시에 쓰는 스킴, 나머지는 검증만 하고 로그인 시 재해시
+    password_schemes: list[str] = os.getenv("PASSWORD_SCHEMES", "pbkdf2_sha256").split(",")
+    password_rounds: int = int(os.getenv("PASSWORD_ROUNDS", "0"))  # 0이면 스킴 기본값
+    password_workers: int = int(os.getenv("PASSWORD_WORKERS", str(min(4, os.cpu_count() or 1))))  # 0이면 스레드에서 검증
     access_token_minutes: int = int(os.getenv("ACCESS_TOKEN_MINUTES", "120"))
     cors_allow_origins: list[str] = os.getenv("CORS_ALLOW_ORIGINS", "http://localhost:5173").split(",")
+    auth_cache_size: int = int(os.getenv("AUTH_CACHE_SIZE", "4096"))  # 토큰별 Principal 캐시 최대 개수
+    auth_cache_ttl_seconds: float = float(os.getenv("AUTH_CACHE_TTL_SECONDS", "60"))
+    auth_stateless: bool = os.getenv("AUTH_STATELESS", "0") == "1"  # 1이면 토큰 클레임만 신뢰하고 User를 조회하지 않음
+    kpi_cache_size: int = int(os.getenv("KPI_CACHE_SIZE", "256"))  # (level, metric, 월) 스냅샷 최대 개수
+    kpi_warm_months: int = int(os.getenv("KPI_WARM_MONTHS", "2"))  # 시작 시 미리 만들 최근 개월 수
+    # GeoJSON 원본 위치 (korea.json, geo/normalized/*.geojson)
+    geo_data_dir: str = os.getenv("GEO_DATA_DIR", str(Path(__file__).resolve().parents[2] / "frontend" / "public"))
+    # 지역 이름 표 (SIDO_NAMES/SIGUNGU_MAP 상수만 읽으며 스크립트는 실행하지 않음)
+    geo_names_source: str = os.getenv("GEO_NAMES_SOURCE", str(Path(__file__).resolve().parents[2] / "frontend" / "scripts" / "prepare-geo-data.py"))
+    tile_cache_size: int = int(os.getenv("TILE_CACHE_SIZE", "4096"))
+    tile_warm_max_zoom: int = int(os.getenv("TILE_WARM_MAX_ZOOM", "10"))  # 시작 시 단순화 지오메트리를 미리 만들 최대 줌 (-1: 안 함)
+    shapes_prefetch: int = int(os.getenv("SHAPES_PREFETCH", "3"))  # /geo/shapes Link: rel=prefetch 개수
+    gzip_min_size: int = int(os.getenv("GZIP_MIN_SIZE", "1024"))  # 이 크기(bytes) 이상 응답만 gzip 압축
+    data_version_poll_seconds: float = float(os.getenv("DATA_VERSION_POLL_SECONDS", "1"))  # 워커 간 캐시 무효화 확인 주기
+    # python -m app serve 기본값
+    web_concurrency: int = int(os.getenv("WEB_CONCURRENCY", str(os.cpu_count() or 1)))
+    # 느린 요청 샘플링 프로파일러 (0이면 끔). 이 시간(ms) 이상 걸린 요청의 스택을 profile_dir에 folded 형식으로 저장
+    profile_slow_ms: float = float(os.getenv("PROFILE_SLOW_MS", "0"))
+    profile_interval_ms: float = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+    profile_dir: str = os.getenv("PROFILE_DIR", "profiles")
+    center_grid_deg: float = float(os.getenv("CENTER_GRID_DEG", "0.05"))  # 센터 공간 인덱스 격자 크기(도)
 
 settings = Settings()
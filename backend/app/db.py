@@ -1,13 +1,100 @@
-from sqlmodel import SQLModel, create_engine, Session
+from sqlalchemy import Engine, event, inspect
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.schema import CreateColumn
+from sqlmodel import SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 from .config import settings
 
-connect_args = {"check_same_thread": False} if settings.db_url.startswith("sqlite") else {}
-engine = create_engine(settings.db_url, echo=False, connect_args=connect_args)
+def _async_url(url: str) -> str:
+    """동기 드라이버 URL -> 비동기 드라이버 URL (aiosqlite / asyncpg)"""
+    scheme, sep, rest = url.partition("://")
+    base = scheme.split("+", 1)[0]
+    if base == "sqlite":
+        return f"sqlite+aiosqlite{sep}{rest}"
+    if base in ("postgresql", "postgres"):
+        return f"postgresql+asyncpg{sep}{rest}"
+    return url
+
+def _sqlite_pragmas(read_only: bool):
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        if settings.sqlite_wal:
+            if not read_only:
+                cursor.execute("PRAGMA journal_mode=WAL")  # DB 파일에 기록되므로 쓰기 연결에서만
+            cursor.execute("PRAGMA synchronous=NORMAL")  # WAL에서는 체크포인트 때만 fsync
+        cursor.execute(f"PRAGMA busy_timeout={settings.sqlite_busy_timeout_ms}")
+        cursor.execute(f"PRAGMA mmap_size={settings.sqlite_mmap_mb << 20}")
+        cursor.execute(f"PRAGMA cache_size={-(settings.sqlite_cache_mb << 10)}")  # 음수: KiB 단위
+        if read_only:
+            cursor.execute("PRAGMA query_only=ON")
+        cursor.close()
+    return on_connect
+
+is_sqlite = settings.db_url.startswith("sqlite")
+# 파일 SQLite는 조회용 풀과 쓰기 연결 하나로 나눈다 (메모리 DB는 연결마다 DB가 따로라 나누지 않음)
+split_rw = is_sqlite and settings.db_url not in ("sqlite://", "sqlite:///:memory:")
+connect_args = {"check_same_thread": False} if is_sqlite else {}
+pool_args = {"pool_size": settings.db_pool_size, "max_overflow": settings.db_max_overflow}
+writer_args = {"pool_size": 1, "max_overflow": 0} if split_rw else pool_args
+
+# engine / async_write_engine: 쓰기 (적재, 롤업, 시드, 버전 증가, 로그인 재해시)
+# read_engine / async_engine: 조회 (라우트, 캐시 적재). SQLite가 아니면 같은 풀을 쓴다
+engine = create_engine(settings.db_url, echo=False, connect_args=connect_args, **writer_args)
+if split_rw:
+    read_engine = create_engine(settings.db_url, echo=False, connect_args=connect_args, **pool_args)
+    async_engine = create_async_engine(_async_url(settings.db_url), echo=False, **pool_args)
+    async_write_engine = create_async_engine(_async_url(settings.db_url), echo=False, **writer_args)
+    for target, read_only in (
+        (engine, False), (async_write_engine.sync_engine, False), (read_engine, True), (async_engine.sync_engine, True),
+    ):
+        event.listen(target, "connect", _sqlite_pragmas(read_only))
+else:
+    read_engine = engine
+    async_engine = async_write_engine = create_async_engine(_async_url(settings.db_url), echo=False, **pool_args)
+
+def sync_engines() -> tuple[Engine, ...]:
+    """커넥션 풀을 가진 동기 엔진들 (비동기 엔진은 sync_engine, 중복 제외)"""
+    engines = (engine, read_engine, async_engine.sync_engine, async_write_engine.sync_engine)
+    return tuple({id(e): e for e in engines}.values())
+
+# 모델에서 뺀 인덱스. create_all은 지우지 않으므로 기존 DB에서 직접 지운다
+OBSOLETE_INDEXES = ("ix_regionstat_level", "ix_regionstat_region_code")
 
 def init_db() -> None:
     from . import models  # noqa: F401
     SQLModel.metadata.create_all(engine)
+    _add_missing_columns()
+    # create_all은 기존 테이블에 새로 추가된 인덱스를 만들지 않는다
+    for table in SQLModel.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
+    with engine.begin() as conn:
+        for name in OBSOLETE_INDEXES:
+            conn.exec_driver_sql(f"DROP INDEX IF EXISTS {name}")
+    analyze()
+
+def analyze() -> None:
+    """플래너 통계(sqlite_stat1) 갱신. 대량 적재/롤업/시드가 끝난 뒤에도 부른다 (init_db는 적재 전에 돈다).
+
+    analysis_limit로 인덱스마다 표본만 읽으므로 큰 DB에서도 수십 ms
+    """
+    if is_sqlite:
+        with engine.begin() as conn:
+            conn.exec_driver_sql("PRAGMA analysis_limit=1000")
+            conn.exec_driver_sql("ANALYZE")
+
+def _add_missing_columns() -> None:
+    # create_all은 기존 테이블에 새로 추가된 컬럼도 만들지 않는다 (새 컬럼은 기본값이 있어야 함)
+    preparer = engine.dialect.identifier_preparer
+    with engine.begin() as conn:
+        inspector = inspect(conn)  # 쓰기 연결을 하나만 쓴다
+        for table in SQLModel.metadata.sorted_tables:
+            existing = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing:
+                    ddl = CreateColumn(column).compile(dialect=engine.dialect)
+                    conn.exec_driver_sql(f"ALTER TABLE {preparer.format_table(table)} ADD COLUMN {ddl}")
 
-def get_session():
-    with Session(engine) as session:
+async def get_async_session():
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
         yield session
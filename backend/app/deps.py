@@ -1,16 +1,61 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
 from fastapi import Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
-from sqlmodel import Session, select
-from .db import get_session
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from .cache import TTLCache
+from .config import settings
+from .db import async_engine
 from .models import User
 from .security import decode_token
+from .versioning import on_commit
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login", auto_error=False)
+
+@dataclass(frozen=True)
+class Principal:
+    """인증된 사용자 (요청 처리에 필요한 필드만)"""
+    username: str
+    role: str
+    region_code: str | None
+
+# 토큰 -> (조회 시각, Principal). 사용자가 바뀐 시각보다 먼저 조회한 항목은 무효
+_principal_cache = TTLCache(settings.auth_cache_size, settings.auth_cache_ttl_seconds, name="principal")
+# 사용자 -> 마지막 변경 시각 (변경 순서). 캐시 항목은 TTL보다 오래 살지 않으므로 TTL이 지난 기록은 지운다
+_user_changed_at: OrderedDict[str, float] = OrderedDict()
+_all_changed_at = float("-inf")
+
+def _mark_changed(username: str, now: float) -> None:
+    _user_changed_at[username] = now
+    _user_changed_at.move_to_end(username)
+    cutoff = now - _principal_cache.ttl
+    while _user_changed_at and next(iter(_user_changed_at.values())) < cutoff:
+        _user_changed_at.popitem(last=False)
+
+def _is_current(resolved_at: float, username: str) -> bool:
+    # 조회 후 TTL이 지난 항목은 변경 기록이 지워졌을 수 있으므로 만료로 본다
+    if resolved_at <= time.monotonic() - _principal_cache.ttl:
+        return False
+    return resolved_at > _all_changed_at and resolved_at > _user_changed_at.get(username, float("-inf"))
+
+def cached_principal(token: str) -> Principal | None:
+    cached = _principal_cache.get(token)
+    if cached is not None:
+        resolved_at, principal = cached
+        if _is_current(resolved_at, principal.username):
+            return principal
+    return None
+
+async def resolve_principal(token: str) -> Principal:
+    principal = cached_principal(token)
+    if principal is not None:
+        return principal
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    session: Session = Depends(get_session),
-) -> User:
     try:
         payload = decode_token(token)
     except Exception:
@@ -20,14 +65,48 @@ def get_current_user(
     if not username:
         raise HTTPException(status_code=401, detail="Invalid token")
 
-    user = session.exec(select(User).where(User.username == username)).first()
-    if not user:
-        raise HTTPException(status_code=401, detail="User not found")
-    return user
+    # DB 조회 전 시각: 조회 중에 커밋된 변경도 이 항목을 무효화한다
+    resolved_at = time.monotonic()
+    if settings.auth_stateless:
+        # 서명된 클레임을 그대로 신뢰 (DB 조회 없음)
+        principal = Principal(username=username, role=payload.get("role", ""), region_code=payload.get("region_code"))
+    else:
+        async with AsyncSession(async_engine) as session:
+            user = (await session.exec(select(User).where(User.username == username))).first()
+        if not user:
+            raise HTTPException(status_code=401, detail="User not found")
+        principal = Principal(username=user.username, role=user.role, region_code=user.region_code)
+
+    ttl = None
+    if "exp" in payload:
+        ttl = payload["exp"] - time.time()
+    if ttl is None or ttl > 0:
+        _principal_cache.set(token, (resolved_at, principal), ttl)
+    return principal
+
+async def get_current_user(token: str = Depends(oauth2_scheme)) -> Principal:
+    return await resolve_principal(token)
+
+async def get_optional_user(token: str | None = Depends(optional_oauth2_scheme)) -> Principal | None:
+    """공개 엔드포인트용: 토큰이 없으면 None, 있으면 검증"""
+    return await resolve_principal(token) if token else None
 
 def require_roles(*roles: str):
-    def _inner(user: User = Depends(get_current_user)) -> User:
+    async def _inner(user: Principal = Depends(get_current_user)) -> Principal:
         if user.role not in roles:
             raise HTTPException(status_code=403, detail="Forbidden")
         return user
     return _inner
+
+# ---------- User 변경이 커밋되면 해당 사용자의 캐시 항목 무효화 ----------
+def _invalidate_principals(usernames: set[str] | None) -> None:
+    global _all_changed_at
+    now = time.monotonic()
+    if usernames is None:  # 벌크 DML: 누가 바뀌었는지 모른다
+        _all_changed_at = now
+        _principal_cache.clear()
+        return
+    for username in usernames:
+        _mark_changed(username, now)
+
+on_commit(User, lambda user: user.username, _invalidate_principals)
@@ -0,0 +1,128 @@
+"""
+지역 이름 사전 (gazetteer)
+
+시작 시 한 번, 레벨별 경계 GeoJSON(geometry.load_layer)의 코드/이름/상위 코드와
+frontend/scripts/prepare-geo-data.py의 SIDO_NAMES/SIGUNGU_MAP(스크립트를 실행하지 않고 상수만 ast로 읽음)을
+합쳐 배열 기반 표로 만든다. 코드 -> 행 번호 dict 하나와 이름/상위/레벨 배열만 두고 문자열은 intern하므로,
+KPI/순위 응답의 region_name 채우기와 level/parent_code 검증은 행마다 dict 조회 한 번이다.
+지오메트리 파일에 있는 이름이 우선이고, 표에만 있는 코드는 표의 이름을 쓴다 (prepare-geo-data.py와 같은 순서).
+같은 코드의 이름이 서로 다르면 ValueError (코드 체계가 어긋난 원본이 다른 지역 이름으로 서비스되지 않도록).
+"""
+from __future__ import annotations
+import ast
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+from fastapi import HTTPException
+
+from .config import settings
+from .geometry import load_layer
+from .regions import LEVELS, RegionTree
+
+NAME_TABLES = ("SIDO_NAMES", "SIGUNGU_MAP")
+
+def _default_parent(code: str, level: str) -> str | None:
+    # regions.build_region과 같은 행정코드 접두 규칙
+    if level == "sido":
+        return None
+    return code[:2] if level == "sigungu" else code[:5]
+
+def load_name_tables(path: str | Path) -> list[tuple[str, str, str, str | None]]:
+    """prepare-geo-data.py의 이름 표 -> [(code, name, level, parent_code)]. 파일이 없으면 빈 목록"""
+    try:
+        module = ast.parse(Path(path).read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return []
+    tables = {}
+    for node in module.body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1:
+            target = node.targets[0]
+            if isinstance(target, ast.Name) and target.id in NAME_TABLES:
+                tables[target.id] = ast.literal_eval(node.value)
+    entries = [(code, name, "sido", None) for code, name in tables.get("SIDO_NAMES", {}).items()]
+    for sido, items in tables.get("SIGUNGU_MAP", {}).items():
+        entries += [(code, name, "sigungu", sido) for code, name in items]
+    return entries
+
+class Gazetteer:
+    """레벨 -> 코드 순으로 정렬한 지역 표. codes/names/parents/levels는 같은 행 순서의 배열"""
+
+    def __init__(self, entries: Iterable[tuple[str, str, str, str | None]]):
+        # 같은 코드는 먼저 나온 항목의 상위/레벨을 쓴다. 이름이 다르면 어느 쪽도 믿을 수 없으므로 실패
+        rows: dict[str, tuple[str, str, str | None]] = {}
+        conflicts: dict[str, tuple[str, str]] = {}
+        for code, name, level, parent_code in entries:
+            if level not in LEVELS:
+                continue
+            if code not in rows:
+                rows[code] = (name, level, parent_code or _default_parent(code, level))
+            elif rows[code][0] != name and code not in conflicts:
+                conflicts[code] = (rows[code][0], name)
+        if conflicts:
+            raise ValueError(
+                f"gazetteer: {len(conflicts)} codes have different names: "
+                + ", ".join(f"{code} {first!r} != {other!r}" for code, (first, other) in list(conflicts.items())[:10])
+            )
+        order = sorted(rows, key=lambda c: (LEVELS.index(rows[c][1]), c))
+
+        self.codes: tuple[str, ...] = tuple(sys.intern(c) for c in order)
+        self._index: dict[str, int] = {c: i for i, c in enumerate(self.codes)}
+        self.names: tuple[str, ...] = tuple(sys.intern(rows[c][0]) for c in order)
+        # 상위 지역 행 번호 (-1: 없음 또는 표에 없는 코드), 레벨은 LEVELS 인덱스
+        self.parents = np.array([self._index.get(rows[c][2], -1) for c in order], dtype=np.int32)
+        self.levels = np.array([LEVELS.index(rows[c][1]) for c in order], dtype=np.int8)
+        bounds = np.searchsorted(self.levels, np.arange(len(LEVELS) + 1))
+        self._level_rows = {lv: slice(int(bounds[i]), int(bounds[i + 1])) for i, lv in enumerate(LEVELS)}
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __contains__(self, code: str) -> bool:
+        return code in self._index
+
+    def name(self, code: str) -> str:
+        """표에 없는 코드는 코드 그대로"""
+        i = self._index.get(code)
+        return code if i is None else self.names[i]
+
+    def names_for(self, codes: Iterable[str]) -> tuple[str, ...]:
+        index, names = self._index, self.names
+        return tuple(code if (i := index.get(code)) is None else names[i] for code in codes)
+
+    def level(self, code: str) -> str | None:
+        i = self._index.get(code)
+        return None if i is None else LEVELS[self.levels[i]]
+
+    def parent(self, code: str) -> str | None:
+        i = self._index.get(code)
+        if i is None or self.parents[i] < 0:
+            return None
+        return self.codes[self.parents[i]]
+
+    def codes_at(self, level: str) -> tuple[str, ...]:
+        return self.codes[self._level_rows[level]] if level in self._level_rows else ()
+
+@lru_cache(maxsize=None)
+def get_gazetteer() -> Gazetteer:
+    entries: list[tuple[str, str, str, str | None]] = []
+    for level in LEVELS:
+        entries += [(f.code, f.name, level, f.parent_code) for f in load_layer(level).features]
+    entries += load_name_tables(settings.geo_names_source)
+    return Gazetteer(entries)
+
+def validate_scope(level: str, allowed: tuple[str, ...], parent_code: str | None = None, tree: RegionTree | None = None) -> None:
+    """level/parent_code 쿼리 검증. parent_code는 이름 사전이나 지역 트리에 있고 level보다 상위 레벨이어야 한다"""
+    if level not in allowed:
+        raise HTTPException(400, "Unknown level")
+    if parent_code is None:
+        return
+    parent_level = get_gazetteer().level(parent_code)
+    if parent_level is None and tree is not None:
+        parent_level = tree.level.get(parent_code)
+    if parent_level is None:
+        raise HTTPException(400, "Unknown parent_code")
+    if level not in LEVELS or parent_level not in LEVELS or LEVELS.index(parent_level) >= LEVELS.index(level):
+        raise HTTPException(400, "parent_code must be above level")
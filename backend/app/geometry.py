@@ -0,0 +1,173 @@
+"""
+지오메트리 로더
+
+frontend/public 아래 GeoJSON(geo/normalized/*.geojson, korea.json)을 레벨별로 한 번만 읽어
+NumPy 좌표 배열로 보관한다. 타일 등 지오메트리를 쓰는 모듈이 이 레이어를 공유한다.
+"""
+from __future__ import annotations
+import json
+import math
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+from .config import settings
+
+# 레벨별 원본 후보 (앞에서부터 존재하는 파일 사용)
+LEVEL_SOURCES = {
+    "sido": ("geo/normalized/sido.geojson", "korea.json"),
+    "sigungu": ("geo/normalized/sigungu.geojson", "geo/sigungu.json"),
+    "eupmyeondong": ("geo/normalized/eupmyeon.geojson",),
+}
+
+# korea.json은 SGIS(통계청) 시도 코드라 시군구/읍면동 접두와 같은 행정표준코드로 바꿔 읽는다
+# (frontend/scripts/prepare-geo-data.py의 SGIS_SIDO_CODES와 같은 표)
+SGIS_SIDO_CODES = {
+    "11": "11", "21": "26", "22": "27", "23": "28", "24": "29", "25": "30", "26": "31", "29": "36",
+    "31": "41", "32": "42", "33": "43", "34": "44", "35": "45", "36": "46", "37": "47", "38": "48", "39": "50",
+}
+SOURCE_CODE_MAPS = {"korea.json": SGIS_SIDO_CODES}
+
+# scripts/normalize-geo.mjs 와 같은 속성 키 우선순위
+CODE_KEYS = ("region_code", "code", "CD", "adm_cd", "ADM_CD", "SIG_CD", "EMD_CD")
+NAME_KEYS = ("region_name", "name", "NAME", "adm_nm", "SIG_KOR_NM", "EMD_KOR_NM")
+PARENT_KEYS = ("parent_code", "parent", "PARENT")
+
+@dataclass(frozen=True)
+class GeoFeature:
+    code: str
+    name: str
+    parent_code: str | None
+    polygons: tuple[tuple[np.ndarray, ...], ...]  # 폴리곤 -> 링(첫 링이 외곽) -> (N, 2) lon/lat
+    bbox: tuple[float, float, float, float]       # min_lon, min_lat, max_lon, max_lat
+
+@dataclass(frozen=True)
+class GeoLayer:
+    level: str
+    source: Path | None
+    features: tuple[GeoFeature, ...]
+    bboxes: np.ndarray  # (n, 4), features와 같은 순서
+
+def source_path(level: str) -> Path | None:
+    root = Path(settings.geo_data_dir)
+    for rel in LEVEL_SOURCES.get(level, ()):
+        path = root / rel
+        if path.is_file():
+            return path
+    return None
+
+def _first(props: dict, keys: tuple[str, ...]) -> str | None:
+    for key in keys:
+        value = props.get(key)
+        if value not in (None, ""):
+            return str(value)
+    return None
+
+def _polygons(geometry: dict | None) -> tuple[tuple[np.ndarray, ...], ...]:
+    if not geometry:
+        return ()
+    if geometry["type"] == "Polygon":
+        parts = [geometry["coordinates"]]
+    elif geometry["type"] == "MultiPolygon":
+        parts = geometry["coordinates"]
+    else:
+        return ()
+    return tuple(
+        tuple(np.asarray(ring, dtype=np.float64)[:, :2] for ring in poly if len(ring) >= 4)
+        for poly in parts
+        if poly and len(poly[0]) >= 4
+    )
+
+def parse_feature(feature: dict, index: int, code_map: dict[str, str] | None = None) -> GeoFeature | None:
+    """code_map: 원본 코드 -> 행정표준코드 (표에 없는 코드는 그대로)"""
+    props = feature.get("properties") or {}
+    polygons = _polygons(feature.get("geometry"))
+    if not polygons:
+        return None
+    exteriors = np.vstack([poly[0] for poly in polygons])
+    lo, hi = exteriors.min(axis=0), exteriors.max(axis=0)
+    code = _first(props, CODE_KEYS) or str(index)
+    return GeoFeature(
+        code=code_map.get(code, code) if code_map else code,
+        name=_first(props, NAME_KEYS) or f"Region-{index + 1}",
+        parent_code=_first(props, PARENT_KEYS),
+        polygons=polygons,
+        bbox=(float(lo[0]), float(lo[1]), float(hi[0]), float(hi[1])),
+    )
+
+@lru_cache(maxsize=None)
+def load_layer(level: str) -> GeoLayer:
+    path = source_path(level)
+    features: list[GeoFeature] = []
+    if path is not None:
+        with open(path, encoding="utf-8") as f:
+            raw = json.load(f)
+        code_map = SOURCE_CODE_MAPS.get(path.name)
+        for i, feature in enumerate(raw.get("features", [])):
+            parsed = parse_feature(feature, i, code_map)
+            if parsed is not None:
+                features.append(parsed)
+    bboxes = np.array([f.bbox for f in features], dtype=np.float64).reshape(-1, 4)
+    return GeoLayer(level=level, source=path, features=tuple(features), bboxes=bboxes)
+
+# ---------- 좌표 변환 / 단순화 ----------
+MAX_MERCATOR_LAT = 85.0511287798
+
+def lonlat_to_world(coords: np.ndarray) -> np.ndarray:
+    """경위도 -> Web Mercator 정규 좌표 ([0, 1] x [0, 1], y는 아래로 증가)"""
+    lon = coords[:, 0]
+    lat = np.clip(coords[:, 1], -MAX_MERCATOR_LAT, MAX_MERCATOR_LAT)
+    x = (lon + 180.0) / 360.0
+    y = 0.5 - np.log(np.tan(np.radians(45.0 + lat / 2.0))) / (2.0 * math.pi)
+    return np.column_stack([x, y])
+
+def rings_importance(rings: list[np.ndarray]) -> list[np.ndarray]:
+    """Douglas-Peucker를 끝까지 한 번 돌려 점마다 '이 허용 오차 미만이면 남는다' 값을 구한다.
+
+    점의 값은 자기 거리와 자신을 만든 분할 점의 값 중 작은 쪽이므로, 허용 오차 t의 결과는
+    `ring[importance > t]`와 같다. 줌마다 단순화를 다시 하지 않고 마스크만 바꾼다.
+    모든 링을 이어 붙여 같은 깊이의 구간들을 한 번에 벡터 연산으로 나눈다 (반복 횟수 = 분할 깊이).
+    """
+    if not rings:
+        return []
+    sizes = np.array([len(r) for r in rings])
+    bounds = np.concatenate(([0], np.cumsum(sizes)))
+    points = np.concatenate(rings).reshape(-1, 2)
+    importance = np.full(len(points), np.inf)
+    # 4점 이하 링은 그대로 둔다
+    split = sizes > 4
+    starts, ends = bounds[:-1][split], bounds[1:][split] - 1
+    gates = np.full(len(starts), np.inf)
+    while len(starts):
+        inner = ends - starts - 1
+        starts, ends, gates, inner = starts[inner > 0], ends[inner > 0], gates[inner > 0], inner[inner > 0]
+        if not len(starts):
+            break
+        # 구간별 내부 점 인덱스를 이어 붙이고, 각 점이 속한 구간 번호를 둔다
+        offsets = np.concatenate(([0], np.cumsum(inner)[:-1]))
+        segment = np.repeat(np.arange(len(starts)), inner)
+        idx = np.arange(len(segment)) - offsets[segment] + starts[segment] + 1
+        a, b = points[starts], points[ends]
+        d = b - a
+        norm = np.hypot(d[:, 0], d[:, 1])
+        rel = points[idx] - a[segment]
+        cross = np.abs(d[segment, 0] * rel[:, 1] - d[segment, 1] * rel[:, 0])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            dist = np.where(norm[segment] == 0.0, np.hypot(rel[:, 0], rel[:, 1]), cross / norm[segment])
+        # 구간마다 첫 최댓값 위치 (np.argmax와 같은 규칙)
+        best = np.maximum.reduceat(dist, offsets)
+        at_best = np.flatnonzero(dist == best[segment])
+        _, first = np.unique(segment[at_best], return_index=True)
+        mids = idx[at_best[first]]
+        values = np.minimum(gates, best)
+        importance[mids] = values
+        starts, ends, gates = np.concatenate((starts, mids)), np.concatenate((mids, ends)), np.concatenate((values, values))
+    return [importance[lo:hi] for lo, hi in zip(bounds[:-1], bounds[1:])]
+
+def simplify_ring(points: np.ndarray, tolerance: float) -> np.ndarray:
+    """Douglas-Peucker. 닫힌 링이면 첫/끝 점이 같으므로 첫 분할은 점까지의 거리로 처리된다"""
+    if len(points) <= 4 or tolerance <= 0:
+        return points
+    return points[rings_importance([points])[0] > tolerance]
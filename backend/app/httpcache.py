@@ -0,0 +1,94 @@
+"""
+조건부 GET 미들웨어
+
+GET 응답에 (데이터 버전, 경로, 정렬된 쿼리, Accept, 사용자 권한 범위)로 만든 ETag를 붙이고,
+If-None-Match가 맞으면 라우트를 실행하지 않고 304를 돌려준다.
+권한 범위는 (role, region_code)라서 같은 범위의 사용자끼리는 ETag가 같다.
+"""
+from __future__ import annotations
+import hashlib
+from urllib.parse import parse_qsl, urlencode
+
+from fastapi import HTTPException
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .deps import resolve_principal
+from .versioning import data_version
+
+CACHEABLE_PREFIXES = ("/geo/", "/centers")
+EXCLUDED_PREFIXES = ("/geo/tiles/", "/geo/shapes/", "/geo/stream")  # 타일/경계 조각은 파일 기준 ETag를 따로 쓴다, SSE는 제외
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    # 약한 비교 (W/ 접두 무시)
+    tags = [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+    return "*" in tags or etag.removeprefix("W/") in tags
+
+async def _scope_key(headers: Headers) -> str | None:
+    """Authorization이 없으면 '', 유효한 토큰이면 'role:region_code', 잘못된 토큰이면 None"""
+    auth = headers.get("authorization", "")
+    scheme, _, token = auth.partition(" ")
+    if not auth:
+        return ""
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        principal = await resolve_principal(token)
+    except HTTPException:
+        return None
+    return f"{principal.role}:{principal.region_code or ''}"
+
+def compute_etag(path: str, query_string: str, scope_key: str, accept: str = "") -> str:
+    # Accept에 따라 JSON/Arrow/MessagePack 표현이 달라지므로 키에 포함
+    query = urlencode(sorted(parse_qsl(query_string, keep_blank_values=True)))
+    key = f"{data_version()}|{path}?{query}|{accept}|{scope_key}"
+    digest = hashlib.blake2b(key.encode(), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+class ConditionalGetMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        path = scope.get("path", "")
+        if (
+            scope["type"] != "http"
+            or scope["method"] not in ("GET", "HEAD")
+            or not path.startswith(CACHEABLE_PREFIXES)
+            or path.startswith(EXCLUDED_PREFIXES)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        scope_key = await _scope_key(headers)
+        if scope_key is None:
+            # 인증 오류는 라우트가 그대로 응답하게 둔다
+            await self.app(scope, receive, send)
+            return
+
+        etag = compute_etag(path, scope["query_string"].decode("latin-1"), scope_key, headers.get("accept", ""))
+        cache_headers = {
+            "ETag": etag,
+            # 매번 재검증하되 본문은 304로 생략. 인증 요청은 공유 캐시에 남기지 않는다
+            "Cache-Control": "private, no-cache" if scope_key else "public, no-cache",
+        }
+
+        if etag_matches(headers.get("if-none-match", ""), etag):
+            response_headers = MutableHeaders(cache_headers)
+            response_headers.add_vary_header("Authorization")
+            response_headers.add_vary_header("Accept")
+            await send({"type": "http.response.start", "status": 304, "headers": response_headers.raw})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def send_with_etag(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                response_headers = MutableHeaders(scope=message)
+                if "etag" not in response_headers:
+                    response_headers.update(cache_headers)
+                    response_headers.add_vary_header("Authorization")
+                    response_headers.add_vary_header("Accept")
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
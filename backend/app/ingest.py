@@ -0,0 +1,185 @@
+"""
+대량 적재 (python -m app ingest)
+
+CSV / JSON lines / Parquet 파일을 청크 단위로 스트리밍해 executemany로 넣는다.
+RegionStat은 (level, region_code, as_of) 기준 upsert, Center는 단순 insert이며
+배치마다 별도 트랜잭션으로 커밋한다. 통계 적재 후에는 건드린 서브트리의 상위 레벨을 다시 롤업한다.
+"""
+from __future__ import annotations
+import csv
+import gzip
+import io
+import json
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from sqlalchemy import insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Session
+
+from .db import analyze, engine
+from .models import Center, RegionStat
+from .regions import sync_regions
+from .resolver import resolve_center_regions
+from .versioning import bump_data_version
+
+STAT_KEY = ("level", "region_code", "as_of")
+STAT_VALUES = ("centers_count", "population", "pet_positive_rate", "risk_score_avg")
+SIDO_SUBTREE_LEVELS = ("sido", "sigungu", "eupmyeondong")
+
+@dataclass
+class IngestReport:
+    kind: str
+    rows: int = 0
+    seconds: float = 0.0
+    # 다시 집계할 (as_of, 시도 코드). 전국 행만 들어온 달은 시도 코드 None
+    touched: set[tuple[datetime, str | None]] = field(default_factory=set)
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+# ---------- 읽기 ----------
+def _open_text(path: Path) -> io.TextIOBase:
+    if path.suffix == ".gz":
+        return io.TextIOWrapper(gzip.open(path, "rb"), encoding="utf-8", newline="")
+    return open(path, encoding="utf-8", newline="")
+
+def iter_records(path: Path) -> Iterator[dict]:
+    suffixes = [s for s in path.suffixes if s != ".gz"]
+    kind = suffixes[-1] if suffixes else ""
+    if kind == ".csv":
+        with _open_text(path) as f:
+            yield from csv.DictReader(f)
+    elif kind in (".jsonl", ".ndjson"):
+        with _open_text(path) as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    elif kind == ".parquet":
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise SystemExit("Parquet 적재에는 pyarrow가 필요합니다 (pip install pyarrow)")
+        for batch in pq.ParquetFile(path).iter_batches():
+            yield from batch.to_pylist()
+    else:
+        raise SystemExit(f"지원하지 않는 형식: {path.name} (.csv, .jsonl, .ndjson, .parquet[.gz])")
+
+def chunked(records: Iterable[dict], size: int) -> Iterator[list[dict]]:
+    it = iter(records)
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+# ---------- 정규화 ----------
+def parse_month(value) -> datetime:
+    """'YYYY-MM', 'YYYY-MM-DD', ISO datetime -> 해당 월 1일"""
+    if isinstance(value, datetime):
+        dt = value
+    else:
+        text = str(value).strip()
+        dt = datetime.strptime(text, "%Y-%m") if len(text) == 7 else datetime.fromisoformat(text[:19])
+    return datetime(dt.year, dt.month, 1)
+
+def _num(value, cast, default):
+    return default if value in (None, "") else cast(value)
+
+def normalize_stat(rec: dict) -> dict:
+    return {
+        "level": str(rec["level"]).strip(),
+        "region_code": str(rec["region_code"]).strip(),
+        "as_of": parse_month(rec["as_of"]),
+        "centers_count": _num(rec.get("centers_count"), lambda v: int(float(v)), 0),
+        "population": _num(rec.get("population"), lambda v: int(float(v)), 0),
+        "pet_positive_rate": _num(rec.get("pet_positive_rate"), float, 0.0),
+        "risk_score_avg": _num(rec.get("risk_score_avg"), float, 0.0),
+    }
+
+def normalize_center(rec: dict) -> dict:
+    return {
+        "name": str(rec["name"]),
+        "region_code": str(rec.get("region_code") or "").strip(),
+        "address": str(rec.get("address") or ""),
+        "phone": rec.get("phone") or None,
+        "lat": _num(rec.get("lat"), float, None),
+        "lng": _num(rec.get("lng"), float, None),
+        "level": str(rec.get("level") or "district"),
+    }
+
+# ---------- 쓰기 ----------
+def upsert_stats_statement():
+    dialect = engine.dialect.name
+    if dialect == "sqlite":
+        stmt = sqlite.insert(RegionStat.__table__)
+    elif dialect == "postgresql":
+        stmt = postgresql.insert(RegionStat.__table__)
+    else:
+        raise SystemExit(f"upsert를 지원하지 않는 DB: {dialect}")
+    return stmt.on_conflict_do_update(
+        index_elements=list(STAT_KEY),
+        set_={col: stmt.excluded[col] for col in STAT_VALUES},
+    )
+
+def ingest_stats(records: Iterable[dict], batch_size: int = 5000, progress: bool = False) -> IngestReport:
+    report = IngestReport(kind="stats")
+    stmt = upsert_stats_statement()
+    started = time.perf_counter()
+    for chunk in chunked(records, batch_size):
+        rows = [normalize_stat(r) for r in chunk]
+        with engine.begin() as conn:
+            conn.execute(stmt, rows)
+        report.rows += len(rows)
+        report.touched.update(
+            (r["as_of"], r["region_code"][:2] if r["level"] in SIDO_SUBTREE_LEVELS else None) for r in rows
+        )
+        if progress:
+            _print_progress(report, started)
+    report.seconds = time.perf_counter() - started
+    _after_ingest(report.touched)
+    return report
+
+def ingest_centers(records: Iterable[dict], batch_size: int = 5000, progress: bool = False) -> IngestReport:
+    report = IngestReport(kind="centers")
+    stmt = insert(Center.__table__)
+    started = time.perf_counter()
+    for chunk in chunked(records, batch_size):
+        rows = [normalize_center(r) for r in chunk]
+        # region_code가 비어 있고 위경도가 있는 센터는 경계 폴리곤으로 채운다
+        todo = [r for r in rows if not r["region_code"]]
+        for row, code in zip(todo, resolve_center_regions([(r["level"], r["lat"], r["lng"]) for r in todo])):
+            row["region_code"] = code or ""
+        with engine.begin() as conn:
+            conn.execute(stmt, rows)
+        report.rows += len(rows)
+        if progress:
+            _print_progress(report, started)
+    report.seconds = time.perf_counter() - started
+    _after_ingest()
+    return report
+
+def _after_ingest(touched: set[tuple[datetime, str | None]] | None = None) -> None:
+    # Core 수준 적재는 ORM 이벤트를 거치지 않으므로 직접 버전을 올린다 (on_data_change로 등록된 캐시가 비워짐)
+    with Session(engine) as session:
+        sync_regions(session)
+    if touched:
+        from .rollup import rollup_touched  # rollup이 이 모듈의 upsert를 쓴다
+        rollup_touched(touched)
+    analyze()
+    bump_data_version()
+
+def _print_progress(report: IngestReport, started: float) -> None:
+    elapsed = time.perf_counter() - started
+    print(f"  {report.rows:,} rows ({report.rows / elapsed:,.0f} rows/s)", flush=True)
+
+def run(path: str, kind: str = "stats", batch_size: int = 5000) -> IngestReport:
+    from .db import init_db
+    init_db()
+    records = iter_records(Path(path))
+    fn = ingest_stats if kind == "stats" else ingest_centers
+    report = fn(records, batch_size=batch_size, progress=True)
+    print(f"Ingested {report.rows:,} {kind} rows in {report.seconds:.2f}s ({report.rows_per_sec:,.0f} rows/s)")
+    return report
@@ -0,0 +1,241 @@
+"""
+KPI 스냅샷 엔진
+
+(level, metric, YYYY-MM) 단위로 KPI 레코드 집합을 미리 만들어 직렬화된 JSON 바이트로
+메모리에 보관한다. 데이터 버전이 바뀌면(versioning.on_data_change) 전체 스냅샷을 무효화한다.
+"""
+from __future__ import annotations
+import json
+import threading
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timezone
+from typing import Iterable
+
+import numpy as np
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from .cache import LRUCache
+from .columnar import encode_columns
+from .compression import choose_encoding, compress
+from .config import settings
+from .db import read_engine
+from .gazetteer import get_gazetteer
+from .models import RegionStat
+from .stats import panel_stats
+from .versioning import on_data_change
+
+KPI_LEVELS = ("sido", "sigungu", "eupmyeondong")
+
+# metric -> RegionStat 컬럼
+METRIC_COLUMNS = {
+    "risk_score": "risk_score_avg",
+    "elderly_ratio": "pet_positive_rate",  # PET positive rate as proxy
+    "screening_rate": "centers_count",
+}
+
+def metric_value(column_name: str, raw) -> float:
+    """RegionStat 컬럼 값을 KPI 값으로 변환"""
+    if column_name == "risk_score_avg":
+        return raw or 50.0
+    if column_name == "pet_positive_rate":
+        return (raw or 0.15) * 100  # Convert to percentage
+    return float(raw or 0)
+
+def month_range(time: str) -> tuple[datetime, datetime]:
+    """'YYYY-MM' -> [해당 월 1일, 다음 달 1일)"""
+    year, month = (int(p) for p in time.split("-"))
+    start = datetime(year, month, 1)
+    end = datetime(year + 1, 1, 1) if month == 12 else datetime(year, month + 1, 1)
+    return start, end
+
+def previous_month(time: str) -> str:
+    year, month = (int(p) for p in time.split("-"))
+    year, month = (year - 1, 12) if month == 1 else (year, month - 1)
+    return f"{year:04d}-{month:02d}"
+
+@dataclass(frozen=True)
+class KpiSnapshot:
+    level: str
+    metric: str
+    time: str
+    region_codes: tuple[str, ...]
+    region_names: tuple[str, ...]  # 이름 사전(gazetteer)에 없는 코드는 코드 그대로
+    # region_codes와 같은 순서의 컬럼 배열
+    values: np.ndarray
+    change_rate: np.ndarray
+    percentile: np.ndarray
+    rank: np.ndarray
+    status: np.ndarray
+    order: np.ndarray  # rank 오름차순 인덱스 (값 내림차순)
+    computed_at: str
+    body: bytes  # 직렬화된 응답 본문
+    encoded: dict[str, bytes] = field(default_factory=dict, compare=False, repr=False)  # 컬럼 형식별/압축 본문
+
+def _serialize(records: list[dict]) -> bytes:
+    return json.dumps(records, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def _nullable(x: float, ndigits: int) -> float | None:
+    return None if np.isnan(x) else round(float(x), ndigits)
+
+def build_snapshot(session: Session, level: str, metric: str, time: str) -> KpiSnapshot:
+    column_name = METRIC_COLUMNS[metric]  # 라우트에서 검증
+    column = getattr(RegionStat, column_name)
+    start, end = month_range(time)
+    prev_start, _ = month_range(previous_month(time))
+
+    # 직전 월과 해당 월을 한 번에 읽는다. 같은 월에 여러 건이면 as_of 순으로 덮어써 최근 값이 남는다
+    q = (
+        select(RegionStat.region_code, RegionStat.as_of, column)
+        .where(RegionStat.level == level, RegionStat.as_of >= prev_start, RegionStat.as_of < end)
+        .order_by(RegionStat.as_of)
+    )
+    current: dict[str, float] = {}
+    previous: dict[str, float] = {}
+    for region_code, as_of, raw in session.exec(q):
+        (current if as_of >= start else previous)[region_code] = metric_value(column_name, raw)
+
+    codes = tuple(current)
+    values = np.fromiter(current.values(), dtype=np.float64, count=len(codes))
+    prev_values = np.fromiter((previous.get(c, np.nan) for c in codes), dtype=np.float64, count=len(codes))
+    stats = panel_stats(np.vstack([prev_values, values]))
+    change_rate, percentile, rank, status = stats.change_rate[1], stats.percentile[1], stats.rank[1], stats.status[1]
+    order = np.argsort(rank, kind="stable")
+
+    snapshot = KpiSnapshot(
+        level=level,
+        metric=metric,
+        time=time,
+        region_codes=codes,
+        region_names=get_gazetteer().names_for(codes),
+        values=values,
+        change_rate=change_rate,
+        percentile=percentile,
+        rank=rank,
+        status=status,
+        order=order,
+        computed_at=datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        body=b"",
+    )
+    return replace(snapshot, body=_serialize(snapshot_records(snapshot, range(len(codes)))))
+
+def snapshot_records(snapshot: KpiSnapshot, indices: Iterable[int]) -> list[dict]:
+    """스냅샷 배열에서 KPI 레코드 (/geo/kpi 본문, /geo/shapes의 상위 지역별 부분)"""
+    return [
+        {
+            "region_code": snapshot.region_codes[i],
+            "region_name": snapshot.region_names[i],
+            "value": float(snapshot.values[i]),
+            "change_rate": _nullable(snapshot.change_rate[i], 2),
+            "percentile": int(round(snapshot.percentile[i])),
+            "status": snapshot.status[i],
+            "computed_at": snapshot.computed_at,
+        }
+        for i in indices
+    ]
+
+def snapshot_columns(snapshot: KpiSnapshot) -> dict[str, object]:
+    """snapshot_records와 같은 필드를 컬럼 배열로 (computed_at은 응답 메타데이터)"""
+    return {
+        "region_code": snapshot.region_codes,
+        "region_name": snapshot.region_names,
+        "value": snapshot.values,
+        "change_rate": np.round(snapshot.change_rate, 2),
+        "percentile": np.rint(snapshot.percentile).astype(np.int64),
+        "status": snapshot.status,
+    }
+
+def columnar_body(snapshot: KpiSnapshot, fmt: str) -> bytes:
+    """Arrow/MessagePack 본문. 형식별로 한 번만 인코딩해 스냅샷에 보관한다"""
+    body = snapshot.encoded.get(fmt)
+    if body is None:
+        body = snapshot.encoded[fmt] = encode_columns(
+            fmt, snapshot_columns(snapshot), {"computed_at": snapshot.computed_at}, dictionary=("status",),
+        )
+    return body
+
+def snapshot_body(snapshot: KpiSnapshot, fmt: str | None, accept_encoding: str) -> tuple[bytes, str | None]:
+    """JSON(fmt=None)/컬럼 형식 본문과 Content-Encoding. 압축본도 스냅샷당(= 데이터 버전당) 한 번만 만든다"""
+    raw = snapshot.body if fmt is None else columnar_body(snapshot, fmt)
+    encoding = choose_encoding(accept_encoding) if len(raw) >= settings.gzip_min_size else None
+    if encoding is None:
+        return raw, None
+    key = f"{fmt or 'json'}+{encoding}"
+    body = snapshot.encoded.get(key)
+    if body is None:
+        body = snapshot.encoded[key] = compress(raw, encoding)
+    return body, encoding
+
+def ranking(snapshot: KpiSnapshot, limit: int) -> dict:
+    """스냅샷 배열에서 상위/하위 limit개 지역을 뽑는다"""
+    def _entries(indices: np.ndarray) -> list[dict]:
+        return [
+            {
+                "region_code": snapshot.region_codes[i],
+                "region_name": snapshot.region_names[i],
+                "value": float(snapshot.values[i]),
+                "rank": int(snapshot.rank[i]),
+                "percentile": int(round(snapshot.percentile[i])),
+                "change_rate": _nullable(snapshot.change_rate[i], 2),
+                "status": snapshot.status[i],
+            }
+            for i in indices
+        ]
+    order = snapshot.order
+    return {"top": _entries(order[:limit]), "bottom": _entries(order[::-1][:limit])}
+
+class KpiSnapshotCache:
+    def __init__(self, maxsize: int):
+        self._cache = LRUCache(maxsize, name="kpi_snapshot")
+        # invalidate()마다 증가. 무효화 전에 만들기 시작한 스냅샷은 보관하지 않는다
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def _store(self, key: tuple[str, str, str], snapshot: KpiSnapshot, generation: int) -> None:
+        with self._lock:
+            if generation == self._generation:
+                self._cache.set(key, snapshot)
+
+    def get(self, level: str, metric: str, time: str) -> KpiSnapshot:
+        key = (level, metric, time)
+        snapshot = self._cache.get(key)
+        if snapshot is None:
+            generation = self._generation
+            with Session(read_engine) as session:
+                snapshot = build_snapshot(session, level, metric, time)
+            self._store(key, snapshot, generation)
+        return snapshot
+
+    async def aget(self, session: AsyncSession, level: str, metric: str, time: str) -> KpiSnapshot:
+        """비동기 라우트용: 캐시 미스일 때만 비동기 세션으로 스냅샷을 만든다"""
+        key = (level, metric, time)
+        snapshot = self._cache.get(key)
+        if snapshot is None:
+            generation = self._generation
+            snapshot = await session.run_sync(build_snapshot, level, metric, time)
+            self._store(key, snapshot, generation)
+        return snapshot
+
+    def warm(self, months: int) -> None:
+        """최근 N개월의 모든 (level, metric) 스냅샷을 미리 만든다 (이미 있는 스냅샷은 건너뜀)"""
+        generation = self._generation
+        with Session(read_engine) as session:
+            latest = session.exec(select(RegionStat.as_of).order_by(RegionStat.as_of.desc()).limit(1)).first()
+            if latest is None:
+                return
+            time = f"{latest.year:04d}-{latest.month:02d}"
+            for _ in range(months):
+                for level in KPI_LEVELS:
+                    for metric in METRIC_COLUMNS:
+                        key = (level, metric, time)
+                        if key not in self._cache:
+                            self._store(key, build_snapshot(session, level, metric, time), generation)
+                time = previous_month(time)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._cache.clear()
+
+kpi_cache = KpiSnapshotCache(settings.kpi_cache_size)
+on_data_change(kpi_cache.invalidate)
@@ -0,0 +1,97 @@
+"""
+목록 엔드포인트 공통: keyset 페이지네이션, fields= 컬럼 선택, NDJSON 스트리밍, Accept에 따른 컬럼 형식
+
+ORM 객체나 응답 모델을 만들지 않고 필요한 컬럼만 조회해 행 매핑을 곧바로 JSON으로 쓴다.
+NDJSON은 서버 측 커서에서 배치 단위로 읽어 내보내므로 전체 내보내기도 메모리가 일정하다.
+"""
+from __future__ import annotations
+import json
+from datetime import date, datetime
+from typing import Sequence
+
+from fastapi import HTTPException, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select, Table, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from .columnar import columnar_response
+from .db import async_engine
+from .metrics import timed_serialization
+
+DEFAULT_LIMIT = 500
+MAX_LIMIT = 5000
+STREAM_BATCH = 1000
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+FORMAT_PATTERN = r"^(json|ndjson)$"
+
+def _default(obj):
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    raise TypeError(f"Cannot serialize {type(obj).__name__}")
+
+def _dumps(obj) -> str:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=_default)
+
+def parse_fields(fields: str | None, allowed: Sequence[str]) -> tuple[str, ...]:
+    """'id,name' -> ('id', 'name'). 비어 있으면 전체, 모르는 컬럼은 400"""
+    names = tuple(dict.fromkeys(f.strip() for f in (fields or "").split(",") if f.strip()))
+    if not names:
+        return tuple(allowed)
+    unknown = [f for f in names if f not in allowed]
+    if unknown:
+        raise HTTPException(400, f"Unknown fields: {', '.join(unknown)}")
+    return names
+
+def keyset_select(table: Table, fields: Sequence[str], key: str = "id", cursor: int | None = None) -> Select:
+    """선택 컬럼 + 정렬 키만 조회하는 key 오름차순 쿼리 (cursor 이후부터)"""
+    columns = [table.c[f] for f in fields]
+    if key not in fields:
+        columns.append(table.c[key])
+    q = select(*columns).order_by(table.c[key])
+    if cursor is not None:
+        q = q.where(table.c[key] > cursor)
+    return q
+
+async def page_response(
+    session: AsyncSession, q: Select, fields: Sequence[str], limit: int | None, key: str = "id",
+    fmt: str | None = None, dictionary: Sequence[str] = (),
+) -> Response:
+    """limit개 JSON 배열 (fmt가 있으면 Arrow/MessagePack 컬럼 형식). 다음 페이지가 있으면 마지막 key를 X-Next-Cursor 헤더로.
+    limit이 None이면 전체 행"""
+    result = await session.exec(q if limit is None else q.limit(limit + 1))
+    names = list(result.keys())
+    rows = result.all()
+    headers = {}
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        headers["X-Next-Cursor"] = str(rows[-1][names.index(key)])
+    if fmt is not None:
+        # 행 dict 없이 결과 튜플을 컬럼으로 전치
+        columns = dict(zip(names, zip(*rows))) if rows else {name: () for name in names}
+        return columnar_response(fmt, {f: columns[f] for f in fields}, dictionary=dictionary, headers=headers)
+    positions = [(f, names.index(f)) for f in fields]
+    with timed_serialization():
+        body = _dumps([{f: r[i] for f, i in positions} for r in rows])
+    return Response(content=body, media_type="application/json", headers=headers)
+
+def ndjson_response(q: Select, fields: Sequence[str]) -> StreamingResponse:
+    """한 줄에 한 행. 요청 의존성 세션은 응답 전에 닫히므로 스트림 전용 세션을 연다"""
+    async def lines():
+        async with AsyncSession(async_engine) as session:
+            result = await session.stream(q.execution_options(yield_per=STREAM_BATCH))
+            async for rows in result.mappings().partitions():
+                with timed_serialization():
+                    chunk = "".join(_dumps({f: r[f] for f in fields}) + "\n" for r in rows)
+                yield chunk
+
+    return StreamingResponse(lines(), media_type=NDJSON_MEDIA_TYPE)
+
+async def list_response(
+    session: AsyncSession, q: Select, fields: Sequence[str], limit: int | None, format: str, key: str = "id",
+    fmt: str | None = None, dictionary: Sequence[str] = (), default_limit: int | None = DEFAULT_LIMIT,
+) -> Response:
+    """format=json이면 한 페이지(limit이 없으면 default_limit, None이면 전체; fmt로 컬럼 형식),
+    ndjson이면 limit이 없을 때 끝까지 스트리밍"""
+    if format == "ndjson":
+        return ndjson_response(q if limit is None else q.limit(limit), fields)
+    return await page_response(session, q, fields, limit or default_limit, key, fmt, dictionary)
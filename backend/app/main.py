@@ -1,63 +1,166 @@
-from fastapi import FastAPI, Depends, HTTPException, Query
+import asyncio
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Depends, HTTPException, Path, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy import func
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from .config import settings
-from .db import init_db, get_session
+from .db import async_write_engine, engine, init_db, get_async_session
 from .models import User, Center, RegionStat
-from .security import verify_password, create_access_token
-from .deps import get_current_user, require_roles
-from .schemas import Token, MeResponse, RegionStatResponse, CenterResponse
+from .security import averify_and_update, create_access_token, shutdown_password_pool
+from .deps import Principal, get_current_user, get_optional_user, require_roles, resolve_principal
+from .kpi import KPI_LEVELS, METRIC_COLUMNS, kpi_cache, month_range, ranking, snapshot_body
+from .columnar import FORMAT_MEDIA_TYPES, negotiate
+from .timeseries import load_trend
+from .regions import STAT_LEVELS, aget_tree, get_tree, sync_regions
+from .gazetteer import get_gazetteer, validate_scope
+from .geometry import LEVEL_SOURCES, source_path
+from .spatial import aget_center_index, get_center_index
+from .resolver import get_resolver, resolve_points
+from .listing import DEFAULT_LIMIT, FORMAT_PATTERN, MAX_LIMIT, keyset_select, list_response, parse_fields
+from .tiles import MAX_ZOOM, MEDIA_TYPE as TILE_MEDIA_TYPE, encoded_body, get_tile, warm_zoom_layers
+from .httpcache import ConditionalGetMiddleware, etag_matches
+from .shapes import prefetch_links, scope_indices, shapes_etag, shapes_response, shard_store
+from .stream import STREAM_PATH, StreamingGZipMiddleware, broadcaster, stream_response
+from .metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsMiddleware, TimedJSONResponse, render_metrics
+from .profiling import profiler
+from .versioning import bump_data_version, poll_data_version, refresh_data_version
+from .schemas import (
+    Token, MeResponse, UserResponse, RegionStatResponse, CenterResponse, NearbyCenterResponse, ResolveRequest, ResolveResponse,
+)
+
+_warmed = False
+
+def warm_caches() -> None:
+    """지역 트리, 경계 지오메트리/해석기, 타일용 줌별 단순화, 이름 사전, 센터 인덱스, 최근 KPI 스냅샷을 미리 올린다.
+
+    `python -m app serve`는 fork 전에 마스터에서 한 번 호출해 워커들이 copy-on-write로 공유한다.
+    """
+    global _warmed
+    if _warmed:
+        return
+    init_db()
+    with Session(engine) as session:
+        sync_regions(session)
+    refresh_data_version() or bump_data_version()
+    get_tree()
+    for level in LEVEL_SOURCES:
+        if source_path(level) is not None:
+            get_resolver(level)  # load_layer 포함
+            warm_zoom_layers(level, settings.tile_warm_max_zoom)
+    get_gazetteer()
+    get_center_index()
+    kpi_cache.warm(settings.kpi_warm_months)
+    _warmed = True
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    warm_caches()
+    # 다른 워커/CLI가 쓴 데이터를 감지해 이 워커의 캐시를 비운다
+    poller = asyncio.create_task(poll_data_version(settings.data_version_poll_seconds))
+    pusher = asyncio.create_task(broadcaster.run())
+    try:
+        yield
+    finally:
+        poller.cancel()
+        pusher.cancel()
+        shutdown_password_pool()
+        profiler.flush(timeout=5)
 
-app = FastAPI(title="GeoMap Dementia Center Service API", version="0.1.0")
+app = FastAPI(
+    title="GeoMap Dementia Center Service API", version="0.1.0",
+    default_response_class=TimedJSONResponse, lifespan=lifespan,
+)
 
+# 나중에 추가한 미들웨어가 바깥쪽: 계측 -> CORS -> gzip -> 조건부 GET(ETag/304) -> 라우트
+app.add_middleware(ConditionalGetMiddleware)
+app.add_middleware(StreamingGZipMiddleware, minimum_size=settings.gzip_min_size)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[o.strip() for o in settings.cors_allow_origins if o.strip()],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Server-Timing", "Link"],
 )
-
-@app.on_event("startup")
-def on_startup():
-    init_db()
+app.add_middleware(MetricsMiddleware, unprofiled=(STREAM_PATH,))
 
 @app.get("/health")
 def health():
     return {"ok": True}
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus 텍스트 형식 (라우트별 지연/DB 쿼리/직렬화 시간, 캐시 적중)"""
+    return Response(content=render_metrics(), media_type=METRICS_CONTENT_TYPE)
+
 # ---------- Auth ----------
 @app.post("/auth/login", response_model=Token)
-def login(
+async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
 ):
-    user = session.exec(select(User).where(User.username == form_data.username)).first()
-    if not user or not verify_password(form_data.password, user.password_hash):
+    user = (await session.exec(select(User).where(User.username == form_data.username))).first()
+    if not user:
         raise HTTPException(status_code=401, detail="Invalid username/password")
+    ok, new_hash = await averify_and_update(form_data.password, user.password_hash)
+    if not ok:
+        raise HTTPException(status_code=401, detail="Invalid username/password")
+    if new_hash:
+        # 해시 스킴/rounds 설정이 바뀌었으면 로그인 시 다시 저장 (조회 세션은 읽기 전용이라 쓰기 엔진으로).
+        # 벌크 update가 아니라 객체로 바꿔야 커밋 훅이 이 사용자의 캐시 항목만 무효화한다
+        async with AsyncSession(async_write_engine) as writer:
+            stored = await writer.get(User, user.id)
+            stored.password_hash = new_hash
+            writer.add(stored)
+            await writer.commit()
     token = create_access_token(subject=user.username, role=user.role, region_code=user.region_code)
     return Token(access_token=token)
 
 @app.get("/auth/me", response_model=MeResponse)
-def me(user: User = Depends(get_current_user)):
+async def me(user: Principal = Depends(get_current_user)):
     return MeResponse(username=user.username, role=user.role, region_code=user.region_code)
 
 # ---------- Geo / Stats ----------
+def check_metrics(*metrics: str) -> None:
+    """모르는 지표는 400 (스냅샷 캐시 키에 들어가므로 검증 없이 받으면 같은 데이터가 키마다 따로 쌓인다)"""
+    if not metrics or any(m not in METRIC_COLUMNS for m in metrics):
+        raise HTTPException(400, "Unknown metric")
+
 @app.get("/geo/stats", response_model=list[RegionStatResponse])
-def get_stats(
+async def get_stats(
+    request: Request,
     level: str = Query(..., description="national|sido|sigungu|eupmyeondong"),
     parent_code: str | None = Query(None, description="상위 지역 코드 (드릴다운용)"),
-    session: Session = Depends(get_session),
-    user: User = Depends(get_current_user),
+    time: str | None = Query(None, pattern=r"^\d{4}-(0[1-9]|1[0-2])$", description="YYYY-MM (기본: 해당 레벨의 최근 월)"),
+    fields: str | None = Query(None, description="쉼표로 구분한 응답 컬럼 (기본 전체)"),
+    cursor: int | None = Query(None, description="이전 페이지의 X-Next-Cursor"),
+    limit: int | None = Query(None, ge=1, le=MAX_LIMIT),
+    format: str = Query("json", pattern=FORMAT_PATTERN),
+    session: AsyncSession = Depends(get_async_session),
+    user: Principal = Depends(get_current_user),
 ):
     # 권한 예시: metro는 본인 region_code 하위만, district는 본인 region_code만, citizen은 공개 범위만
-    q = select(RegionStat).where(RegionStat.level == level)
+    fmt = negotiate(request.headers.get("accept"))
+    tree = await aget_tree()
+    validate_scope(level, STAT_LEVELS, parent_code, tree)
+    columns = parse_fields(fields, tuple(RegionStatResponse.model_fields))
+    q = keyset_select(RegionStat.__table__, columns, cursor=cursor).where(RegionStat.level == level)
+    if time is None:
+        # 기본은 해당 레벨의 최근 월 (레벨에 행이 없으면 어차피 빈 결과)
+        latest = (await session.exec(select(func.max(RegionStat.as_of)).where(RegionStat.level == level))).first()
+        time = latest.strftime("%Y-%m") if latest else None
+    if time is not None:
+        start, end = month_range(time)
+        q = q.where(RegionStat.as_of >= start, RegionStat.as_of < end)
 
     if parent_code:
-        # 간단 규칙: region_code가 parent_code로 시작한다고 가정 (실서비스에서는 별도 매핑 테이블 권장)
-        q = q.where(RegionStat.region_code.startswith(parent_code))
+        # 지역 계층 트리에서 하위 코드 목록을 풀어 IN 조회
+        q = q.where(RegionStat.region_code.in_(tree.descendants(parent_code, level)))
 
     if user.role == "district":
         if not user.region_code:
@@ -66,27 +169,22 @@ def get_stats(
     elif user.role == "metro":
         if not user.region_code:
             raise HTTPException(400, "metro user has no region_code")
-        q = q.where(RegionStat.region_code.startswith(user.region_code))
+        q = q.where(RegionStat.region_code.in_(tree.descendants(user.region_code, level)))
     # national, citizen은 전체 허용(여기선 demo)
 
-    rows = session.exec(q).all()
-    return [
-        RegionStatResponse(
-            level=r.level,
-            region_code=r.region_code,
-            centers_count=r.centers_count,
-            pet_positive_rate=r.pet_positive_rate,
-            risk_score_avg=r.risk_score_avg,
-        )
-        for r in rows
-    ]
+    # limit/cursor 없이 부르던 기존 클라이언트는 예전처럼 전체 행을 받는다 (한 레벨·한 달이라 지역 수만큼)
+    default_limit = DEFAULT_LIMIT if cursor is not None else None
+    return await list_response(
+        session, q, columns, limit, format, fmt=fmt, dictionary=("level",), default_limit=default_limit,
+    )
 
 @app.get("/geo/kpi")
-def get_kpi(
+async def get_kpi(
+    request: Request,
     level: str = Query("sido", description="sido|sigungu|eupmyeondong"),
     metric: str = Query("risk_score", description="risk_score|elderly_ratio|screening_rate"),
-    time: str = Query("2025-09", description="YYYY-MM"),
-    session: Session = Depends(get_session),
+    time: str = Query("2025-09", pattern=r"^\d{4}-(0[1-9]|1[0-2])$", description="YYYY-MM"),
+    session: AsyncSession = Depends(get_async_session),
 ):
     """
     지오맵 대시보드용 KPI 데이터 엔드포인트
@@ -97,85 +195,223 @@ def get_kpi(
     - time: 기간 (YYYY-MM 형식)
     
     Response: KPI 레코드 배열 (region_code, region_name, value, change_rate, percentile, status, computed_at)
+    region_name은 이름 사전(gazetteer)에서 채우므로 표/순위 화면은 경계 파일 없이 그릴 수 있다.
+    미리 직렬화된 스냅샷을 그대로 반환하므로 캐시 적중 시 DB에 접근하지 않는다 (gzip/br 압축본도 스냅샷에 한 번만 만들어 둔다).
+    Accept가 Arrow/MessagePack이면 같은 필드를 컬럼 형식으로 (computed_at은 메타데이터).
     """
-    # Map metric to RegionStat column
-    metric_map = {
-        "risk_score": "risk_score_avg",
-        "elderly_ratio": "pet_positive_rate",  # PET positive rate as proxy
-        "screening_rate": "centers_count",
-    }
-    
-    column_name = metric_map.get(metric, "risk_score_avg")
-    
-    # Query RegionStat from database
-    q = select(RegionStat).where(RegionStat.level == level)
-    rows = session.exec(q).all()
-    
-    if not rows:
-        return []
-    
-    # Convert to KPI response format
-    result = []
-    for row in rows:
-        if column_name == "risk_score_avg":
-            value = row.risk_score_avg or 50.0
-        elif column_name == "pet_positive_rate":
-            value = (row.pet_positive_rate or 0.15) * 100  # Convert to percentage
-        else:
-            value = float(row.centers_count or 0)
-        
-        # Simple percentile calculation (0-100 based on position)
-        percentile = min(99, max(1, int((value / 100.0) * 100)))
-        status = "normal" if percentile < 70 else ("warning" if percentile < 85 else "alert")
-        
-        result.append({
-            "region_code": row.region_code,
-            "region_name": row.region_code,  # Will be enriched by frontend
-            "value": value,
-            "change_rate": 0.0,
-            "percentile": percentile,
-            "status": status,
-            "computed_at": "2025-01-29T00:00:00Z"
-        })
-    
-    return result
+    validate_scope(level, KPI_LEVELS)
+    check_metrics(metric)
+    fmt = negotiate(request.headers.get("accept"))
+    snapshot = await kpi_cache.aget(session, level, metric, time)
+    body, encoding = snapshot_body(snapshot, fmt, request.headers.get("accept-encoding", ""))
+    headers = {"Vary": "Accept-Encoding"}
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    media_type = "application/json" if fmt is None else FORMAT_MEDIA_TYPES[fmt]
+    return Response(content=body, media_type=media_type, headers=headers)
+
+@app.get("/geo/stream")
+async def stream_kpi(
+    request: Request,
+    level: str = Query("sido", description="sido|sigungu|eupmyeondong"),
+    metrics: str = Query("risk_score", description="쉼표로 구분한 지표 (risk_score,elderly_ratio,screening_rate)"),
+    time: str = Query("2025-09", pattern=r"^\d{4}-(0[1-9]|1[0-2])$", description="YYYY-MM"),
+    access_token: str | None = Query(None, description="EventSource는 헤더를 못 보내므로 토큰을 쿼리로도 받는다"),
+    user: Principal | None = Depends(get_optional_user),
+):
+    """KPI 푸시 (SSE). 처음에 snapshot 이벤트, 이후 데이터가 바뀌면 바뀐 지역만 delta 이벤트"""
+    validate_scope(level, KPI_LEVELS)
+    names = tuple(dict.fromkeys(m.strip() for m in metrics.split(",") if m.strip()))
+    check_metrics(*names)
+    if user is None and access_token:
+        user = await resolve_principal(access_token)
+    group, queue = await broadcaster.subscribe(level, names, time, user, request.headers.get("last-event-id"))
+    return stream_response(group, queue)
+
+@app.get("/geo/ranking")
+async def get_ranking(
+    level: str = Query("sido", description="sido|sigungu|eupmyeondong"),
+    metric: str = Query("risk_score", description="risk_score|elderly_ratio|screening_rate"),
+    time: str = Query("2025-09", pattern=r"^\d{4}-(0[1-9]|1[0-2])$", description="YYYY-MM"),
+    limit: int = Query(20, ge=1, le=500),
+    session: AsyncSession = Depends(get_async_session),
+):
+    """KPI 스냅샷 기준 상위/하위 지역 (rank, percentile, change_rate 포함)"""
+    validate_scope(level, KPI_LEVELS)
+    check_metrics(metric)
+    return ranking(await kpi_cache.aget(session, level, metric, time), limit)
+
+@app.get("/geo/trend")
+async def get_trend(
+    level: str = Query(..., description="sido|sigungu|eupmyeondong"),
+    metric: str = Query("risk_score", description="risk_score|elderly_ratio|screening_rate"),
+    region_code: str = Query(...),
+    start: str | None = Query(None, pattern=r"^\d{4}-(0[1-9]|1[0-2])$", description="시작 월 YYYY-MM (포함)"),
+    end: str | None = Query(None, pattern=r"^\d{4}-(0[1-9]|1[0-2])$", description="마지막 월 YYYY-MM (포함)"),
+    months: int = Query(24, ge=1, le=240, description="최근 N개월까지만"),
+    max_points: int | None = Query(None, ge=1, le=240, description="구간 평균으로 다운샘플링"),
+    session: AsyncSession = Depends(get_async_session),
+):
+    """지역 하나의 월별 추이 (TrendPoint 배열: time, value)"""
+    validate_scope(level, STAT_LEVELS)
+    check_metrics(metric)
+    return await session.run_sync(load_trend, level, metric, region_code, start, end, months, max_points)
+
+@app.get("/geo/shapes/{level}")
+async def get_shapes(
+    request: Request,
+    level: str,
+    parent_code: str | None = Query(None, description="상위 지역 코드 (없으면 레벨 전체)"),
+    metric: str = Query("risk_score", description="risk_score|elderly_ratio|screening_rate"),
+    time: str = Query("2025-09", pattern=r"^\d{4}-(0[1-9]|1[0-2])$", description="YYYY-MM"),
+    session: AsyncSession = Depends(get_async_session),
+):
+    """상위 지역 하나의 하위 경계(GeoJSON)와 KPI를 한 응답으로. 다음 드릴다운 후보는 Link: rel=prefetch"""
+    check_metrics(metric)
+    shard = shard_store.get(level, parent_code)
+    if shard is None:
+        raise HTTPException(404, "No shapes for this level/parent_code")
+    etag = shapes_etag(level, parent_code, metric, time, shard)
+    headers = {"ETag": etag, "Cache-Control": "public, no-cache"}
+    if etag_matches(request.headers.get("if-none-match", ""), etag):
+        return Response(status_code=304, headers=headers)
+
+    snapshot = await kpi_cache.aget(session, level, metric, time)
+    indices = scope_indices(snapshot, await aget_tree(), level, parent_code)
+    links = prefetch_links(snapshot, indices, level, metric, time, settings.shapes_prefetch)
+    if links:
+        headers["Link"] = ", ".join(links)
+    return shapes_response(snapshot, indices, shard, parent_code, headers)
+
+@app.get("/geo/tiles/{level}/{z}/{x}/{y}")
+def get_geo_tile(
+    request: Request,
+    level: str,
+    z: int = Path(..., ge=0, le=MAX_ZOOM),
+    x: int = Path(..., ge=0),
+    y: int = Path(..., ge=0),
+):
+    """레벨 경계 벡터 타일 (MVT). 줌별 단순화/양자화, ETag, gzip/br 사전 압축"""
+    if level not in LEVEL_SOURCES or source_path(level) is None:
+        raise HTTPException(404, "Unknown level")
+    if x >= 1 << z or y >= 1 << z:
+        raise HTTPException(404, "Tile out of range")
+
+    tile = get_tile(level, z, x, y)
+    headers = {"ETag": tile.etag, "Cache-Control": "public, max-age=86400", "Vary": "Accept-Encoding"}
+    if etag_matches(request.headers.get("if-none-match", ""), tile.etag):
+        return Response(status_code=304, headers=headers)
+    if not tile.raw:
+        return Response(status_code=204, headers=headers)
+    body, encoding = encoded_body(tile, request.headers.get("accept-encoding", ""))
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type=TILE_MEDIA_TYPE, headers=headers)
+
+@app.post("/geo/resolve", response_model=ResolveResponse)
+def resolve_regions(body: ResolveRequest, user: Principal = Depends(get_current_user)):
+    """좌표 묶음 -> 레벨별 행정구역 코드 (벌크 적재 시 region_code 채우기/검증용)"""
+    levels = tuple(body.levels) if body.levels else None
+    if levels and any(lv not in LEVEL_SOURCES for lv in levels):
+        raise HTTPException(400, "Unknown level")
+    if not body.points:
+        return ResolveResponse(results={})
+    lats, lngs = zip(*body.points)
+    return ResolveResponse(results=resolve_points(lats, lngs, levels))
+
+async def center_scope(user: Principal) -> tuple[str, ...] | None:
+    """사용자가 볼 수 있는 센터 region_code 목록 (None이면 전체)"""
+    if user.role == "district" and user.region_code:
+        return (user.region_code,)
+    if user.role == "metro" and user.region_code:
+        return (await aget_tree()).descendants(user.region_code)
+    return None
 
 @app.get("/centers", response_model=list[CenterResponse])
-def list_centers(
+async def list_centers(
     region_code: str | None = None,
-    session: Session = Depends(get_session),
-    user: User = Depends(get_current_user),
+    fields: str | None = Query(None, description="쉼표로 구분한 응답 컬럼 (기본 전체)"),
+    cursor: int | None = Query(None, description="이전 페이지의 X-Next-Cursor"),
+    limit: int | None = Query(None, ge=1, le=MAX_LIMIT),
+    format: str = Query("json", pattern=FORMAT_PATTERN),
+    session: AsyncSession = Depends(get_async_session),
+    user: Principal = Depends(get_current_user),
 ):
-    q = select(Center)
+    columns = parse_fields(fields, tuple(CenterResponse.model_fields))
+    q = keyset_select(Center.__table__, columns, cursor=cursor)
     if region_code:
         q = q.where(Center.region_code == region_code)
 
-    if user.role == "district" and user.region_code:
-        q = q.where(Center.region_code == user.region_code)
-    elif user.role == "metro" and user.region_code:
-        q = q.where(Center.region_code.startswith(user.region_code))
+    scope = await center_scope(user)
+    if scope is not None:
+        q = q.where(Center.region_code.in_(scope))
 
-    rows = session.exec(q).all()
-    return [CenterResponse(**r.model_dump()) for r in rows]
+    return await list_response(session, q, columns, limit, format)
+
+@app.get("/centers/nearest", response_model=list[NearbyCenterResponse])
+async def nearest_centers(
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    k: int = Query(10, ge=1, le=100),
+    user: Principal = Depends(get_current_user),
+):
+    """좌표에서 가까운 센터 k개 (메모리 격자 인덱스, 위경도 없는 센터 제외)"""
+    found = (await aget_center_index()).nearest(lat, lng, k, await center_scope(user))
+    return [NearbyCenterResponse(**c.model_dump(), distance_km=round(d, 3)) for c, d in found]
+
+@app.get("/centers/bbox", response_model=list[CenterResponse])
+async def centers_in_bbox(
+    response: Response,
+    min_lat: float = Query(..., ge=-90, le=90),
+    min_lng: float = Query(..., ge=-180, le=180),
+    max_lat: float = Query(..., ge=-90, le=90),
+    max_lng: float = Query(..., ge=-180, le=180),
+    limit: int = Query(200, ge=1, le=1000),
+    cursor: int | None = Query(None, description="이전 페이지의 X-Next-Cursor"),
+    user: Principal = Depends(get_current_user),
+):
+    """뷰포트 안의 센터 (id 순 keyset 페이지네이션, 다음 커서는 X-Next-Cursor 헤더)"""
+    if min_lat > max_lat or min_lng > max_lng:
+        raise HTTPException(400, "Invalid bbox")
+    centers, next_cursor = (await aget_center_index()).bbox(
+        min_lat, min_lng, max_lat, max_lng, await center_scope(user), cursor, limit
+    )
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = str(next_cursor)
+    return centers
 
 @app.get("/centers/{center_id}", response_model=CenterResponse)
-def get_center(
+async def get_center(
     center_id: int,
-    session: Session = Depends(get_session),
-    user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session),
+    user: Principal = Depends(get_current_user),
 ):
-    center = session.get(Center, center_id)
+    center = await session.get(Center, center_id)
     if not center:
         raise HTTPException(404, "Not found")
 
     if user.role == "district" and user.region_code and center.region_code != user.region_code:
         raise HTTPException(403, "Forbidden")
-    if user.role == "metro" and user.region_code and not center.region_code.startswith(user.region_code):
+    if user.role == "metro" and user.region_code and not (await aget_tree()).is_within(center.region_code, user.region_code):
         raise HTTPException(403, "Forbidden")
 
-    return CenterResponse(**center.model_dump())
+    return center
 
 # ---------- Admin-only example ----------
-@app.get("/admin/users", dependencies=[Depends(require_roles("national"))])
-def list_users(session: Session = Depends(get_session)):
-    return session.exec(select(User)).all()
+@app.get("/admin/users", response_model=list[UserResponse], dependencies=[Depends(require_roles("national"))])
+async def list_users(
+    fields: str | None = Query(None, description="쉼표로 구분한 응답 컬럼 (기본 전체)"),
+    cursor: int | None = Query(None, description="이전 페이지의 X-Next-Cursor"),
+    limit: int | None = Query(None, ge=1, le=MAX_LIMIT),
+    format: str = Query("json", pattern=FORMAT_PATTERN),
+    session: AsyncSession = Depends(get_async_session),
+):
+    columns = parse_fields(fields, tuple(UserResponse.model_fields))
+    q = keyset_select(User.__table__, columns, cursor=cursor)
+    return await list_response(session, q, columns, limit, format)
+
+@app.post("/admin/profiling", dependencies=[Depends(require_roles("national"))])
+def set_profiling(slow_ms: float = Query(..., ge=0, description="이 시간(ms) 이상 걸린 요청의 스택 저장 (0이면 끔)")):
+    """느린 요청 샘플링 프로파일러 켜기/끄기 (프로세스 단위)"""
+    profiler.slow_ms = slow_ms
+    return {"slow_ms": profiler.slow_ms, "interval_ms": profiler.interval * 1000, "dir": str(profiler.out_dir)}
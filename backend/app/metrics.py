@@ -0,0 +1,232 @@
+"""
+요청 단위 계측 / Prometheus 텍스트 노출 (/metrics)
+
+- 라우트별 지연 히스토그램, 상태 코드별 요청 수
+- 요청당 DB 쿼리 수/시간: db.py의 모든 엔진(조회/쓰기, 비동기 엔진은 sync_engine)의 cursor execute 이벤트
+- 요청당 JSON 직렬화 시간 (TimedJSONResponse, listing 직렬화)
+- 이름 있는 캐시(cache.CACHES)의 적중/실패 수
+요청 중 누적값은 contextvar의 RequestStats에 모으며, 응답에는 Server-Timing 헤더로도 붙는다.
+"""
+from __future__ import annotations
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Iterator, Sequence
+
+from fastapi.responses import JSONResponse
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .cache import CACHES
+from .db import sync_engines
+from .profiling import profiler
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+def _fmt(value: float) -> str:
+    return repr(float(value)) if value != float("inf") else "+Inf"
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+class Counter:
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name, self.help, self.labelnames = name, help, tuple(labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        lines += [f"{self.name}{_labels(self.labelnames, k)} {_fmt(v)}" for k, v in items]
+        return lines
+
+class Histogram:
+    def __init__(self, name: str, help: str, buckets: Sequence[float], labelnames: Sequence[str] = ()):
+        self.name, self.help, self.labelnames = name, help, tuple(labelnames)
+        self.buckets = tuple(buckets) + (float("inf"),)
+        # labels -> [버킷별 개수..., 합계, 개수]
+        self._values: dict[tuple[str, ...], list[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        with self._lock:
+            row = self._values.get(labels)
+            if row is None:
+                row = self._values[labels] = [0.0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    row[i] += 1
+                    break
+            row[-2] += value
+            row[-1] += 1
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._values.items())
+        for labels, row in items:
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, row):
+                cumulative += count
+                le = f'le="{_fmt(bound)}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {_fmt(cumulative)}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_fmt(row[-2])}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {_fmt(row[-1])}")
+        return lines
+
+REQUESTS = Counter("http_requests_total", "HTTP requests", ("method", "route", "status"))
+REQUEST_SECONDS = Histogram("http_request_duration_seconds", "HTTP request latency", LATENCY_BUCKETS, ("method", "route"))
+REQUEST_DB_QUERIES = Histogram("http_request_db_queries", "DB queries per request", COUNT_BUCKETS, ("method", "route"))
+REQUEST_DB_SECONDS = Histogram("http_request_db_seconds", "DB time per request", LATENCY_BUCKETS, ("method", "route"))
+REQUEST_SERIALIZE_SECONDS = Histogram(
+    "http_request_serialize_seconds", "JSON serialization time per request", LATENCY_BUCKETS, ("method", "route")
+)
+DB_QUERY_SECONDS = Histogram("db_query_duration_seconds", "Single DB query latency (all callers)", LATENCY_BUCKETS)
+SLOW_PROFILES = Counter("slow_request_profiles_total", "Folded stack dumps written for slow requests", ("route",))
+METRICS = (REQUESTS, REQUEST_SECONDS, REQUEST_DB_QUERIES, REQUEST_DB_SECONDS, REQUEST_SERIALIZE_SECONDS, DB_QUERY_SECONDS, SLOW_PROFILES)
+
+@dataclass
+class RequestStats:
+    db_queries: int = 0
+    db_seconds: float = 0.0
+    serialize_seconds: float = 0.0
+
+_current: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+@contextmanager
+def timed_serialization() -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats = _current.get()
+        if stats is not None:
+            stats.serialize_seconds += time.perf_counter() - started
+
+class TimedJSONResponse(JSONResponse):
+    """FastAPI 기본 응답 클래스: JSON 인코딩 시간을 요청 통계에 더한다"""
+
+    def render(self, content) -> bytes:
+        with timed_serialization():
+            return super().render(content)
+
+# ---------- DB 쿼리 계측 ----------
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("query_started")
+    if not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    DB_QUERY_SECONDS.observe(elapsed)
+    stats = _current.get()
+    if stats is not None:
+        stats.db_queries += 1
+        stats.db_seconds += elapsed
+
+def _handle_error(exception_context):
+    # 실패한 쿼리는 after_cursor_execute가 불리지 않으므로 시작 시각을 버린다
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_started"):
+        conn.info["query_started"].pop()
+
+def instrument_engine(target: Engine) -> None:
+    if not event.contains(target, "before_cursor_execute", _before_cursor_execute):
+        event.listen(target, "before_cursor_execute", _before_cursor_execute)
+        event.listen(target, "after_cursor_execute", _after_cursor_execute)
+        event.listen(target, "handle_error", _handle_error)
+
+for _engine in sync_engines():
+    instrument_engine(_engine)
+
+# ---------- 미들웨어 ----------
+def _route_label(scope: Scope) -> str:
+    # 경로 파라미터를 템플릿으로 묶어 라벨 수를 제한한다
+    route = scope.get("route")
+    if route is None and "app" in scope:
+        # 라우팅 전에 끝난 응답(조건부 GET 304 등)은 라우트 표를 직접 맞춰 본다
+        route = next((r for r in scope["app"].router.routes if r.matches(scope)[0] == Match.FULL), None)
+    return getattr(route, "path", None) or "unmatched"
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp, unprofiled: Sequence[str] = ()):
+        self.app = app
+        # 오래 열려 있는 연결(SSE 등)은 항상 slow_ms를 넘으므로 프로파일하지 않는다
+        self.unprofiled = frozenset(unprofiled)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        recording = None if scope["path"] in self.unprofiled else profiler.start()
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                MutableHeaders(scope=message).append("Server-Timing", (
+                    f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.db_queries} queries", '
+                    f"ser;dur={stats.serialize_seconds * 1000:.1f}, "
+                    f"app;dur={(time.perf_counter() - started) * 1000:.1f}"
+                ))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            elapsed = time.perf_counter() - started
+            method, route = scope["method"], _route_label(scope)
+            REQUESTS.inc(method, route, str(status))
+            REQUEST_SECONDS.observe(elapsed, method, route)
+            REQUEST_DB_QUERIES.observe(stats.db_queries, method, route)
+            REQUEST_DB_SECONDS.observe(stats.db_seconds, method, route)
+            REQUEST_SERIALIZE_SECONDS.observe(stats.serialize_seconds, method, route)
+            if profiler.stop(recording, f"{method} {route}", elapsed * 1000):
+                SLOW_PROFILES.inc(route)
+            _current.reset(token)
+
+# ---------- 노출 ----------
+def _cache_lines() -> list[str]:
+    lines = []
+    for metric, help, kind, attr in (
+        ("cache_hits_total", "Cache hits", "counter", "hits"),
+        ("cache_misses_total", "Cache misses", "counter", "misses"),
+        ("cache_entries", "Cached entries", "gauge", None),
+    ):
+        lines += [f"# HELP {metric} {help}", f"# TYPE {metric} {kind}"]
+        for name, cache in sorted(CACHES.items()):
+            value = len(cache) if attr is None else getattr(cache, attr)
+            lines.append(f'{metric}{{cache="{name}"}} {_fmt(value)}')
+    return lines
+
+def render_metrics() -> str:
+    lines: list[str] = []
+    for metric in METRICS:
+        lines += metric.render()
+    lines += _cache_lines()
+    return "\n".join(lines) + "\n"
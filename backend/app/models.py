@@ -1,8 +1,13 @@
 from __future__ import annotations
 from typing import Optional
 from datetime import datetime
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field
 
+def current_month() -> datetime:
+    """이번 달 1일 0시 (RegionStat.as_of 기본값, 월 단위 유일 키와 맞춤)"""
+    return datetime.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
 class User(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     username: str = Field(index=True, unique=True)
@@ -10,6 +15,15 @@ class User(SQLModel, table=True):
     role: str = Field(index=True)  # citizen | district | metro | national
     region_code: Optional[str] = Field(default=None, index=True)  # 담당 지역(예: 시도/시군구 코드)
 
+class Region(SQLModel, table=True):
+    # 지역 계층 (sido -> sigungu -> eupmyeondong). 경로 컬럼(sido_code, sigungu_code)은 적재 시 미리 계산
+    code: str = Field(primary_key=True)
+    name: str
+    level: str = Field(index=True)  # sido | sigungu | eupmyeondong
+    parent_code: Optional[str] = Field(default=None, index=True)
+    sido_code: str = Field(index=True)
+    sigungu_code: Optional[str] = Field(default=None, index=True)
+
 class Center(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     name: str
@@ -21,11 +35,34 @@ class Center(SQLModel, table=True):
     level: str = Field(index=True, default="district")  # district | metro
 
 class RegionStat(SQLModel, table=True):
+    # 월별 이력 테이블(append-only): (level, region_code, as_of)당 한 행, as_of는 해당 월 1일
+    __table_args__ = (
+        Index("ix_regionstat_level_region_code_as_of", "level", "region_code", "as_of", unique=True),
+        # KPI 스냅샷 조회(level + as_of 범위)가 테이블을 읽지 않도록 지표 컬럼까지 담은 커버링 인덱스 (롤업의 월별 조회도 사용)
+        Index(
+            "ix_regionstat_level_as_of_values",
+            "level", "as_of", "region_code", "risk_score_avg", "pet_positive_rate", "centers_count",
+        ),
+        # 추이 조회(level + region_code + as_of 범위)용 커버링 인덱스. 위 인덱스도 커버링이라
+        # 통계(sqlite_stat1)가 없거나 오래되면 플래너가 level만 맞는 위 인덱스로 레벨 전체를 읽는다
+        Index(
+            "ix_regionstat_trend",
+            "level", "region_code", "as_of", "risk_score_avg", "pet_positive_rate", "centers_count",
+        ),
+    )
     id: Optional[int] = Field(default=None, primary_key=True)
     # level: national(대한민국), sido(시도), sigungu(시군구), eupmyeondong(읍면동) 등
-    level: str = Field(index=True)
-    region_code: str = Field(index=True)
-    as_of: datetime = Field(default_factory=datetime.utcnow, index=True)
+    # level/region_code 단독 인덱스는 두지 않는다 (아래 복합 인덱스들이 level로 시작)
+    level: str
+    region_code: str
+    as_of: datetime = Field(default_factory=current_month, index=True)
     centers_count: int = 0
+    population: int = Field(default=0, sa_column_kwargs={"server_default": "0"})  # 롤업 가중치 (인구 가중 평균)
     pet_positive_rate: float = 0.0
     risk_score_avg: float = 0.0
+
+class DataVersion(SQLModel, table=True):
+    # 단일 행(id=1) 카운터. RegionStat/Center/Region 변경 시 증가하며 워커들이 poll해 캐시를 비운다
+    id: int = Field(default=1, primary_key=True)
+    epoch: str
+    version: int = 0
@@ -0,0 +1,136 @@
+"""
+느린 요청 샘플링 프로파일러 (opt-in)
+
+요청이 진행 중인 동안 별도 스레드가 interval마다 sys._current_frames()를 읽어 app 코드가 올라와 있는
+스레드(이벤트 루프, 스레드풀)의 스택을 모은다. 요청이 slow_ms 이상 걸리면 스택을 folded 형식
+("a;b;c 12")으로 저장하므로 flamegraph.pl, speedscope 등에 바로 넣을 수 있다.
+동시에 진행 중인 요청의 스택이 섞일 수 있다 (요청이 진행되는 동안의 샘플).
+파일은 writer 스레드 하나가 크기 제한 큐에서 꺼내 쓰고, 큐가 차면 그 프로파일은 버린다.
+"""
+from __future__ import annotations
+import logging
+import queue
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+from .config import settings
+
+_APP_DIR = str(Path(__file__).resolve().parent)
+WRITE_QUEUE_SIZE = 32   # 디스크가 느려 이만큼 밀리면 새 프로파일은 버린다
+
+log = logging.getLogger(__name__)
+
+def _frame_name(frame) -> str:
+    return f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_name}"
+
+def _fold(frame) -> str | None:
+    """루트 -> 리프 순 folded 스택. app 코드가 없는 스택(대기 중인 스레드)은 None"""
+    names = []
+    in_app = False
+    while frame is not None:
+        names.append(_frame_name(frame))
+        in_app = in_app or frame.f_code.co_filename.startswith(_APP_DIR)
+        frame = frame.f_back
+    return ";".join(reversed(names)) if in_app else None
+
+class _Recording:
+    __slots__ = ("samples",)
+
+    def __init__(self):
+        self.samples: Counter[str] = Counter()
+
+class SlowRequestProfiler:
+    def __init__(self, slow_ms: float, interval_ms: float, out_dir: str, queue_size: int = WRITE_QUEUE_SIZE):
+        self.slow_ms = slow_ms
+        self.interval = interval_ms / 1000
+        self.out_dir = Path(out_dir)
+        self._active: set[_Recording] = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._writes: queue.Queue[tuple[Path, str]] = queue.Queue(queue_size)
+        self._writer: threading.Thread | None = None
+        self._pending = 0   # 큐에 넣었지만 아직 다 쓰지 않은 파일 수
+        self._idle = threading.Condition()
+
+    @property
+    def enabled(self) -> bool:
+        return self.slow_ms > 0
+
+    def start(self) -> _Recording | None:
+        if not self.enabled:
+            return None
+        recording = _Recording()
+        with self._lock:
+            self._active.add(recording)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="slow-request-profiler", daemon=True)
+                self._thread.start()
+        self._wake.set()
+        return recording
+
+    def stop(self, recording: _Recording | None, label: str, elapsed_ms: float) -> Path | None:
+        """기록을 끝내고, 느린 요청이면 folded 스택 파일 경로를 돌려준다 (파일은 writer 스레드가 쓴다)"""
+        if recording is None:
+            return None
+        with self._lock:
+            self._active.discard(recording)
+        if elapsed_ms < self.slow_ms or not recording.samples:
+            return None
+        safe = re.sub(r"[^A-Za-z0-9_.-]+", "_", label).strip("_")
+        path = self.out_dir / f"{datetime.now():%Y%m%d-%H%M%S-%f}-{safe}-{elapsed_ms:.0f}ms.folded"
+        body = "".join(f"{stack} {count}\n" for stack, count in recording.samples.most_common())
+        # 미들웨어는 이벤트 루프에서 부르므로 디스크 쓰기는 루프 밖에서
+        with self._idle:
+            try:
+                self._writes.put_nowait((path, body))
+            except queue.Full:
+                log.warning("slow request profile dropped (write queue full): %s", path.name)
+                return None
+            self._pending += 1
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_loop, name="slow-request-profile-writer", daemon=True)
+                self._writer.start()
+        return path
+
+    def _write(self, path: Path, body: str) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(body)
+
+    def _write_loop(self) -> None:
+        while True:
+            path, body = self._writes.get()
+            try:
+                self._write(path, body)
+            except OSError:
+                log.exception("failed to write slow request profile %s", path)
+            finally:
+                with self._idle:
+                    self._pending -= 1
+                    self._idle.notify_all()
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """큐에 넣은 파일을 다 쓸 때까지 기다린다 (테스트, 종료 시). 시간 안에 끝나면 True"""
+        with self._idle:
+            return self._idle.wait_for(lambda: not self._pending, timeout)
+
+    def _run(self) -> None:
+        me = threading.get_ident()
+        while True:
+            with self._lock:
+                active = tuple(self._active)
+            if not active:
+                self._wake.wait()
+                self._wake.clear()
+                continue
+            stacks = [s for tid, f in sys._current_frames().items() if tid != me and (s := _fold(f))]
+            for recording in active:
+                recording.samples.update(stacks)
+            time.sleep(self.interval)
+
+profiler = SlowRequestProfiler(settings.profile_slow_ms, settings.profile_interval_ms, settings.profile_dir)
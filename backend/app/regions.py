@@ -0,0 +1,124 @@
+"""
+지역 계층 인덱스
+
+Region 테이블을 시작 시 메모리 트리로 올려 두고, 드릴다운/권한 범위를 region_code 목록으로 풀어
+쿼리는 IN/equality 조회만 하도록 한다. Region이 바뀌면 다음 접근 때 다시 읽는다.
+"""
+from __future__ import annotations
+from itertools import chain
+from typing import Iterable
+
+from starlette.concurrency import run_in_threadpool
+from sqlmodel import Session, select
+
+from .cache import LazyValue
+from .db import read_engine
+from .models import Center, Region, RegionStat
+from .versioning import on_data_change
+
+LEVELS = ("sido", "sigungu", "eupmyeondong")
+STAT_LEVELS = ("national",) + LEVELS  # RegionStat.level
+
+def infer_level(code: str) -> str:
+    """코드 길이로 레벨 추정 (2: 시도, 5: 시군구, 그 이상: 읍면동)"""
+    if len(code) <= 2:
+        return "sido"
+    if len(code) <= 5:
+        return "sigungu"
+    return "eupmyeondong"
+
+def build_region(code: str, name: str | None = None, level: str | None = None, parent_code: str | None = None) -> Region:
+    """행정코드 접두 규칙으로 parent/경로 컬럼을 채운 Region을 만든다"""
+    level = level or infer_level(code)
+    if parent_code is None and level != "sido":
+        parent_code = code[:2] if level == "sigungu" else code[:5]
+    return Region(
+        code=code,
+        name=name or code,
+        level=level,
+        parent_code=parent_code,
+        sido_code=code[:2],
+        sigungu_code=None if level == "sido" else (code if level == "sigungu" else parent_code),
+    )
+
+class RegionTree:
+    def __init__(self, regions: Iterable[tuple[str, str, str | None]]):
+        self.level: dict[str, str] = {}
+        self.parent: dict[str, str | None] = {}
+        children: dict[str, list[str]] = {}
+        for code, level, parent_code in regions:
+            self.level[code] = level
+            self.parent[code] = parent_code
+            if parent_code:
+                children.setdefault(parent_code, []).append(code)
+        self.children = {k: tuple(sorted(v)) for k, v in children.items()}
+
+        # (조상 코드, 레벨) -> 하위 코드 목록. 자기 자신도 포함
+        subtree: dict[tuple[str, str], list[str]] = {}
+        for code in self.level:
+            node: str | None = code
+            while node is not None:
+                subtree.setdefault((node, self.level[code]), []).append(code)
+                node = self.parent.get(node)
+        self._subtree = {k: tuple(sorted(v)) for k, v in subtree.items()}
+
+    def __contains__(self, code: str) -> bool:
+        return code in self.level
+
+    def descendants(self, code: str, level: str | None = None) -> tuple[str, ...]:
+        """code 자신을 포함한 하위 지역 코드. level을 주면 해당 레벨만"""
+        if level is not None:
+            return self._subtree.get((code, level), ())
+        return tuple(chain.from_iterable(self._subtree.get((code, lv), ()) for lv in LEVELS))
+
+    def is_within(self, code: str, ancestor: str) -> bool:
+        node: str | None = code
+        while node is not None:
+            if node == ancestor:
+                return True
+            node = self.parent.get(node)
+        return False
+
+def load_tree(session: Session) -> RegionTree:
+    rows = session.exec(select(Region.code, Region.level, Region.parent_code)).all()
+    return RegionTree(rows)
+
+def _read_tree() -> RegionTree:
+    with Session(read_engine) as session:
+        return load_tree(session)
+
+_tree: LazyValue[RegionTree] = LazyValue(_read_tree)
+
+def get_tree() -> RegionTree:
+    return _tree.get()
+
+async def aget_tree() -> RegionTree:
+    """비동기 라우트용: 트리가 없을 때만 스레드풀에서 다시 읽는다"""
+    tree = _tree.value
+    return tree if tree is not None else await run_in_threadpool(get_tree)
+
+@on_data_change
+def invalidate_tree() -> None:
+    _tree.invalidate()
+
+def sync_regions(session: Session) -> int:
+    """RegionStat/Center에는 있지만 Region에 없는 코드를 접두 규칙으로 등록한다"""
+    known = set(session.exec(select(Region.code)).all())
+    missing: dict[str, str] = {}
+    for level, code in session.exec(select(RegionStat.level, RegionStat.region_code).distinct()):
+        if level in LEVELS and code not in known:
+            missing[code] = level
+    for code in session.exec(select(Center.region_code).distinct()):
+        if code not in known and code not in missing:
+            missing[code] = infer_level(code)
+
+    # 상위 코드가 빠져 있으면 함께 등록
+    for code, level in list(missing.items()):
+        region = build_region(code, level=level)
+        while region.parent_code and region.parent_code not in known and region.parent_code not in missing:
+            missing[region.parent_code] = infer_level(region.parent_code)
+            region = build_region(region.parent_code)
+
+    session.add_all(build_region(code, level=level) for code, level in missing.items())
+    session.commit()
+    return len(missing)
@@ -0,0 +1,126 @@
+"""
+좌표 -> 행정구역 코드 해석기 (point-in-polygon)
+
+레벨 지오메트리의 링을 변 배열로 미리 풀어 둔(prepared) 뒤, bbox로 후보 점을 거르고
+짝수-홀수 규칙 교차 검사를 점 묶음 단위로 벡터 연산한다.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Sequence
+
+import numpy as np
+from sqlmodel import Session, select
+
+from .geometry import LEVEL_SOURCES, load_layer
+from .models import Center
+
+# 한 번에 (변 x 점) 행렬로 계산할 최대 원소 수
+_CHUNK_CELLS = 2_000_000
+
+# Center.level -> Center.region_code가 가리키는 지역 레벨
+CENTER_REGION_LEVEL = {"metro": "sido", "district": "sigungu"}
+
+@dataclass(frozen=True)
+class _PreparedPolygon:
+    x1: np.ndarray
+    y1: np.ndarray
+    y2: np.ndarray
+    slope: np.ndarray  # dx / dy (수평 변은 0, 교차 판정에서 제외됨)
+
+    def contains(self, lng: np.ndarray, lat: np.ndarray) -> np.ndarray:
+        inside = np.zeros(len(lng), dtype=bool)
+        step = max(1, _CHUNK_CELLS // max(1, len(self.x1)))
+        for start in range(0, len(lng), step):
+            px = lng[start:start + step, None]
+            py = lat[start:start + step, None]
+            spans = (self.y1 > py) != (self.y2 > py)
+            crosses = spans & (px < self.x1 + (py - self.y1) * self.slope)
+            inside[start:start + step] = (crosses.sum(axis=1) & 1).astype(bool)
+        return inside
+
+def _prepare(polygons) -> _PreparedPolygon:
+    # 멀티폴리곤의 모든 링(구멍 포함)을 한 변 집합으로 합쳐 짝수-홀수 규칙을 적용한다
+    rings = [ring for poly in polygons for ring in poly]
+    a = np.vstack([ring[:-1] for ring in rings])
+    b = np.vstack([ring[1:] for ring in rings])
+    dy = b[:, 1] - a[:, 1]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        slope = np.where(dy != 0, (b[:, 0] - a[:, 0]) / dy, 0.0)
+    return _PreparedPolygon(x1=a[:, 0], y1=a[:, 1], y2=b[:, 1], slope=slope)
+
+class RegionResolver:
+    def __init__(self, level: str):
+        layer = load_layer(level)
+        self.level = level
+        self.codes = np.array([f.code for f in layer.features], dtype=object)
+        self.bboxes = layer.bboxes
+        self._polygons = [_prepare(f.polygons) for f in layer.features]
+
+    def resolve(self, lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+        """각 점이 속한 지역 코드 (없으면 None)"""
+        lats = np.asarray(lats, dtype=np.float64)
+        lngs = np.asarray(lngs, dtype=np.float64)
+        out = np.full(len(lats), None, dtype=object)
+        unresolved = np.ones(len(lats), dtype=bool)
+        for i, (min_lng, min_lat, max_lng, max_lat) in enumerate(self.bboxes):
+            cand = np.flatnonzero(
+                unresolved & (lngs >= min_lng) & (lngs <= max_lng) & (lats >= min_lat) & (lats <= max_lat)
+            )
+            if len(cand) == 0:
+                continue
+            hit = cand[self._polygons[i].contains(lngs[cand], lats[cand])]
+            out[hit] = self.codes[i]
+            unresolved[hit] = False
+        return out
+
+@lru_cache(maxsize=None)
+def get_resolver(level: str) -> RegionResolver:
+    return RegionResolver(level)
+
+def resolve_points(lats, lngs, levels: tuple[str, ...] | None = None) -> dict[str, list[str | None]]:
+    """여러 레벨을 한 번에 해석. 지오메트리가 없는 레벨은 결과에서 빠진다"""
+    result = {}
+    for level in levels or tuple(LEVEL_SOURCES):
+        resolver = get_resolver(level)
+        if len(resolver.codes):
+            result[level] = resolver.resolve(lats, lngs).tolist()
+    return result
+
+def resolve_center_regions(centers: Sequence[tuple[str, float | None, float | None]]) -> list[str | None]:
+    """(Center.level, lat, lng) 목록 -> 센터 레벨에 맞는 지역 코드 (위경도/지오메트리가 없거나 해석 못 하면 None)"""
+    out: list[str | None] = [None] * len(centers)
+    for center_level, region_level in CENTER_REGION_LEVEL.items():
+        todo = [i for i, (level, lat, lng) in enumerate(centers) if level == center_level and lat is not None and lng is not None]
+        if not todo:
+            continue
+        resolver = get_resolver(region_level)
+        if not len(resolver.codes):
+            continue
+        codes = resolver.resolve([centers[i][1] for i in todo], [centers[i][2] for i in todo])
+        for i, code in zip(todo, codes):
+            out[i] = code
+    return out
+
+def backfill_center_regions(session: Session, overwrite: bool = False) -> tuple[int, list[tuple[int, str, str]]]:
+    """위경도가 있는 센터의 region_code를 채우고, 기존 값과 다른 센터 목록을 돌려준다.
+
+    반환: (채운 건수, [(center_id, 저장된 코드, 해석된 코드)])
+    """
+    filled = 0
+    mismatched: list[tuple[int, str, str]] = []
+    centers = session.exec(
+        select(Center).where(Center.level.in_(tuple(CENTER_REGION_LEVEL)), Center.lat.is_not(None), Center.lng.is_not(None))
+    ).all()
+    codes = resolve_center_regions([(c.level, c.lat, c.lng) for c in centers])
+    for center, code in zip(centers, codes):
+        if code is None or center.region_code == code:
+            continue
+        if not center.region_code or overwrite:
+            center.region_code = code
+            session.add(center)
+            filled += 1
+        else:
+            mismatched.append((center.id, center.region_code, code))
+    session.commit()
+    return filled, mismatched
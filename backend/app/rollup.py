@@ -0,0 +1,114 @@
+"""
+지역 계층 롤업 (eupmyeondong -> sigungu -> sido -> national)
+
+하위 레벨 RegionStat을 상위 레벨로 집계해 (level, region_code, as_of) 행으로 upsert한다.
+centers_count/population은 합계, 비율/점수는 인구 가중 평균(자식 인구가 모두 0이면 단순 평균).
+월마다 레벨 하나를 bincount 한 번으로 집계하며, 자식이 있는 상위 지역은 항상 집계값으로 덮어쓴다.
+적재 후에는 건드린 시도 서브트리와 전국 행만 다시 계산한다.
+"""
+from __future__ import annotations
+from collections import defaultdict
+from datetime import datetime
+from typing import Iterable
+
+import numpy as np
+from sqlalchemy import or_, select
+
+from .db import engine
+from .ingest import upsert_stats_statement
+from .models import RegionStat
+from .regions import RegionTree, get_tree
+
+ROLLUP_LEVELS = ("eupmyeondong", "sigungu", "sido", "national")  # 아래 -> 위
+NATIONAL_CODE = "00"
+SUM_COLUMNS = ("centers_count", "population")
+MEAN_COLUMNS = ("pet_positive_rate", "risk_score_avg")
+
+def parent_code(tree: RegionTree, code: str, level: str) -> str | None:
+    if level == "sido":
+        return NATIONAL_CODE
+    if level == "national":
+        return None
+    # 트리에 없으면 행정코드 접두 규칙
+    return tree.parent.get(code) or (code[:2] if level == "sigungu" else code[:5])
+
+def aggregate(parents: np.ndarray, values: dict[str, np.ndarray]) -> tuple[np.ndarray, dict[str, np.ndarray]]:
+    """자식 행 배열 -> (상위 코드, 컬럼별 집계 배열)"""
+    keys, inv = np.unique(parents, return_inverse=True)
+    n = len(keys)
+    out = {col: np.bincount(inv, weights=values[col], minlength=n) for col in SUM_COLUMNS}
+    weights = np.where(out["population"][inv] > 0, values["population"], 1.0)
+    total = np.bincount(inv, weights=weights, minlength=n)
+    for col in MEAN_COLUMNS:
+        out[col] = np.bincount(inv, weights=values[col] * weights, minlength=n) / total
+    return keys, out
+
+def rollup_rows(rows: Iterable[dict], as_of: datetime, tree: RegionTree) -> list[dict]:
+    """한 달치 행 -> 자식이 있는 상위 지역의 집계 행 (아래 레벨부터 차례로, 집계값이 다음 레벨의 입력)"""
+    by_level: dict[str, dict[str, dict]] = {level: {} for level in ROLLUP_LEVELS}
+    for row in rows:
+        if row["level"] in by_level:
+            by_level[row["level"]][row["region_code"]] = row
+
+    out = []
+    for child_level, parent_level in zip(ROLLUP_LEVELS, ROLLUP_LEVELS[1:]):
+        children = by_level[child_level]
+        if not children:
+            continue
+        codes = list(children)
+        parents = np.array([parent_code(tree, code, child_level) for code in codes], dtype=object)
+        values = {
+            col: np.array([children[code][col] or 0 for code in codes], dtype=np.float64)
+            for col in SUM_COLUMNS + MEAN_COLUMNS
+        }
+        keys, agg = aggregate(parents, values)
+        for i, code in enumerate(keys):
+            row = {
+                "level": parent_level,
+                "region_code": code,
+                "as_of": as_of,
+                "centers_count": int(round(agg["centers_count"][i])),
+                "population": int(round(agg["population"][i])),
+                "pet_positive_rate": float(agg["pet_positive_rate"][i]),
+                "risk_score_avg": float(agg["risk_score_avg"][i]),
+            }
+            by_level[parent_level][code] = row
+            out.append(row)
+    return out
+
+def _load_month(conn, as_of: datetime, sido_codes: set[str] | None, tree: RegionTree) -> list[dict]:
+    cols = [RegionStat.level, RegionStat.region_code, *(getattr(RegionStat, c) for c in SUM_COLUMNS + MEAN_COLUMNS)]
+    q = select(*cols).where(RegionStat.as_of == as_of)
+    if sido_codes is not None:
+        # 건드린 시도 서브트리 + 전국 집계에 필요한 전체 시도 행
+        subtree = sorted({code for sido in sido_codes for code in tree.descendants(sido)} | sido_codes)
+        q = q.where(or_(RegionStat.level.in_(("sido", "national")), RegionStat.region_code.in_(subtree)))
+    return [dict(r) for r in conn.execute(q).mappings()]
+
+def rollup(months: Iterable[datetime] | None = None, sido_codes: dict[datetime, set[str]] | None = None) -> int:
+    """월별 롤업 후 집계 행을 upsert. months가 없으면 전체 월, sido_codes가 있으면 해당 서브트리만.
+
+    반환: 저장한 집계 행 수
+    """
+    tree = get_tree()
+    stmt = upsert_stats_statement()
+    written = 0
+    with engine.begin() as conn:
+        if months is None:
+            months = conn.execute(select(RegionStat.as_of).distinct().order_by(RegionStat.as_of)).scalars().all()
+        for as_of in months:
+            scope = sido_codes.get(as_of) if sido_codes is not None else None
+            rows = rollup_rows(_load_month(conn, as_of, scope, tree), as_of, tree)
+            if rows:
+                conn.execute(stmt, rows)
+                written += len(rows)
+    return written
+
+def rollup_touched(touched: Iterable[tuple[datetime, str | None]]) -> int:
+    """적재된 (as_of, 시도 코드)의 시도 서브트리만 월별로 다시 집계. 시도 코드가 None이면(전국 행) 그 달의 시도 행으로 다시 집계"""
+    sido_codes: dict[datetime, set[str]] = defaultdict(set)
+    for as_of, sido in touched:
+        codes = sido_codes[as_of]
+        if sido is not None:
+            codes.add(sido)
+    return rollup(sorted(sido_codes), sido_codes)
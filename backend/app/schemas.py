@@ -1,5 +1,6 @@
-from pydantic import BaseModel
-from typing import Optional, List
+from datetime import datetime
+from pydantic import BaseModel, Field
+from typing import Dict, Optional, List, Tuple
 
 class Token(BaseModel):
     access_token: str
@@ -14,10 +15,19 @@ class MeResponse(BaseModel):
     role: str
     region_code: Optional[str] = None
 
+class UserResponse(BaseModel):
+    # password_hash는 노출하지 않는다
+    id: int
+    username: str
+    role: str
+    region_code: Optional[str] = None
+
 class RegionStatResponse(BaseModel):
     level: str
     region_code: str
+    as_of: datetime  # 해당 월 1일
     centers_count: int
+    population: int = 0
     pet_positive_rate: float
     risk_score_avg: float
 
@@ -30,3 +40,14 @@ class CenterResponse(BaseModel):
     lat: Optional[float] = None
     lng: Optional[float] = None
     level: str
+
+class NearbyCenterResponse(CenterResponse):
+    distance_km: float
+
+class ResolveRequest(BaseModel):
+    points: List[Tuple[float, float]] = Field(..., max_length=50000, description="[lat, lng] 목록")
+    levels: Optional[List[str]] = None
+
+class ResolveResponse(BaseModel):
+    # level -> points와 같은 순서의 region_code (해당 없음은 null)
+    results: Dict[str, List[Optional[str]]]
@@ -1,9 +1,23 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 from passlib.context import CryptContext
 from jose import jwt
+from starlette.concurrency import run_in_threadpool
 from .config import settings
 
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+def _build_context() -> CryptContext:
+    schemes = [s.strip() for s in settings.password_schemes if s.strip()]
+    options = {}
+    if settings.password_rounds:
+        # 기본/최소/최대 rounds를 같게 두면 rounds가 다른 기존 해시는 needs_update로 잡힌다
+        for option in ("default_rounds", "min_rounds", "max_rounds"):
+            options[f"{schemes[0]}__{option}"] = settings.password_rounds
+    return CryptContext(schemes=schemes, deprecated="auto", **options)
+
+pwd_context = _build_context()
 
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
@@ -11,6 +25,34 @@ def hash_password(password: str) -> str:
 def verify_password(password: str, password_hash: str) -> bool:
     return pwd_context.verify(password, password_hash)
 
+def verify_and_update(password: str, password_hash: str) -> tuple[bool, str | None]:
+    """검증 결과와, 스킴/rounds가 바뀌었으면 새 해시 (아니면 None)"""
+    return pwd_context.verify_and_update(password, password_hash)
+
+# ---------- 로그인 검증용 프로세스 풀 (해시 계산이 API 스레드와 GIL을 다투지 않도록) ----------
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(settings.password_workers, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+async def averify_and_update(password: str, password_hash: str) -> tuple[bool, str | None]:
+    if settings.password_workers <= 0:
+        return await run_in_threadpool(verify_and_update, password, password_hash)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_pool(), verify_and_update, password, password_hash)
+
+def shutdown_password_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(cancel_futures=True)
+            _pool = None
+
 def create_access_token(subject: str, role: str, region_code: str | None) -> str:
     expire = datetime.utcnow() + timedelta(minutes=settings.access_token_minutes)
     to_encode = {"sub": subject, "role": role, "region_code": region_code, "exp": expire}
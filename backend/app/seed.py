@@ -1,7 +1,11 @@
+from datetime import datetime
 from sqlmodel import Session
-from .db import engine, init_db
-from .models import User, Center, RegionStat
+from .db import analyze, engine, init_db
+from .models import User, Center, Region, RegionStat
+from .regions import build_region
+from .rollup import rollup
 from .security import hash_password
+from .versioning import bump_data_version
 from sqlalchemy import delete
 
 def run():
@@ -11,6 +15,7 @@ def run():
         session.exec(delete(RegionStat))
         session.exec(delete(Center))
         session.exec(delete(User))
+        session.exec(delete(Region))
         session.commit()
 
         users = [
@@ -21,6 +26,13 @@ def run():
         ]
         session.add_all(users)
 
+        regions = [
+            build_region("11", "서울특별시"),
+            build_region("11010", "종로구"),
+            build_region("11680", "강남구"),
+        ]
+        session.add_all(regions)
+
         centers = [
             Center(name="서울특별시 광역치매센터", region_code="11", address="서울 어딘가", phone="02-000-0000", level="metro"),
             Center(name="종로구 안심센터", region_code="11010", address="서울 종로구 어딘가", phone="02-111-1111", level="district"),
@@ -28,14 +40,30 @@ def run():
         ]
         session.add_all(centers)
 
-        stats = [
-            RegionStat(level="sido", region_code="11", centers_count=2, pet_positive_rate=0.18, risk_score_avg=42.0),
-            RegionStat(level="sigungu", region_code="11010", centers_count=1, pet_positive_rate=0.22, risk_score_avg=48.0),
-            RegionStat(level="sigungu", region_code="11680", centers_count=1, pet_positive_rate=0.15, risk_score_avg=39.0),
+        # 2023-10 ~ 2025-09 24개월 이력. 마지막 월(2025-09)이 대시보드 기본 조회 월
+        # 시군구만 넣고 시도(11)/전국(00)은 롤업으로 만든다
+        base = [
+            ("sigungu", "11010", 1, 139_000, 0.22, 48.0),
+            ("sigungu", "11680", 1, 532_000, 0.15, 39.0),
         ]
+        stats = []
+        for i in range(24):
+            months_back = 23 - i
+            year, month = divmod(2025 * 12 + 8 - months_back, 12)
+            as_of = datetime(year, month + 1, 1)
+            for level, code, centers, population, pet, risk in base:
+                stats.append(RegionStat(
+                    level=level, region_code=code, as_of=as_of, centers_count=centers, population=population,
+                    pet_positive_rate=round(pet - months_back * 0.001, 4),
+                    risk_score_avg=round(risk - months_back * 0.25 + (i % 3) * 0.5, 2),
+                ))
         session.add_all(stats)
 
         session.commit()
+    rollup()
+    analyze()
+    # 롤업은 Core 쓰기라 ORM 커밋 훅이 버전을 올리지 않는다. 실행 중인 워커들이 poll로 캐시를 비우도록
+    bump_data_version()
     print("Seeded demo.db with demo users/centers/stats")
 
 if __name__ == "__main__":
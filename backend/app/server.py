@@ -0,0 +1,54 @@
+"""
+운영 서버 (python -m app serve)
+
+gunicorn 마스터에서 앱을 import하고 캐시를 데운 뒤 UvicornWorker N개를 fork한다.
+워커들은 마스터가 만든 트리/지오메트리/KPI 스냅샷을 copy-on-write로 공유하고,
+이후 변경은 dataversion poll로 각자 무효화한다. gunicorn이 없으면(Windows 등) uvicorn 멀티 워커로
+실행하며, 이때는 워커마다 따로 캐시를 데운다.
+"""
+from __future__ import annotations
+import gc
+
+from .config import settings
+from .db import sync_engines
+
+def _post_fork(server, worker) -> None:
+    # 마스터의 커넥션을 워커가 함께 쓰지 않도록 풀만 새로 시작 (소켓은 닫지 않음)
+    for engine in sync_engines():
+        engine.dispose(close=False)
+
+def run(host: str = "0.0.0.0", port: int = 8000, workers: int | None = None, timeout: int = 60) -> None:
+    workers = workers or settings.web_concurrency
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        import uvicorn
+        print("gunicorn이 없어 uvicorn 멀티 워커로 실행합니다 (fork 전 캐시 공유 없음)")
+        uvicorn.run("app.main:app", host=host, port=port, workers=workers)
+        return
+
+    from .main import app, warm_caches
+
+    warm_caches()
+    for engine in sync_engines():
+        engine.dispose()
+    # 데운 객체를 GC 추적에서 빼 두어 워커의 GC가 공유 페이지를 건드리지 않게 한다
+    gc.freeze()
+
+    class Server(BaseApplication):
+        def load_config(self):
+            options = {
+                "bind": f"{host}:{port}",
+                "workers": workers,
+                "worker_class": "uvicorn.workers.UvicornWorker",
+                "preload_app": True,
+                "timeout": timeout,
+                "post_fork": _post_fork,
+            }
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return app
+
+    Server().run()
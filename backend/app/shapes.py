@@ -0,0 +1,190 @@
+"""
+드릴다운용 상위 지역별 경계 조각 (/geo/shapes/{level}?parent_code=)
+
+frontend/scripts/prepare-geo-data.py가 만든 geo/normalized/{level}/{parent_code}.geojson 조각을
+읽기 전용 mmap으로 열어 두고, 응답은 [머리(KPI 포함), mmap 조각, 꼬리]를 차례로 보낸다.
+조각 파일을 다시 읽거나 파싱하지 않으며, 같은 파일의 페이지는 워커들이 OS 페이지 캐시로 공유한다.
+파이프라인을 다시 돌리면(manifest.json 변경) 다음 요청에서 조각을 다시 연다.
+응답의 Link: rel=prefetch에는 다음 드릴다운 후보(KPI 순위가 높은 하위 지역)의 조각 URL을 싣는다.
+"""
+from __future__ import annotations
+import hashlib
+import json
+import mmap
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from urllib.parse import urlencode
+
+from fastapi import Response
+from starlette.types import Receive, Scope, Send
+
+from .config import settings
+from .geometry import LEVEL_SOURCES
+from .kpi import KpiSnapshot, snapshot_records
+from .metrics import timed_serialization
+from .regions import RegionTree
+from .versioning import data_version
+
+# 드릴다운 순서: 레벨 -> 다음 레벨
+NEXT_LEVEL = {"sido": "sigungu", "sigungu": "eupmyeondong"}
+
+@dataclass(frozen=True)
+class Shard:
+    path: Path
+    data: mmap.mmap
+    stamp: str  # 파일 크기/수정 시각 (ETag용)
+
+    @property
+    def view(self) -> memoryview:
+        return memoryview(self.data)
+
+def _level_file(level: str) -> Path:
+    # 레벨 전체 파일은 geometry.LEVEL_SOURCES의 첫 후보 (geo/normalized/{sido,sigungu,eupmyeon}.geojson)
+    return Path(settings.geo_data_dir) / LEVEL_SOURCES[level][0]
+
+def _manifest_stamp() -> str | None:
+    # prepare-geo-data.py는 레벨을 다시 만들 때마다 manifest.json을 새로 쓴다
+    try:
+        stat = os.stat(Path(settings.geo_data_dir) / "geo" / "normalized" / "manifest.json")
+    except FileNotFoundError:
+        return None
+    return f"{stat.st_size}-{stat.st_mtime_ns}"
+
+class ShardStore:
+    """(level, parent_code) -> mmap 조각. parent_code가 None이면 레벨 전체 파일.
+
+    조각이 있는 parent_code만 캐시하므로 항목 수는 조각 파일 수를 넘지 않는다.
+    접근할 때마다 manifest.json을 stat해서 파이프라인이 다시 돌았으면 목록과 mmap을 새로 연다.
+    """
+
+    def __init__(self):
+        self._shards: dict[tuple[str, str | None], Shard] = {}
+        self._parents: dict[str, frozenset[str]] = {}
+        self._manifest: str | None = None
+        self._lock = threading.Lock()
+
+    def _refresh(self) -> None:
+        stamp = _manifest_stamp()
+        if stamp != self._manifest:
+            with self._lock:
+                if stamp != self._manifest:
+                    self._clear()
+                    self._manifest = stamp
+
+    def parents(self, level: str) -> frozenset[str]:
+        """조각이 있는 상위 지역 코드 (manifest가 바뀌기 전까지 디렉터리를 한 번만 읽는다)"""
+        self._refresh()
+        parents = self._parents.get(level)
+        if parents is None:
+            directory = _level_file(level).parent / level
+            names = os.listdir(directory) if directory.is_dir() else ()
+            parents = frozenset(n.removesuffix(".geojson") for n in names if n.endswith(".geojson"))
+            self._parents[level] = parents
+        return parents
+
+    def get(self, level: str, parent_code: str | None) -> Shard | None:
+        # parent_code는 인증 없는 쿼리 값이므로 조각 목록에 있을 때만 캐시를 건드린다 (없는 조각은 캐시하지 않음)
+        if level not in LEVEL_SOURCES:
+            return None
+        if parent_code is not None and parent_code not in self.parents(level):
+            return None
+        self._refresh()
+        key = (level, parent_code)
+        shard = self._shards.get(key)
+        if shard is None:
+            with self._lock:
+                shard = self._shards.get(key)
+                if shard is None:
+                    shard = self._open(level, parent_code)
+                    if shard is not None:
+                        self._shards[key] = shard
+        return shard
+
+    def _open(self, level: str, parent_code: str | None) -> Shard | None:
+        if parent_code is None:
+            path = _level_file(level)
+        else:
+            path = _level_file(level).parent / level / f"{parent_code}.geojson"
+        try:
+            with open(path, "rb") as f:
+                stat = os.fstat(f.fileno())
+                if stat.st_size == 0:
+                    return None
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            return None
+        return Shard(path=path, data=data, stamp=f"{stat.st_size}-{stat.st_mtime_ns}")
+
+    def _clear(self) -> None:
+        # 보내는 중인 memoryview가 있을 수 있어 mmap은 닫지 않고 참조만 버린다
+        self._shards.clear()
+        self._parents.clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._clear()
+            self._manifest = None
+
+shard_store = ShardStore()
+
+class ChunkedResponse(Response):
+    """미리 준비된 바이트 조각을 복사하지 않고 이어 보낸다 (Content-Length는 합계)"""
+
+    media_type = "application/json"
+
+    def __init__(self, chunks: list[bytes | memoryview], status_code: int = 200, headers: dict | None = None):
+        self.chunks = chunks
+        super().__init__(status_code=status_code, headers=headers)
+        self.headers["content-length"] = str(sum(len(c) for c in chunks))
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        last = len(self.chunks) - 1
+        for i, chunk in enumerate(self.chunks):
+            await send({"type": "http.response.body", "body": chunk, "more_body": i < last})
+        if self.background is not None:
+            await self.background()
+
+def shapes_etag(level: str, parent_code: str | None, metric: str, time: str, shard: Shard) -> str:
+    key = f"{data_version()}|{level}|{parent_code or ''}|{metric}|{time}|{shard.stamp}"
+    return f'W/"{hashlib.blake2b(key.encode(), digest_size=12).hexdigest()}"'
+
+def scope_indices(snapshot: KpiSnapshot, tree: RegionTree, level: str, parent_code: str | None) -> list[int]:
+    """parent_code 하위 지역의 스냅샷 인덱스 (KPI 순위 순)"""
+    if parent_code is None:
+        return [int(i) for i in snapshot.order]
+    wanted = set(tree.descendants(parent_code, level))
+    return [int(i) for i in snapshot.order if snapshot.region_codes[i] in wanted]
+
+def prefetch_links(
+    snapshot: KpiSnapshot, indices: list[int], level: str, metric: str, time: str, limit: int,
+) -> list[str]:
+    """KPI 순위가 높은 하위 지역부터, 다음 레벨 조각이 있는 것만 limit개"""
+    next_level = NEXT_LEVEL.get(level)
+    if next_level is None or limit <= 0:
+        return []
+    available = shard_store.parents(next_level)
+    links = []
+    for i in indices:
+        code = snapshot.region_codes[i]
+        if code in available:
+            query = urlencode({"parent_code": code, "metric": metric, "time": time})
+            links.append(f"</geo/shapes/{next_level}?{query}>; rel=prefetch")
+            if len(links) >= limit:
+                break
+    return links
+
+def shapes_response(
+    snapshot: KpiSnapshot, indices: list[int], shard: Shard, parent_code: str | None, headers: dict,
+) -> ChunkedResponse:
+    """{"level", "parent_code", "metric", "time", "kpi": [...], "shapes": <FeatureCollection>}"""
+    with timed_serialization():
+        head = json.dumps(
+            {"level": snapshot.level, "parent_code": parent_code, "metric": snapshot.metric, "time": snapshot.time},
+            ensure_ascii=False, separators=(",", ":"),
+        )
+        kpi = json.dumps(snapshot_records(snapshot, indices), ensure_ascii=False, separators=(",", ":"))
+    prefix = f'{head[:-1]},"kpi":{kpi},"shapes":'.encode("utf-8")
+    return ChunkedResponse([prefix, shard.view, b"}"], headers=headers)
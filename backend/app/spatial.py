@@ -0,0 +1,133 @@
+"""
+센터 공간 인덱스
+
+위경도 격자 버킷 인덱스를 메모리에 두고 bbox(뷰포트) 조회와 k-최근접 조회를 처리한다.
+Center가 변경되면 다음 접근 때 다시 만든다.
+"""
+from __future__ import annotations
+import math
+
+import numpy as np
+from starlette.concurrency import run_in_threadpool
+from sqlmodel import Session, select
+
+from .cache import LazyValue
+from .config import settings
+from .db import read_engine
+from .models import Center
+from .schemas import CenterResponse
+from .versioning import on_data_change
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEG = math.pi * EARTH_RADIUS_KM / 180.0
+
+def haversine_km(lat: float, lng: float, lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+    p1, p2 = math.radians(lat), np.radians(lats)
+    dlat = p2 - p1
+    dlng = np.radians(lngs - lng)
+    a = np.sin(dlat / 2) ** 2 + math.cos(p1) * np.cos(p2) * np.sin(dlng / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+class CenterIndex:
+    def __init__(self, centers: list[CenterResponse], cell_deg: float):
+        centers = sorted((c for c in centers if c.lat is not None and c.lng is not None), key=lambda c: c.id)
+        self.cell_deg = cell_deg
+        self.centers = tuple(centers)
+        self.ids = np.array([c.id for c in centers], dtype=np.int64)
+        self.lats = np.array([c.lat for c in centers], dtype=np.float64)
+        self.lngs = np.array([c.lng for c in centers], dtype=np.float64)
+        self.region_codes = np.array([c.region_code for c in centers], dtype=object)
+
+        # 격자 셀 -> 인덱스 배열 (id 오름차순 유지). 셀 키도 배열로 두어 셀 선택을 벡터 연산으로 한다
+        self._cell_rows = np.empty(0, dtype=np.int64)
+        self._cell_cols = np.empty(0, dtype=np.int64)
+        self._cell_members: list[np.ndarray] = []
+        if centers:
+            rows = np.floor(self.lats / cell_deg).astype(np.int64)
+            cols = np.floor(self.lngs / cell_deg).astype(np.int64)
+            order = np.lexsort((np.arange(len(centers)), cols, rows))
+            keys = np.column_stack([rows[order], cols[order]])
+            bounds = np.flatnonzero(np.any(np.diff(keys, axis=0) != 0, axis=1)) + 1
+            self._cell_members = [np.sort(chunk) for chunk in np.split(order, bounds)]
+            self._cell_rows = keys[np.r_[0, bounds], 0]
+            self._cell_cols = keys[np.r_[0, bounds], 1]
+
+    def __len__(self) -> int:
+        return len(self.centers)
+
+    def _cell(self, lat: float, lng: float) -> tuple[int, int]:
+        return math.floor(lat / self.cell_deg), math.floor(lng / self.cell_deg)
+
+    def _members(self, cells: np.ndarray) -> np.ndarray:
+        if len(cells) == 0:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate([self._cell_members[i] for i in cells])
+
+    def _scope_mask(self, idx: np.ndarray, scope: tuple[str, ...] | None) -> np.ndarray:
+        if scope is None:
+            return idx
+        return idx[np.isin(self.region_codes[idx], scope)]
+
+    def bbox(
+        self,
+        min_lat: float, min_lng: float, max_lat: float, max_lng: float,
+        scope: tuple[str, ...] | None = None,
+        after_id: int | None = None,
+        limit: int = 200,
+    ) -> tuple[list[CenterResponse], int | None]:
+        """bbox 안의 센터를 id 순으로 limit개. 다음 페이지 커서(마지막 id)도 함께 반환"""
+        r0, c0 = self._cell(min_lat, min_lng)
+        r1, c1 = self._cell(max_lat, max_lng)
+        cells = np.flatnonzero(
+            (self._cell_rows >= r0) & (self._cell_rows <= r1) & (self._cell_cols >= c0) & (self._cell_cols <= c1)
+        )
+        idx = np.sort(self._members(cells))
+        lat, lng = self.lats[idx], self.lngs[idx]
+        idx = idx[(lat >= min_lat) & (lat <= max_lat) & (lng >= min_lng) & (lng <= max_lng)]
+        if after_id is not None:
+            idx = idx[self.ids[idx] > after_id]
+        idx = self._scope_mask(idx, scope)
+        page = idx[:limit]
+        next_cursor = int(self.ids[page[-1]]) if len(idx) > limit else None
+        return [self.centers[i] for i in page], next_cursor
+
+    def nearest(
+        self, lat: float, lng: float, k: int, scope: tuple[str, ...] | None = None,
+    ) -> list[tuple[CenterResponse, float]]:
+        """격자 셀을 질의 셀과의 거리(고리 반경) 순으로 넓혀 가며 k-최근접 센터를 찾는다"""
+        row, col = self._cell(lat, lng)
+        ring_of_cell = np.maximum(np.abs(self._cell_rows - row), np.abs(self._cell_cols - col))
+        best_idx = np.empty(0, dtype=np.int64)
+        best_dist = np.empty(0)
+        for radius in np.unique(ring_of_cell):
+            # 이번 고리 밖의 점은 적어도 radius 셀만큼 떨어져 있다 (경도 방향은 위도에 따라 좁아짐)
+            lat_edge = min(abs(lat) + (radius + 1) * self.cell_deg, 89.9)
+            outside_km = (radius - 1) * self.cell_deg * KM_PER_DEG * math.cos(math.radians(lat_edge))
+            if len(best_idx) >= k and best_dist[-1] <= outside_km:
+                break
+            ring = self._scope_mask(self._members(np.flatnonzero(ring_of_cell == radius)), scope)
+            if len(ring) == 0:
+                continue
+            cand = np.concatenate([best_idx, ring])
+            dist = haversine_km(lat, lng, self.lats[cand], self.lngs[cand])
+            order = np.argsort(dist, kind="stable")[:k]
+            best_idx, best_dist = cand[order], dist[order]
+        return [(self.centers[i], float(d)) for i, d in zip(best_idx, best_dist)]
+
+def _build_index() -> CenterIndex:
+    with Session(read_engine) as session:
+        rows = session.exec(select(Center).where(Center.lat.is_not(None), Center.lng.is_not(None))).all()
+        return CenterIndex([CenterResponse(**r.model_dump()) for r in rows], settings.center_grid_deg)
+
+_index: LazyValue[CenterIndex] = LazyValue(_build_index)
+
+def get_center_index() -> CenterIndex:
+    return _index.get()
+
+async def aget_center_index() -> CenterIndex:
+    index = _index.value
+    return index if index is not None else await run_in_threadpool(get_center_index)
+
+@on_data_change
+def invalidate_center_index() -> None:
+    _index.invalidate()
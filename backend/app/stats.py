@@ -0,0 +1,86 @@
+"""
+레벨 단위 KPI 통계 (NumPy 벡터 연산)
+
+행 = 기간(월), 열 = 지역인 패널 행렬을 한 번에 처리한다. 값이 없는 칸은 NaN.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+
+import numpy as np
+
+# percentile 기준 상태 구간: [0, 70) normal, [70, 85) warning, [85, 100] alert
+STATUS_THRESHOLDS = (70.0, 85.0)
+STATUS_LABELS = np.array(["normal", "warning", "alert"], dtype=object)
+
+@dataclass(frozen=True)
+class PanelStats:
+    percentile: np.ndarray   # 0~100, 같은 기간 내 유효 값 대비 백분위 (동점은 평균 순위)
+    rank: np.ndarray         # 1 = 최댓값, 동점은 같은 순위 (competition ranking)
+    change_rate: np.ndarray  # 직전 기간 대비 증감률(%), 첫 기간/직전 값 없음은 NaN
+    status: np.ndarray       # STATUS_LABELS 원소
+
+def _tie_counts(panel: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """각 칸에 대해 (같은 행에서 더 작은 값 수, 같은 값 수, 행의 유효 값 수)를 구한다.
+
+    (행 번호, 결측 여부, 값)으로 한 번에 lexsort한 뒤 같은 (행, 값) 묶음의 시작 위치와 크기로 센다.
+    행 구분은 정수 키라 값의 크기나 행 수와 관계없이 다른 행의 값이 섞이지 않는다. 결측은 행 끝에 모인다.
+    """
+    n_rows, n_cols = panel.shape
+    valid = ~np.isnan(panel)
+    values = panel.ravel()
+    missing = ~valid.ravel()
+    rows = np.repeat(np.arange(n_rows), n_cols)
+    order = np.lexsort((values, missing, rows))
+    v, m, r = values[order], missing[order], rows[order]
+
+    starts_group = np.ones(order.size, dtype=bool)
+    starts_group[1:] = (r[1:] != r[:-1]) | (m[1:] != m[:-1]) | (v[1:] != v[:-1])
+    group_start = np.flatnonzero(starts_group)
+    group_size = np.diff(np.append(group_start, order.size))
+    group = np.cumsum(starts_group) - 1
+
+    less = np.empty(order.size, dtype=np.int64)
+    equal = np.empty(order.size, dtype=np.int64)
+    less[order] = group_start[group] - r * n_cols
+    equal[order] = group_size[group]
+    n_valid = valid.sum(axis=1, keepdims=True)
+    return less.reshape(panel.shape), equal.reshape(panel.shape), n_valid
+
+def panel_stats(panel: np.ndarray) -> PanelStats:
+    panel = np.asarray(panel, dtype=np.float64)
+    if panel.ndim != 2:
+        raise ValueError("panel must be 2-D (periods x regions)")
+    valid = ~np.isnan(panel)
+
+    if panel.size:
+        less, equal, n_valid = _tie_counts(panel)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            percentile = (less + 0.5 * equal) / n_valid * 100.0
+        rank = (n_valid - (less + equal) + 1).astype(np.float64)
+    else:
+        percentile = np.empty(panel.shape)
+        rank = np.empty(panel.shape)
+    percentile = np.where(valid, percentile, np.nan)
+    rank = np.where(valid, rank, np.nan)
+
+    change_rate = np.full(panel.shape, np.nan)
+    if panel.shape[0] > 1:
+        prev, cur = panel[:-1], panel[1:]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            change_rate[1:] = np.where(prev != 0, (cur - prev) / np.abs(prev) * 100.0, np.nan)
+
+    status = STATUS_LABELS[np.digitize(np.nan_to_num(percentile), STATUS_THRESHOLDS)]
+    return PanelStats(percentile=percentile, rank=rank, change_rate=change_rate, status=status)
+
+def downsample(values: np.ndarray, max_points: int) -> tuple[np.ndarray, np.ndarray]:
+    """연속 구간 평균으로 max_points개 이하로 줄인다. (각 구간 시작 인덱스, 구간 평균)을 반환"""
+    values = np.asarray(values, dtype=np.float64)
+    n = values.size
+    if n <= max_points:
+        return np.arange(n), values
+    starts = (np.arange(max_points) * n) // max_points
+    sums = np.add.reduceat(np.nan_to_num(values), starts)
+    counts = np.add.reduceat((~np.isnan(values)).astype(np.int64), starts)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = np.where(counts > 0, sums / counts, np.nan)
+    return starts, means
@@ -0,0 +1,203 @@
+"""
+KPI 변경 푸시 (SSE, /geo/stream)
+
+구독은 (level, metrics, time, 권한 범위)가 같은 것끼리 한 그룹으로 묶는다. 연결하면 그룹의 현재 상태를
+snapshot 이벤트로 받고, 이후 데이터 버전이 바뀔 때마다(versioning.on_data_change) 그룹별로 KPI 스냅샷을
+한 번 다시 읽어 직전 상태와 비교한 뒤 바뀐 지역만 delta 이벤트 하나로 직렬화해 모든 구독자 큐에 넣는다.
+데이터가 그대로인 동안에는 DB 조회나 직렬화 없이 연결마다 keep-alive 주석만 나간다.
+"""
+from __future__ import annotations
+import asyncio
+import json
+import logging
+from dataclasses import dataclass, field
+
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import StreamingResponse
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.types import Receive, Scope, Send
+
+from .compression import is_precompressed
+from .db import async_engine
+from .deps import Principal
+from .kpi import kpi_cache, snapshot_records
+from .regions import RegionTree, aget_tree
+from .versioning import data_version, on_data_change
+
+MEDIA_TYPE = "text/event-stream"
+STREAM_PATH = "/geo/stream"
+QUEUE_SIZE = 16          # 이만큼 밀린 구독자는 끊는다 (EventSource가 재접속해 snapshot부터 다시 받는다)
+KEEPALIVE_SECONDS = 15
+DEBOUNCE_SECONDS = 0.2   # 적재 중 연이은 커밋을 한 번의 갱신으로 묶는다
+RETRY_MS = 3000
+COMPARED_FIELDS = ("value", "change_rate", "percentile", "status")
+
+log = logging.getLogger(__name__)
+
+def _event(name: str, event_id: str, data: dict, retry: int | None = None) -> bytes:
+    payload = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    head = f"retry: {retry}\n" if retry is not None else ""
+    return f"{head}id: {event_id}\nevent: {name}\ndata: {payload}\n\n".encode("utf-8")
+
+def _changed(old: dict | None, new: dict) -> bool:
+    return old is None or any(old[f] != new[f] for f in COMPARED_FIELDS)
+
+def scope_of(user: Principal | None) -> tuple[str | None, str | None]:
+    """/geo/stats와 같은 범위: district는 자기 지역, metro는 하위 지역, 그 외(익명 포함)는 전체"""
+    if user is not None and user.role in ("district", "metro") and user.region_code:
+        return user.role, user.region_code
+    return None, None
+
+@dataclass(eq=False)
+class _Group:
+    key: tuple
+    level: str
+    metrics: tuple[str, ...]
+    time: str
+    role: str | None
+    region_code: str | None
+    version: str = ""
+    state: dict[str, dict[str, dict]] = field(default_factory=dict)  # metric -> region_code -> 레코드
+    snapshot_event: bytes | None = None
+    subscribers: set[asyncio.Queue] = field(default_factory=set)
+
+    def allowed(self, tree: RegionTree) -> set[str] | None:
+        if self.role == "district":
+            return {self.region_code}
+        if self.role == "metro":
+            return set(tree.descendants(self.region_code, self.level))
+        return None
+
+    def data(self, metrics: dict) -> dict:
+        return {"level": self.level, "time": self.time, "version": self.version, "metrics": metrics}
+
+class KpiBroadcaster:
+    def __init__(self):
+        self._groups: dict[tuple, _Group] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._changed: asyncio.Event | None = None
+        self._lock: asyncio.Lock | None = None
+
+    @property
+    def subscribers(self) -> int:
+        return sum(len(g.subscribers) for g in self._groups.values())
+
+    async def run(self) -> None:
+        """lifespan 동안 실행: 데이터가 바뀔 때마다 그룹별 변경분을 내보낸다"""
+        self._loop = asyncio.get_running_loop()
+        self._changed = asyncio.Event()
+        self._lock = asyncio.Lock()
+        try:
+            while True:
+                await self._changed.wait()
+                await asyncio.sleep(DEBOUNCE_SECONDS)
+                self._changed.clear()
+                try:
+                    async with self._lock:
+                        await self._publish()
+                except Exception:
+                    log.exception("kpi stream publish failed")
+        finally:
+            self._loop = None
+
+    def wake(self) -> None:
+        # on_data_change 리스너: 커밋한 스레드(스레드풀 등)에서 불릴 수 있다
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self._changed.set)
+
+    async def subscribe(
+        self, level: str, metrics: tuple[str, ...], time: str, user: Principal | None, last_event_id: str | None,
+    ) -> tuple[_Group, asyncio.Queue]:
+        if self._lock is None:
+            raise RuntimeError("KpiBroadcaster.run() is not running")
+        role, region_code = scope_of(user)
+        key = (level, metrics, time, role, region_code)
+        async with self._lock:
+            group = self._groups.get(key)
+            if group is None:
+                group = _Group(key, level, metrics, time, role, region_code)
+                group.version = data_version()
+                group.state = await self._load(group)
+                self._groups[key] = group
+            queue: asyncio.Queue = asyncio.Queue(QUEUE_SIZE)
+            # 재접속한 클라이언트가 이미 현재 상태라면 snapshot을 생략
+            if last_event_id != group.version:
+                if group.snapshot_event is None:
+                    records = {m: list(rows.values()) for m, rows in group.state.items()}
+                    group.snapshot_event = _event("snapshot", group.version, group.data(records), retry=RETRY_MS)
+                queue.put_nowait(group.snapshot_event)
+            group.subscribers.add(queue)
+        return group, queue
+
+    def unsubscribe(self, group: _Group, queue: asyncio.Queue) -> None:
+        group.subscribers.discard(queue)
+        if not group.subscribers and self._groups.get(group.key) is group:
+            del self._groups[group.key]
+
+    async def _load(self, group: _Group) -> dict[str, dict[str, dict]]:
+        """그룹 범위의 metric별 KPI 레코드. 스냅샷은 kpi_cache에서 (level, metric, time)당 한 번만 만든다"""
+        allowed = group.allowed(await aget_tree())
+        state = {}
+        async with AsyncSession(async_engine) as session:
+            for metric in group.metrics:
+                snapshot = await kpi_cache.aget(session, group.level, metric, group.time)
+                indices = [i for i, c in enumerate(snapshot.region_codes) if allowed is None or c in allowed]
+                state[metric] = {r["region_code"]: r for r in snapshot_records(snapshot, indices)}
+        return state
+
+    async def _publish(self) -> None:
+        version = data_version()
+        for group in list(self._groups.values()):
+            state = await self._load(group)
+            changes = {}
+            for metric, rows in state.items():
+                old = group.state.get(metric, {})
+                upsert = [r for code, r in rows.items() if _changed(old.get(code), r)]
+                removed = [code for code in old if code not in rows]
+                if upsert or removed:
+                    changes[metric] = {"upsert": upsert, "removed": removed}
+            group.version, group.state, group.snapshot_event = version, state, None
+            if not changes:
+                continue
+            message = _event("delta", version, group.data(changes))
+            for queue in list(group.subscribers):
+                try:
+                    queue.put_nowait(message)
+                except asyncio.QueueFull:
+                    # 못 따라오는 구독자: 큐를 비우고 종료 신호만 남긴다
+                    while not queue.empty():
+                        queue.get_nowait()
+                    queue.put_nowait(None)
+                    group.subscribers.discard(queue)
+
+broadcaster = KpiBroadcaster()
+on_data_change(broadcaster.wake)
+
+def stream_response(group: _Group, queue: asyncio.Queue) -> StreamingResponse:
+    async def events():
+        try:
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield b": keep-alive\n\n"
+                    continue
+                if message is None:
+                    return
+                yield message
+        finally:
+            broadcaster.unsubscribe(group, queue)
+
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return StreamingResponse(events(), media_type=MEDIA_TYPE, headers=headers)
+
+class StreamingGZipMiddleware(GZipMiddleware):
+    """SSE는 압축 버퍼에 이벤트가 묶이지 않도록 그대로 보낸다 (Starlette 0.46+ 기본 동작과 같음).
+    사전 압축 본문을 쓰는 경로(타일, KPI 스냅샷)도 건너뛴다"""
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and (scope["path"] == STREAM_PATH or is_precompressed(scope["path"])):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
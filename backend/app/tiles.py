@@ -0,0 +1,235 @@
+"""
+벡터 타일(Mapbox Vector Tile) 생성
+
+레벨 지오메트리의 점별 단순화 값을 한 번 구해 줌마다 마스크로 잘라 두고, 타일 요청 시 bbox로 후보를 고른 뒤
+타일 좌표(4096 격자)로 양자화/클리핑해 MVT로 인코딩한다. 결과는 ETag와
+gzip(가능하면 brotli) 사전 압축 본문과 함께 LRU 캐시에 보관한다.
+"""
+from __future__ import annotations
+import hashlib
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+from .cache import LRUCache
+from .compression import brotli, choose_encoding, compress
+from .config import settings
+from .geometry import lonlat_to_world, load_layer, rings_importance
+
+EXTENT = 4096
+BUFFER = 64          # 타일 경계 바깥 여유 (타일 좌표 단위)
+MAX_ZOOM = 14
+SIMPLIFY_PIXELS = 1.0  # 단순화 허용 오차 (타일 좌표 단위)
+MEDIA_TYPE = "application/vnd.mapbox-vector-tile"
+
+@dataclass(frozen=True)
+class TileBody:
+    raw: bytes
+    gzip: bytes
+    br: bytes | None
+    etag: str
+
+# ---------- 줌별 단순화 (레벨 당 한 번 + 줌 당 마스크) ----------
+@dataclass(frozen=True)
+class _LevelRings:
+    rings: tuple[tuple[tuple[np.ndarray, ...], ...], ...]       # feature -> polygon -> ring (world 좌표)
+    importance: tuple[tuple[tuple[np.ndarray, ...], ...], ...]  # 같은 모양, 점별 Douglas-Peucker 값
+    bboxes: np.ndarray                                          # (n, 4) world 좌표 min_x, min_y, max_x, max_y
+
+@dataclass(frozen=True)
+class _ZoomLayer:
+    polygons: tuple[tuple[tuple[np.ndarray, ...], ...], ...]  # feature -> polygon -> ring (world 좌표)
+    bboxes: np.ndarray
+
+@lru_cache(maxsize=None)
+def _level_rings(level: str) -> _LevelRings:
+    layer = load_layer(level)
+    world = [[[lonlat_to_world(r) for r in poly] for poly in feature.polygons] for feature in layer.features]
+    flat = rings_importance([r for polys in world for poly in polys for r in poly])
+    it = iter(flat)
+    importance = tuple(tuple(tuple(next(it) for _ in poly) for poly in polys) for polys in world)
+    bboxes = np.empty((len(layer.features), 4))
+    for i, feature in enumerate(layer.features):
+        (min_lon, min_lat, max_lon, max_lat) = feature.bbox
+        lo, hi = lonlat_to_world(np.array([[min_lon, max_lat], [max_lon, min_lat]]))
+        bboxes[i] = (lo[0], lo[1], hi[0], hi[1])
+    rings = tuple(tuple(tuple(poly) for poly in polys) for polys in world)
+    return _LevelRings(rings=rings, importance=importance, bboxes=bboxes)
+
+@lru_cache(maxsize=64)
+def _zoom_layer(level: str, z: int) -> _ZoomLayer:
+    base = _level_rings(level)
+    tolerance = SIMPLIFY_PIXELS / (EXTENT * (1 << z))
+    polygons = []
+    for feature_rings, feature_importance in zip(base.rings, base.importance):
+        simplified = []
+        for rings, importance in zip(feature_rings, feature_importance):
+            kept = [r[i > tolerance] for r, i in zip(rings, importance)]
+            if len(kept[0]) < 4:
+                continue  # 이 줌에서 1픽셀 미만인 섬
+            simplified.append((kept[0], *(h for h in kept[1:] if len(h) >= 4)))
+        polygons.append(tuple(simplified))
+    return _ZoomLayer(polygons=tuple(polygons), bboxes=base.bboxes)
+
+def warm_zoom_layers(level: str, max_zoom: int = MAX_ZOOM) -> None:
+    """0..max_zoom 줌의 단순화 지오메트리를 미리 만든다 (serve는 fork 전에 호출)"""
+    for z in range(min(max_zoom, MAX_ZOOM) + 1):
+        _zoom_layer(level, z)
+
+# ---------- 클리핑 ----------
+def _clip_ring(ring: np.ndarray, lo: float, hi: float) -> np.ndarray:
+    """Sutherland-Hodgman으로 링을 [lo, hi] 정사각형에 자른다 (닫힘 점 없이 반환)"""
+    pts = ring[:-1] if len(ring) > 1 and np.array_equal(ring[0], ring[-1]) else ring
+    for axis, bound, keep_greater in ((0, lo, True), (0, hi, False), (1, lo, True), (1, hi, False)):
+        if len(pts) == 0:
+            break
+        inside = pts[:, axis] >= bound if keep_greater else pts[:, axis] <= bound
+        if inside.all():
+            continue
+        out = []
+        prev, prev_in = pts[-1], inside[-1]
+        for cur, cur_in in zip(pts, inside):
+            if cur_in != prev_in:
+                t = (bound - prev[axis]) / (cur[axis] - prev[axis])
+                out.append(prev + t * (cur - prev))
+            if cur_in:
+                out.append(cur)
+            prev, prev_in = cur, cur_in
+        pts = np.array(out).reshape(-1, 2)
+    return pts
+
+def _ring_area2(pts: np.ndarray) -> int:
+    """부호 있는 면적 x2 (타일 좌표, y 아래 방향 기준 시계 방향이 양수)"""
+    x, y = pts[:, 0], pts[:, 1]
+    return int(np.dot(x, np.roll(y, -1)) - np.dot(np.roll(x, -1), y))
+
+def _quantize(pts: np.ndarray) -> np.ndarray:
+    q = np.rint(pts).astype(np.int64)
+    if len(q) > 1:
+        q = q[np.any(q != np.roll(q, 1, axis=0), axis=1) | (np.arange(len(q)) == 0)]
+    return q
+
+# ---------- protobuf 인코딩 ----------
+def _varint(n: int) -> bytes:
+    out = bytearray()
+    while True:
+        b = n & 0x7F
+        n >>= 7
+        if n:
+            out.append(b | 0x80)
+        else:
+            out.append(b)
+            return bytes(out)
+
+def _field(number: int, wire_type: int) -> bytes:
+    return _varint((number << 3) | wire_type)
+
+def _bytes_field(number: int, payload: bytes) -> bytes:
+    return _field(number, 2) + _varint(len(payload)) + payload
+
+def _packed(number: int, values) -> bytes:
+    return _bytes_field(number, b"".join(_varint(int(v)) for v in values))
+
+def _command(cmd: int, count: int) -> int:
+    return (cmd & 0x7) | (count << 3)
+
+def _encode_polygon_rings(rings: list[np.ndarray]) -> list[int]:
+    """MoveTo / LineTo / ClosePath 명령열. 좌표는 직전 커서 기준 zigzag 델타"""
+    out: list[int] = []
+    cursor = np.zeros(2, dtype=np.int64)
+    for ring in rings:
+        deltas = np.diff(np.vstack([cursor, ring]), axis=0)
+        zz = np.where(deltas >= 0, deltas << 1, ((-deltas) << 1) - 1).ravel().tolist()
+        out.append(_command(1, 1))
+        out.extend(zz[:2])
+        out.append(_command(2, len(ring) - 1))
+        out.extend(zz[2:])
+        out.append(_command(7, 1))
+        cursor = ring[-1]
+    return out
+
+def render_tile(level: str, z: int, x: int, y: int) -> bytes:
+    layer = load_layer(level)
+    zoom = _zoom_layer(level, z)
+    scale = 1 << z
+    pad = BUFFER / EXTENT / scale
+    x0, y0, x1, y1 = x / scale, y / scale, (x + 1) / scale, (y + 1) / scale
+    b = zoom.bboxes
+    hits = np.nonzero((b[:, 0] <= x1 + pad) & (b[:, 2] >= x0 - pad) & (b[:, 1] <= y1 + pad) & (b[:, 3] >= y0 - pad))[0]
+
+    keys = ["region_code", "region_name", "parent_code"]
+    values: dict[str, int] = {}
+    features = []
+    for idx in hits:
+        rings_out: list[np.ndarray] = []
+        for poly in zoom.polygons[idx]:
+            for ring_no, ring in enumerate(poly):
+                local = (ring * scale - (x, y)) * EXTENT
+                pts = _quantize(_clip_ring(local, -BUFFER, EXTENT + BUFFER))
+                if len(pts) < 3:
+                    if ring_no == 0:
+                        break  # 외곽 링이 사라지면 구멍도 버린다
+                    continue
+                area = _ring_area2(pts)
+                if area == 0:
+                    if ring_no == 0:
+                        break
+                    continue
+                # 외곽 링은 양수, 구멍은 음수 면적
+                if (ring_no == 0) != (area > 0):
+                    pts = pts[::-1]
+                rings_out.append(pts)
+        if not rings_out:
+            continue
+
+        feature = layer.features[idx]
+        tags = []
+        for key_index, value in enumerate((feature.code, feature.name, feature.parent_code)):
+            if value is None:
+                continue
+            tags += [key_index, values.setdefault(value, len(values))]
+        features.append(
+            _field(1, 0) + _varint(int(idx) + 1)
+            + _packed(2, tags)
+            + _field(3, 0) + _varint(3)  # POLYGON
+            + _packed(4, _encode_polygon_rings(rings_out))
+        )
+
+    if not features:
+        return b""
+    layer_msg = (
+        _field(15, 0) + _varint(2)
+        + _bytes_field(1, level.encode())
+        + b"".join(_bytes_field(2, f) for f in features)
+        + b"".join(_bytes_field(3, k.encode()) for k in keys)
+        + b"".join(_bytes_field(4, _bytes_field(1, v.encode())) for v in values)
+        + _field(5, 0) + _varint(EXTENT)
+    )
+    return _bytes_field(3, layer_msg)
+
+# ---------- 캐시 ----------
+_tile_cache = LRUCache(settings.tile_cache_size, name="tile")
+
+def get_tile(level: str, z: int, x: int, y: int) -> TileBody:
+    key = (level, z, x, y)
+    tile = _tile_cache.get(key)
+    if tile is None:
+        raw = render_tile(level, z, x, y)
+        tile = TileBody(
+            raw=raw,
+            gzip=compress(raw, "gzip"),
+            br=compress(raw, "br") if brotli is not None else None,
+            etag='"%s"' % hashlib.sha1(raw).hexdigest(),
+        )
+        _tile_cache.set(key, tile)
+    return tile
+
+def encoded_body(tile: TileBody, accept_encoding: str) -> tuple[bytes, str | None]:
+    """Accept-Encoding에 맞는 사전 압축 본문과 Content-Encoding 값"""
+    encoding = choose_encoding(accept_encoding)
+    if encoding == "br":
+        return tile.br, "br"
+    if encoding == "gzip":
+        return tile.gzip, "gzip"
+    return tile.raw, None
@@ -0,0 +1,53 @@
+"""
+RegionStat 월별 이력 조회
+
+(level, region_code, as_of) 커버링 인덱스(ix_regionstat_trend) 범위 스캔 한 번으로 한 지역의 시계열을 읽는다.
+"""
+from __future__ import annotations
+import numpy as np
+from sqlmodel import Session, select
+
+from .kpi import METRIC_COLUMNS, metric_value, month_range
+from .models import RegionStat
+from .stats import downsample
+
+def load_trend(
+    session: Session,
+    level: str,
+    metric: str,
+    region_code: str,
+    start: str | None = None,
+    end: str | None = None,
+    months: int = 24,
+    max_points: int | None = None,
+) -> list[dict]:
+    column_name = METRIC_COLUMNS[metric]
+    column = getattr(RegionStat, column_name)
+
+    q = select(RegionStat.as_of, column).where(
+        RegionStat.level == level, RegionStat.region_code == region_code
+    )
+    if start:
+        q = q.where(RegionStat.as_of >= month_range(start)[0])
+    if end:
+        q = q.where(RegionStat.as_of < month_range(end)[1])
+    # 최근 월부터 역순으로 읽어 months개에서 멈춘다 (같은 월에 여러 건이면 최근 값)
+    q = q.order_by(RegionStat.as_of.desc())
+
+    series: dict[str, float] = {}
+    for as_of, raw in session.exec(q):
+        key = f"{as_of.year:04d}-{as_of.month:02d}"
+        if key not in series:
+            if len(series) >= months:
+                break
+            series[key] = metric_value(column_name, raw)
+
+    times = list(reversed(series))
+    values = np.fromiter(reversed(series.values()), dtype=np.float64, count=len(times))
+    if max_points:
+        starts, values = downsample(values, max_points)
+        times = [times[i] for i in starts]
+    return [
+        {"time": t, "value": None if np.isnan(v) else round(float(v), 4)}
+        for t, v in zip(times, values)
+    ]
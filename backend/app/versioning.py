@@ -0,0 +1,130 @@
+"""
+데이터 버전 카운터 (프로세스/워커 간 캐시 무효화)
+
+RegionStat / Center / Region 변경이 커밋될 때마다 DB의 dataversion 행(id=1)을 올린다.
+각 워커는 주기적으로 이 값을 읽어 바뀌었으면 등록된 무효화 함수(트리, KPI 스냅샷, 센터 인덱스)를
+실행하므로, 다른 워커나 CLI(ingest/rollup)에서 쓴 데이터도 poll 간격 안에 반영된다.
+"{epoch}.{version}" 문자열은 HTTP ETag의 기준이 된다 (epoch는 행을 처음 만들 때 정해져 DB가 바뀌면 달라짐).
+ORM 세션 이벤트 리스너는 이 모듈에만 둔다. 캐시는 on_data_change로, 버전과 무관한 모델(User)의
+행 단위 무효화는 on_commit으로 등록한다.
+"""
+from __future__ import annotations
+import asyncio
+import logging
+import threading
+import uuid
+from itertools import chain
+from typing import Any, Callable, Hashable
+
+from sqlalchemy import event, insert, select, update
+from sqlalchemy.orm import Session as OrmSession
+
+from .db import async_engine, engine, read_engine
+from .models import Center, DataVersion, Region, RegionStat
+
+VERSIONED_MODELS = (RegionStat, Center, Region)
+
+log = logging.getLogger(__name__)
+
+_table = DataVersion.__table__
+_version = ""
+_lock = threading.Lock()
+_listeners: list[Callable[[], None]] = []
+# 모델 -> (바뀐 객체 -> 키, 커밋 후 실행할 함수)
+_commit_watchers: dict[type, tuple[Callable[[Any], Hashable], Callable[[set | None], None]]] = {}
+
+def on_data_change(fn: Callable[[], None]) -> Callable[[], None]:
+    """데이터가 바뀌었을 때(이 프로세스의 커밋 또는 다른 프로세스의 변경을 poll로 감지) 실행할 함수 등록"""
+    _listeners.append(fn)
+    return fn
+
+def on_commit(model: type, key: Callable[[Any], Hashable], fn: Callable[[set | None], None]) -> None:
+    """model 변경이 커밋된 뒤 fn(바뀐 객체들의 key 집합)을 실행. 벌크 DML이면 어떤 행인지 모르므로 fn(None)"""
+    _commit_watchers[model] = (key, fn)
+
+def data_version() -> str:
+    return _version
+
+def _set_version(value: str, notify: bool) -> None:
+    global _version
+    with _lock:
+        changed = value != _version
+        _version = value
+    if changed and notify:
+        for fn in _listeners:
+            fn()
+
+def _select_version():
+    return select(_table.c.epoch, _table.c.version).where(_table.c.id == 1)
+
+def _format(row) -> str:
+    return f"{row.epoch}.{row.version}" if row is not None else ""
+
+def refresh_data_version(notify: bool = False) -> str:
+    with read_engine.connect() as conn:
+        _set_version(_format(conn.execute(_select_version()).first()), notify)
+    return _version
+
+def bump_data_version() -> str:
+    """DB 버전을 올리고 이 프로세스의 값도 맞춘 뒤 등록된 함수를 실행한다 (커밋 이후, 호출한 스레드에서)"""
+    with engine.begin() as conn:
+        result = conn.execute(update(_table).where(_table.c.id == 1).values(version=_table.c.version + 1))
+        if result.rowcount == 0:
+            conn.execute(insert(_table).values(id=1, epoch=uuid.uuid4().hex[:8], version=1))
+        value = _format(conn.execute(_select_version()).first())
+    _set_version(value, notify=True)
+    return _version
+
+async def poll_data_version(interval: float) -> None:
+    """워커마다 lifespan 동안 실행. 버전이 바뀌면 등록된 무효화 함수를 실행"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with async_engine.connect() as conn:
+                row = (await conn.execute(_select_version())).first()
+        except Exception:
+            log.exception("data version poll failed")
+            continue
+        _set_version(_format(row), notify=True)
+
+# ---------- ORM 변경 추적: 버전 대상 모델은 커밋 후 버전 증가, 감시 모델은 on_commit 함수 실행 ----------
+@event.listens_for(OrmSession, "after_flush")
+def _mark_data_dirty(session, flush_context):
+    for o in chain(session.new, session.dirty, session.deleted):
+        if isinstance(o, VERSIONED_MODELS):
+            session.info["data_dirty"] = True
+        watcher = _commit_watchers.get(type(o))
+        if watcher is not None:
+            # 커밋 후에는 속성이 만료되므로 키는 flush 시점에 읽어 둔다
+            keys = session.info.setdefault("changed_keys", {}).setdefault(type(o), set())
+            if keys is not None:
+                keys.add(watcher[0](o))
+
+@event.listens_for(OrmSession, "do_orm_execute")
+def _mark_data_bulk(orm_execute_state):
+    mapper = orm_execute_state.bind_mapper
+    if orm_execute_state.is_select or mapper is None:
+        return
+    session = orm_execute_state.session
+    if mapper.class_ in VERSIONED_MODELS:
+        session.info["data_dirty"] = True
+    if mapper.class_ in _commit_watchers:
+        session.info.setdefault("changed_keys", {})[mapper.class_] = None
+
+@event.listens_for(OrmSession, "after_commit")
+def _mark_data_committed(session):
+    if session.info.pop("data_dirty", False):
+        session.info["data_committed"] = True
+    for model, keys in session.info.pop("changed_keys", {}).items():
+        _commit_watchers[model][1](keys)
+
+@event.listens_for(OrmSession, "after_transaction_end")
+def _bump_after_commit(session, transaction):
+    # 세션이 쓰기 연결을 반납한 뒤에 올린다 (SQLite 쓰기 엔진은 연결이 하나)
+    if transaction.parent is None and session.info.pop("data_committed", False):
+        bump_data_version()
+
+@event.listens_for(OrmSession, "after_rollback")
+def _discard_dirty_flag(session):
+    session.info.pop("data_dirty", None)
+    session.info.pop("changed_keys", None)
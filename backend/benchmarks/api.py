@@ -0,0 +1,223 @@
+"""
+API 부하 벤치마크
+
+    cd backend
+    python -m benchmarks.api                          # 프로세스 내 (httpx ASGITransport)
+    python -m benchmarks.api --mode uvicorn           # uvicorn 서브프로세스 (실제 HTTP)
+    python -m benchmarks.api --mode both --save-baseline
+
+합성 전국 데이터셋(benchmarks.dataset)을 임시 SQLite DB에 한 번 만들어 재사용하고,
+/auth/login, /geo/stats, /geo/kpi, /centers를 동시 요청으로 호출해 p50/p95/p99 지연, RPS,
+메모리(RSS)를 benchmarks/baseline.json과 비교해 출력한다. httpx, uvicorn이 필요하다.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+BASELINE = Path(__file__).resolve().parent / "baseline.json"
+
+# name -> (사용자, method, path, query/form)
+SCENARIOS = {
+    "login": (None, "POST", "/auth/login", {"username": "national", "password": "password123"}),
+    "geo_stats": ("national", "GET", "/geo/stats", {"level": "sigungu"}),
+    "geo_kpi": (None, "GET", "/geo/kpi", {"level": "eupmyeondong", "metric": "risk_score"}),
+    "centers": ("metro01", "GET", "/centers", {}),
+}
+
+def _percentile(values: list[float], q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] if values else 0.0
+
+def _rss_mb(pid: int) -> dict[str, float]:
+    """현재/최대 RSS (Linux /proc 기준, 없으면 빈 dict)"""
+    try:
+        status = Path(f"/proc/{pid}/status").read_text()
+    except OSError:
+        return {}
+    out = {}
+    for line in status.splitlines():
+        key, _, value = line.partition(":")
+        if key in ("VmRSS", "VmHWM"):
+            out["rss_mb" if key == "VmRSS" else "peak_rss_mb"] = round(int(value.split()[0]) / 1024, 1)
+    return out
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+# ---------- 데이터셋 ----------
+def prepare_dataset(args) -> dict:
+    db_path = Path(args.db or Path(tempfile.gettempdir()) / "geomap-bench" / f"bench-m{args.months}-c{args.centers}-s{args.seed}.db")
+    summary_path = db_path.with_suffix(".json")
+    os.environ["DB_URL"] = f"sqlite:///{db_path}"
+    if db_path.exists() and summary_path.exists() and not args.rebuild:
+        return json.loads(summary_path.read_text())
+
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    from .dataset import build
+    summary = build(months=args.months, centers=args.centers, seed=args.seed)
+    summary_path.write_text(json.dumps(summary, ensure_ascii=False, indent=2))
+    return summary
+
+# ---------- 부하 ----------
+async def _run_scenario(client, name: str, tokens: dict[str, str], requests: int, concurrency: int, last_month: str) -> dict:
+    user, method, path, params = SCENARIOS[name]
+    headers = {"Authorization": f"Bearer {tokens[user]}"} if user else {}
+    if name == "geo_kpi":
+        params = {**params, "time": last_month}
+    kwargs = {"data": params} if method == "POST" else {"params": params}
+
+    latencies: list[float] = []
+    errors = 0
+    slots = asyncio.Semaphore(concurrency)
+
+    async def one():
+        nonlocal errors
+        async with slots:
+            t = time.perf_counter()
+            r = await client.request(method, path, headers=headers, **kwargs)
+            latencies.append((time.perf_counter() - t) * 1000)
+            errors += r.status_code != 200
+
+    await asyncio.gather(*(one() for _ in range(min(requests, 20))))  # 워밍업 (캐시/풀 기동)
+    latencies.clear()
+    errors = 0
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - started
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "p50_ms": round(_percentile(latencies, 0.50), 2),
+        "p95_ms": round(_percentile(latencies, 0.95), 2),
+        "p99_ms": round(_percentile(latencies, 0.99), 2),
+        "rps": round(requests / elapsed, 1),
+        "errors": errors,
+    }
+
+async def _drive(client, args, last_month: str) -> dict:
+    tokens = {}
+    for user in {u for u, *_ in SCENARIOS.values() if u}:
+        r = await client.post("/auth/login", data={"username": user, "password": "password123"})
+        r.raise_for_status()
+        tokens[user] = r.json()["access_token"]
+    results = {}
+    for name in args.scenarios:
+        requests = args.login_requests if name == "login" else args.requests
+        results[name] = await _run_scenario(client, name, tokens, requests, args.concurrency, last_month)
+    return results
+
+async def run_asgi(args, last_month: str) -> tuple[dict, dict]:
+    import httpx
+    from app.main import app
+    from app.security import shutdown_password_pool
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+            results = await _drive(client, args, last_month)
+    shutdown_password_pool()
+    return results, _rss_mb(os.getpid())
+
+async def run_uvicorn(args, last_month: str) -> tuple[dict, dict]:
+    import httpx
+
+    port = _free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=os.environ.copy(),
+    )
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=60) as client:
+            deadline = time.monotonic() + 60
+            while True:
+                try:
+                    if (await client.get("/health")).status_code == 200:
+                        break
+                except httpx.TransportError:
+                    pass
+                if time.monotonic() > deadline or server.poll() is not None:
+                    raise SystemExit("uvicorn 서버가 시작되지 않았습니다")
+                await asyncio.sleep(0.2)
+            results = await _drive(client, args, last_month)
+        return results, _rss_mb(server.pid)
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+# ---------- 출력 / 기준값 ----------
+def _delta(current: float, base: float | None) -> str:
+    if not base:
+        return "-"
+    return f"{(current - base) / base * 100:+.0f}%"
+
+def report(mode: str, results: dict, memory: dict, baseline: dict) -> None:
+    base = baseline.get("results", {}).get(mode, {})
+    print(f"\n[{mode}] memory: {memory or 'n/a'}  (baseline: {base.get('_memory', 'n/a')})")
+    print(f"{'scenario':<10} {'n':>6} {'p50':>8} {'p95':>8} {'p99':>8} {'rps':>8} {'err':>4} {'Δp95':>6} {'Δrps':>6}")
+    for name, r in results.items():
+        b = base.get(name, {})
+        print(
+            f"{name:<10} {r['requests']:>6} {r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} {r['p99_ms']:>8.1f} "
+            f"{r['rps']:>8.1f} {r['errors']:>4} {_delta(r['p95_ms'], b.get('p95_ms')):>6} {_delta(r['rps'], b.get('rps')):>6}"
+        )
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.api")
+    parser.add_argument("--mode", choices=("asgi", "uvicorn", "both"), default="asgi")
+    parser.add_argument("--scenarios", nargs="+", choices=tuple(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=500, help="시나리오당 요청 수")
+    parser.add_argument("--login-requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--months", type=int, default=36)
+    parser.add_argument("--centers", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--db", help="데이터셋 SQLite 경로 (기본: 임시 디렉터리에 파라미터별로 캐시)")
+    parser.add_argument("--rebuild", action="store_true", help="데이터셋 다시 생성")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    parser.add_argument("--save-baseline", action="store_true", help=f"결과를 {BASELINE.name}에 기준값으로 저장")
+    args = parser.parse_args()
+
+    dataset = prepare_dataset(args)
+    print(f"dataset: {dataset}")
+    baseline = json.loads(BASELINE.read_text()) if BASELINE.exists() else {}
+
+    modes = ("asgi", "uvicorn") if args.mode == "both" else (args.mode,)
+    output = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "requests": args.requests,
+            "login_requests": args.login_requests,
+            "concurrency": args.concurrency,
+            "dataset": dataset,
+        },
+        "results": {},
+    }
+    for mode in modes:
+        runner = run_asgi if mode == "asgi" else run_uvicorn
+        results, memory = asyncio.run(runner(args, dataset["last_month"]))
+        report(mode, results, memory, baseline)
+        output["results"][mode] = {**results, "_memory": memory}
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(output, ensure_ascii=False, indent=2))
+    if args.save_baseline:
+        merged = {"meta": output["meta"], "results": {**baseline.get("results", {}), **output["results"]}}
+        BASELINE.write_text(json.dumps(merged, ensure_ascii=False, indent=2) + "\n")
+        print(f"\nbaseline saved: {BASELINE}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+벤치마크용 합성 전국 데이터셋
+
+frontend/scripts/prepare-geo-data.py의 지역 코드 생성기로 시도/시군구(~250)/읍면동(~3,500)을 만들고,
+읍면동 월별 통계(months개월)와 센터 centers개를 적재한 뒤 상위 레벨은 롤업으로 채운다.
+같은 seed면 같은 데이터가 나온다. 이 모듈을 import하기 전에 DB_URL을 정해 두어야 한다.
+"""
+from __future__ import annotations
+import importlib.util
+import random
+import time
+from datetime import datetime
+from pathlib import Path
+
+from sqlalchemy import delete
+from sqlmodel import Session
+
+from app.db import engine, init_db
+from app.ingest import ingest_centers, ingest_stats
+from app.models import Center, Region, RegionStat, User
+from app.regions import build_region
+from app.security import hash_password
+
+GENERATOR = Path(__file__).resolve().parents[2] / "frontend" / "scripts" / "prepare-geo-data.py"
+PASSWORD = "password123"
+# (username, role, region_code)
+USERS = [
+    ("national", "national", None),
+    ("metro01", "metro", "11"),
+    ("dist01", "district", "11010"),
+    ("citizen1", "citizen", None),
+]
+
+def load_generator():
+    spec = importlib.util.spec_from_file_location("prepare_geo_data", GENERATOR)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def _months(count: int, last: str = "2025-09") -> list[datetime]:
+    year, month = (int(p) for p in last.split("-"))
+    end = year * 12 + month - 1
+    return [datetime(m // 12, m % 12 + 1, 1) for m in range(end - count + 1, end + 1)]
+
+def _stat_records(rng: random.Random, eup_codes: list[str], months: list[datetime]):
+    for code in eup_codes:
+        population = rng.randint(2_000, 60_000)
+        pet, risk = rng.uniform(0.08, 0.3), rng.uniform(30, 80)
+        for as_of in months:
+            pet = min(0.6, max(0.01, pet + rng.gauss(0, 0.005)))
+            risk = min(99.0, max(1.0, risk + rng.gauss(0, 0.8)))
+            yield {
+                "level": "eupmyeondong", "region_code": code, "as_of": as_of,
+                "centers_count": rng.randint(0, 3), "population": population,
+                "pet_positive_rate": round(pet, 4), "risk_score_avg": round(risk, 2),
+            }
+
+def _center_records(rng: random.Random, sigungu: list[tuple[str, str]], centroids: dict, count: int):
+    for i in range(count):
+        code, name = sigungu[i % len(sigungu)]
+        lng, lat = centroids.get(code[:2], [127.0, 37.0])
+        yield {
+            "name": f"{name} 센터 {i + 1}", "region_code": code, "address": name, "phone": None,
+            "lat": lat + rng.uniform(-0.4, 0.4), "lng": lng + rng.uniform(-0.4, 0.4), "level": "district",
+        }
+
+def build(months: int = 36, centers: int = 5000, seed: int = 0) -> dict:
+    """DB를 비우고 합성 데이터를 적재. 반환: 건수/소요 시간 요약"""
+    started = time.perf_counter()
+    rng = random.Random(seed)
+    generator = load_generator()
+    regions = generator.synthetic_national_regions(rng)
+    init_db()
+
+    with Session(engine) as session:
+        for model in (RegionStat, Center, User, Region):
+            session.exec(delete(model))
+        session.add_all(User(username=u, password_hash=hash_password(PASSWORD), role=r, region_code=c) for u, r, c in USERS)
+        session.add_all(build_region(code, name, level, parent) for code, name, level, parent in regions)
+        session.commit()
+
+    eup_codes = [code for code, _, level, _ in regions if level == "eupmyeondong"]
+    sigungu = [(code, name) for code, name, level, _ in regions if level == "sigungu"]
+    month_list = _months(months)
+    stats = ingest_stats(_stat_records(rng, eup_codes, month_list), batch_size=10_000)
+    center_report = ingest_centers(_center_records(rng, sigungu, generator.SIDO_CENTROIDS, centers), batch_size=10_000)
+    return {
+        "regions": len(regions),
+        "eupmyeondong": len(eup_codes),
+        "sigungu": len(sigungu),
+        "months": months,
+        "stat_rows": stats.rows,
+        "centers": center_report.rows,
+        "last_month": f"{month_list[-1].year:04d}-{month_list[-1].month:02d}",
+        "seconds": round(time.perf_counter() - started, 2),
+    }
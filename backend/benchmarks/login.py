@@ -0,0 +1,101 @@
+"""
+로그인 처리량 벤치마크
+
+    cd backend
+    python -m benchmarks.login --logins 400 --concurrency 64 --workers 4 --rounds 29000
+
+1) 해시 검증만 한 코어에서 반복해 초당 검증 수를 재고,
+2) 임시 SQLite DB로 앱을 띄워(httpx ASGITransport, 프로세스 내) 동시 로그인을 보내면서
+   /health 지연을 함께 재어 로그인 폭주 중에도 다른 요청이 막히지 않는지 본다.
+httpx가 필요하다 (pip install httpx).
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+def _percentile(values: list[float], q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] if values else 0.0
+
+def bench_verify(seconds: float) -> float:
+    from app.security import hash_password, verify_password
+    h = hash_password("password123")
+    n, started = 0, time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        verify_password("password123", h)
+        n += 1
+    return n / (time.perf_counter() - started)
+
+async def bench_logins(logins: int, concurrency: int) -> dict:
+    import httpx
+    from app.main import app
+    from app.security import shutdown_password_pool
+
+    transport = httpx.ASGITransport(app=app)
+    slots = asyncio.Semaphore(concurrency)
+    login_ms: list[float] = []
+    health_ms: list[float] = []
+    done = asyncio.Event()
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def login():
+            async with slots:
+                t = time.perf_counter()
+                r = await client.post("/auth/login", data={"username": "national", "password": "password123"})
+                r.raise_for_status()
+                login_ms.append((time.perf_counter() - t) * 1000)
+
+        async def probe():
+            while not done.is_set():
+                t = time.perf_counter()
+                await client.get("/health")
+                health_ms.append((time.perf_counter() - t) * 1000)
+                await asyncio.sleep(0.01)
+
+        await login()  # 풀 워커 기동 비용은 측정에서 뺀다
+        login_ms.clear()
+        prober = asyncio.create_task(probe())
+        started = time.perf_counter()
+        await asyncio.gather(*(login() for _ in range(logins)))
+        elapsed = time.perf_counter() - started
+        done.set()
+        await prober
+    shutdown_password_pool()
+    return {
+        "logins_per_sec": logins / elapsed,
+        "login_p50_ms": statistics.median(login_ms),
+        "login_p95_ms": _percentile(login_ms, 0.95),
+        "health_p95_ms": _percentile(health_ms, 0.95),
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.login")
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=min(4, os.cpu_count() or 1), help="PASSWORD_WORKERS (0: 스레드)")
+    parser.add_argument("--rounds", type=int, default=0, help="PASSWORD_ROUNDS (0: 스킴 기본값)")
+    args = parser.parse_args()
+
+    # app 모듈을 읽기 전에 설정을 정한다 (풀 워커 프로세스도 이 환경을 물려받음)
+    tmp = tempfile.mkdtemp(prefix="login-bench-")
+    os.environ["DB_URL"] = f"sqlite:///{tmp}/bench.db"
+    os.environ["PASSWORD_WORKERS"] = str(args.workers)
+    os.environ["PASSWORD_ROUNDS"] = str(args.rounds)
+
+    from app.seed import run as seed
+    seed()
+
+    per_core = bench_verify(2.0)
+    print(f"verify only:  {per_core:,.1f} verifies/s (1 core)")
+    result = asyncio.run(bench_logins(args.logins, args.concurrency))
+    cores = max(1, args.workers)
+    print(f"/auth/login:  {result['logins_per_sec']:,.1f} logins/s with {args.workers} workers "
+          f"({result['logins_per_sec'] / cores:,.1f} logins/s per core)")
+    print(f"  login p50 {result['login_p50_ms']:.1f} ms, p95 {result['login_p95_ms']:.1f} ms; "
+          f"/health p95 during storm {result['health_p95_ms']:.1f} ms")
+
+if __name__ == "__main__":
+    main()
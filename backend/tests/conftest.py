@@ -0,0 +1,63 @@
+"""
+테스트 공통: 임시 SQLite DB(시드 데이터)와 앱 클라이언트
+
+app 모듈은 import 시점에 설정(DB_URL 등)을 읽으므로 app을 import하기 전에 환경 변수를 정한다.
+"""
+import os
+import tempfile
+from pathlib import Path
+
+_tmp = Path(tempfile.mkdtemp(prefix="geomap-test-"))
+os.environ["DB_URL"] = f"sqlite:///{_tmp / 'test.db'}"
+os.environ["PASSWORD_WORKERS"] = "0"
+os.environ["PROFILE_SLOW_MS"] = "0"
+os.environ["PROFILE_DIR"] = str(_tmp / "profiles")
+os.environ["TILE_WARM_MAX_ZOOM"] = "-1"
+
+import pytest
+from fastapi.testclient import TestClient
+
+def reseed() -> None:
+    """시드 데이터로 되돌린다 (seed.run이 데이터 버전을 올려 캐시도 비워진다)"""
+    from app.seed import run
+    run()
+
+@pytest.fixture(scope="session")
+def seeded():
+    """시드 데이터가 들어 있는 테스트 DB"""
+    reseed()
+
+@pytest.fixture(scope="session")
+def client(seeded):
+    from app.main import app
+    with TestClient(app) as c:
+        yield c
+
+@pytest.fixture
+def restore_seed(seeded):
+    """데이터를 바꾸는 테스트용: 끝나면 시드 상태로 되돌린다"""
+    yield
+    reseed()
+
+@pytest.fixture(scope="session")
+def token(client):
+    def login(username: str = "national") -> dict:
+        r = client.post("/auth/login", data={"username": username, "password": "password123"})
+        assert r.status_code == 200, r.text
+        return {"Authorization": f"Bearer {r.json()['access_token']}"}
+    return login
+
+@pytest.fixture
+def fallback_geo(tmp_path, monkeypatch):
+    """정규화 레이어 없이 저장소의 korea.json만 있는 GEO_DATA_DIR (깨끗한 체크아웃과 같은 상태)"""
+    from app import geometry, gazetteer, resolver
+    from app.config import settings
+    (tmp_path / "korea.json").symlink_to(Path(settings.geo_data_dir) / "korea.json")
+    monkeypatch.setattr(settings, "geo_data_dir", str(tmp_path))
+    caches = (geometry.load_layer, resolver.get_resolver, gazetteer.get_gazetteer)
+    for cache in caches:
+        cache.cache_clear()
+    yield tmp_path
+    monkeypatch.undo()
+    for cache in caches:
+        cache.cache_clear()
@@ -0,0 +1,75 @@
+import asyncio
+
+from sqlalchemy import update
+from sqlmodel import Session, select
+
+from app import deps, versioning
+from app.db import engine
+from app.models import User
+
+def _role(client, headers) -> str:
+    return client.get("/auth/me", headers=headers).json()["role"]
+
+def test_user_change_invalidates_cached_principal(client, token, restore_seed):
+    headers = token("citizen1")
+    assert _role(client, headers) == "citizen"
+    with Session(engine) as session:
+        user = session.exec(select(User).where(User.username == "citizen1")).one()
+        user.role = "national"
+        session.add(user)
+        session.commit()
+    assert _role(client, headers) == "national"
+
+def test_change_records_are_pruned_after_ttl(monkeypatch):
+    monkeypatch.setattr(deps._principal_cache, "ttl", 10.0)
+    monkeypatch.setattr(deps, "_user_changed_at", deps.OrderedDict())
+    deps._mark_changed("a", 100.0)
+    deps._mark_changed("b", 105.0)
+    deps._mark_changed("c", 112.0)
+    # "a"는 TTL(10초)보다 오래된 기록이라 지워진다
+    assert list(deps._user_changed_at) == ["b", "c"]
+    deps._mark_changed("b", 130.0)
+    assert list(deps._user_changed_at) == ["b"]
+
+def test_entry_resolved_before_change_is_stale(client, token):
+    raw = token("dist01")["Authorization"].split()[1]
+    principal = asyncio.run(deps.resolve_principal(raw))
+    resolved_at, cached = deps._principal_cache.get(raw)
+    assert cached == principal and deps._is_current(resolved_at, "dist01")
+    assert not deps._is_current(resolved_at - deps._principal_cache.ttl, "dist01")
+
+def test_commit_hook_reports_changed_users(seeded, monkeypatch):
+    seen = []
+    monkeypatch.setitem(versioning._commit_watchers, User, (lambda user: user.username, seen.append))
+    with Session(engine) as session:
+        user = session.exec(select(User).where(User.username == "metro01")).one()
+        user.region_code = "11"
+        session.add(user)
+        session.flush()
+        session.rollback()  # 롤백한 변경은 알리지 않는다
+        user = session.exec(select(User).where(User.username == "metro01")).one()
+        user.region_code = "11"
+        session.add(user)
+        session.commit()
+        session.exec(update(User).where(User.username == "nobody").values(role="citizen"))
+        session.commit()
+    assert seen == [{"metro01"}, None]
+
+def test_login_rehash_invalidates_only_that_user(client, token, monkeypatch, restore_seed):
+    from app import main
+    from app.security import pwd_context
+    raw = token("metro01")["Authorization"].split()[1]
+    asyncio.run(deps.resolve_principal(raw))
+    new_hash = pwd_context.hash("password123")
+
+    async def rehash(password, password_hash):
+        return True, new_hash
+
+    monkeypatch.setattr(main, "averify_and_update", rehash)
+    token("citizen1")
+    with Session(engine) as session:
+        assert session.exec(select(User.password_hash).where(User.username == "citizen1")).one() == new_hash
+    # 다시 저장한 사용자만 무효화되고 다른 사용자의 캐시 항목은 남는다
+    assert "citizen1" in deps._user_changed_at
+    resolved_at, _ = deps._principal_cache.get(raw)
+    assert deps._is_current(resolved_at, "metro01")
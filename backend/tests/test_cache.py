@@ -0,0 +1,17 @@
+from app.cache import LazyValue
+
+def test_lazy_value_loads_once():
+    calls = []
+    value = LazyValue(lambda: calls.append(1) or len(calls))
+    assert value.get() == 1 and value.get() == 1
+    value.invalidate()
+    assert value.get() == 2
+
+def test_lazy_value_drops_load_that_raced_invalidation():
+    def load():
+        value.invalidate()  # 읽는 동안 커밋이 들어와 무효화
+        return "stale"
+
+    value = LazyValue(load)
+    assert value.get() == "stale"  # 이번 호출에는 쓰되
+    assert value.value is None      # 보관하지 않는다
@@ -0,0 +1,38 @@
+from sqlalchemy import text
+from sqlmodel import Session
+
+from app.db import analyze, engine, read_engine
+from app.timeseries import load_trend
+
+def _plan(sql: str, **params) -> str:
+    with read_engine.connect() as conn:
+        return " ; ".join(row[3] for row in conn.execute(text("EXPLAIN QUERY PLAN " + sql), params))
+
+TREND = "SELECT as_of, risk_score_avg FROM regionstat WHERE level = :level AND region_code = :code AND as_of >= :start ORDER BY as_of DESC"
+
+def test_trend_uses_its_index_without_stats(seeded):
+    with engine.begin() as conn:
+        conn.exec_driver_sql("DELETE FROM sqlite_stat1")
+    try:
+        plan = _plan(TREND, level="sigungu", code="11010", start="2024-01-01")
+        assert "COVERING INDEX ix_regionstat_trend (level=? AND region_code=? AND as_of>?)" in plan
+    finally:
+        analyze()
+    with engine.connect() as conn:
+        assert conn.exec_driver_sql("SELECT count(*) FROM sqlite_stat1").scalar() > 0
+
+def test_trend_months(seeded):
+    with Session(read_engine) as session:
+        trend = load_trend(session, "sigungu", "risk_score", "11010", months=3)
+    assert [p["time"] for p in trend] == ["2025-07", "2025-08", "2025-09"]
+
+def test_stats_month_is_one_range_scan_without_stats(seeded):
+    # /geo/stats?time=: level + 한 달 범위만 읽는다 (통계 유무와 무관)
+    month = "SELECT id, region_code, centers_count FROM regionstat WHERE level = :level AND as_of >= :start AND as_of < :end AND id > 0 ORDER BY id LIMIT 501"
+    with engine.begin() as conn:
+        conn.exec_driver_sql("DELETE FROM sqlite_stat1")
+    try:
+        plan = _plan(month, level="sigungu", start="2025-09-01", end="2025-10-01")
+        assert "COVERING INDEX ix_regionstat_level_as_of_values (level=? AND as_of>? AND as_of<?)" in plan
+    finally:
+        analyze()
@@ -0,0 +1,33 @@
+import pytest
+
+from app.config import settings
+from app.gazetteer import Gazetteer, get_gazetteer, load_name_tables
+
+def test_first_entry_wins_and_parent_defaults():
+    gazetteer = Gazetteer([
+        ("11", "서울특별시", "sido", None),
+        ("11010", "종로구", "sigungu", None),
+        ("11", "서울특별시", "sido", "00"),
+        ("99", "?", "planet", None),
+    ])
+    assert gazetteer.codes == ("11", "11010") and gazetteer.parent("11") is None
+    assert gazetteer.parent("11010") == "11" and gazetteer.level("11010") == "sigungu"
+    assert gazetteer.names_for(["11010", "41110"]) == ("종로구", "41110")
+
+def test_name_conflict_raises():
+    Gazetteer([("26", "부산광역시", "sido", None), ("26", "부산광역시", "sido", None)])
+    with pytest.raises(ValueError, match="26 '울산광역시' != '부산광역시'"):
+        Gazetteer([("26", "울산광역시", "sido", None), ("26", "부산광역시", "sido", None)])
+
+def test_korea_json_fallback_matches_name_tables(fallback_geo):
+    # 정규화 레이어가 없으면 시도는 korea.json(SGIS 코드)에서 온다. 행정표준코드로 바뀌어 이름 표와 맞아야 한다
+    gazetteer = get_gazetteer()
+    assert gazetteer.name("26") == "부산광역시" and gazetteer.name("31") == "울산광역시"
+    assert gazetteer.level("21") is None
+    assert gazetteer.parent("26110") == "26"
+
+def test_name_tables_read_without_running_script():
+    entries = load_name_tables(settings.geo_names_source)
+    assert ("26", "부산광역시", "sido", None) in entries
+    assert ("26110", "중구", "sigungu", "26") in entries
+    assert load_name_tables("/nonexistent/prepare-geo-data.py") == []
@@ -0,0 +1,33 @@
+from app.models import RegionStat
+
+def test_stats_defaults_to_latest_month(client, token):
+    r = client.get("/geo/stats", params={"level": "sigungu"}, headers=token())
+    assert r.status_code == 200
+    rows = r.json()
+    # 지역마다 한 행 (24개월 이력 중 최근 월)
+    assert sorted(row["region_code"] for row in rows) == ["11010", "11680"]
+    assert {row["as_of"] for row in rows} == {"2025-09-01T00:00:00"}
+
+def test_stats_time_filter(client, token):
+    rows = client.get("/geo/stats", params={"level": "sigungu", "time": "2024-01"}, headers=token()).json()
+    assert {row["as_of"] for row in rows} == {"2024-01-01T00:00:00"}
+    assert len(rows) == 2
+    assert client.get("/geo/stats", params={"level": "sigungu", "time": "2020-01"}, headers=token()).json() == []
+    assert client.get("/geo/stats", params={"level": "sigungu", "time": "2024-13"}, headers=token()).status_code == 422
+
+def test_stats_rollup_level_and_scope(client, token):
+    rows = client.get("/geo/stats", params={"level": "sido"}, headers=token()).json()
+    assert [(row["region_code"], row["as_of"]) for row in rows] == [("11", "2025-09-01T00:00:00")]
+    # district 사용자는 자기 지역만
+    rows = client.get("/geo/stats", params={"level": "sigungu"}, headers=token("dist01")).json()
+    assert [row["region_code"] for row in rows] == ["11010"]
+
+def test_stats_fields_and_ndjson(client, token):
+    r = client.get("/geo/stats", params={"level": "sigungu", "fields": "region_code,as_of", "format": "ndjson"}, headers=token())
+    assert r.status_code == 200
+    lines = [line for line in r.text.splitlines() if line]
+    assert len(lines) == 2 and all('"as_of":"2025-09-01T00:00:00"' in line for line in lines)
+
+def test_as_of_default_is_month_start():
+    as_of = RegionStat(level="sigungu", region_code="11010").as_of
+    assert (as_of.day, as_of.hour, as_of.minute, as_of.second, as_of.microsecond) == (1, 0, 0, 0, 0)
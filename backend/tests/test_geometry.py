@@ -0,0 +1,28 @@
+import ast
+
+from app.config import settings
+from app.geometry import SGIS_SIDO_CODES, load_layer, parse_feature
+
+def _square(code: str) -> dict:
+    ring = [[0, 0], [1, 0], [1, 1], [0, 1], [0, 0]]
+    return {"properties": {"code": code, "name": code}, "geometry": {"type": "Polygon", "coordinates": [ring]}}
+
+def test_parse_feature_code_map():
+    assert parse_feature(_square("21"), 0, SGIS_SIDO_CODES).code == "26"
+    assert parse_feature(_square("21"), 0).code == "21"
+    assert parse_feature(_square("99"), 0, SGIS_SIDO_CODES).code == "99"
+
+def test_korea_json_fallback_uses_administrative_codes(fallback_geo):
+    layer = load_layer("sido")
+    assert layer.source.name == "korea.json"
+    names = {f.code: f.name for f in layer.features}
+    assert names["26"] == "부산광역시" and names["31"] == "울산광역시" and names["41"] == "경기도"
+    assert "21" not in names and len(names) == 17
+
+def test_code_map_matches_prepare_script():
+    module = ast.parse(open(settings.geo_names_source, encoding="utf-8").read())
+    (table,) = [
+        ast.literal_eval(node.value) for node in module.body
+        if isinstance(node, ast.Assign) and getattr(node.targets[0], "id", None) == "SGIS_SIDO_CODES"
+    ]
+    assert table == SGIS_SIDO_CODES
@@ -0,0 +1,74 @@
+import gzip
+
+from app.compression import accepted_encodings, choose_encoding
+from app.config import settings
+from app.httpcache import compute_etag, etag_matches
+from app.kpi import kpi_cache
+from app.versioning import bump_data_version
+
+KPI = ("/geo/kpi", {"level": "sigungu", "time": "2025-09"})
+
+def test_etag_matches():
+    assert etag_matches('W/"abc"', 'W/"abc"')
+    assert etag_matches('"abc"', 'W/"abc"')
+    assert etag_matches('"x", W/"abc"', '"abc"')
+    assert etag_matches("*", '"abc"')
+    assert not etag_matches('"x"', '"abc"') and not etag_matches("", '"abc"')
+
+def test_compute_etag_ignores_query_order():
+    a = compute_etag("/geo/kpi", "level=sido&time=2025-09", "")
+    assert a == compute_etag("/geo/kpi", "time=2025-09&level=sido", "")
+    assert a != compute_etag("/geo/kpi", "time=2025-09&level=sido", "national:")
+    assert a != compute_etag("/geo/kpi", "time=2025-09&level=sido", "", "application/msgpack")
+
+def test_not_modified_skips_route(client):
+    path, params = KPI
+    r = client.get(path, params=params)
+    etag = r.headers["etag"]
+    assert etag.startswith('W/"') and r.headers["cache-control"] == "public, no-cache"
+    hits, misses = kpi_cache._cache.hits, kpi_cache._cache.misses
+    r = client.get(path, params=params, headers={"If-None-Match": etag})
+    assert r.status_code == 304 and r.content == b""
+    assert r.headers["etag"] == etag and "Accept" in r.headers["vary"]
+    # 라우트가 실행되지 않아 스냅샷 캐시도 조회하지 않는다
+    assert (kpi_cache._cache.hits, kpi_cache._cache.misses) == (hits, misses)
+
+def test_etag_changes_with_data_version_and_scope(client, token):
+    path, params = KPI
+    etag = client.get(path, params=params).headers["etag"]
+    scoped = client.get("/geo/stats", params={"level": "sigungu"}, headers=token("dist01"))
+    other = client.get("/geo/stats", params={"level": "sigungu"}, headers=token("metro01"))
+    assert scoped.headers["etag"] != other.headers["etag"]
+    assert scoped.headers["cache-control"] == "private, no-cache"
+    bump_data_version()
+    r = client.get(path, params=params, headers={"If-None-Match": etag})
+    assert r.status_code == 200 and r.headers["etag"] != etag
+
+def test_invalid_token_is_left_to_route(client):
+    r = client.get("/centers", headers={"Authorization": "Bearer nope", "If-None-Match": "*"})
+    assert r.status_code == 401 and "etag" not in r.headers
+
+def test_tiles_use_their_own_etag(client):
+    r = client.get("/geo/tiles/sido/0/0/0")
+    assert not r.headers.get("etag", "").startswith("W/")
+
+def test_accepted_encodings():
+    assert accepted_encodings("gzip, deflate;q=0.5, br;q=0") == {"gzip", "deflate"}
+    assert choose_encoding("identity") is None
+    assert choose_encoding("gzip;q=1.0") == "gzip"
+
+def test_kpi_body_is_compressed_once(client, monkeypatch):
+    monkeypatch.setattr(settings, "gzip_min_size", 0)
+    path, params = KPI
+    headers = {"Accept-Encoding": "gzip"}
+    r = client.get(path, params=params, headers=headers)
+    assert r.headers["content-encoding"] == "gzip" and "Accept-Encoding" in r.headers["vary"]
+    snapshot = kpi_cache.get("sigungu", "risk_score", "2025-09")
+    stored = snapshot.encoded["json+gzip"]
+    # 미들웨어가 다시 압축하지 않았으므로 풀면 원본 스냅샷 본문
+    assert r.content == snapshot.body == gzip.decompress(stored)
+    client.get(path, params=params, headers=headers)
+    assert snapshot.encoded["json+gzip"] is stored
+    # 압축을 받지 않는 클라이언트에는 원본
+    r = client.get(path, params=params, headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in r.headers and r.content == snapshot.body
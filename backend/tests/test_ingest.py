@@ -0,0 +1,74 @@
+import gzip
+import json
+from datetime import datetime
+
+import pytest
+from sqlmodel import Session, select
+
+from app.db import engine
+from app.ingest import chunked, ingest_stats, iter_records, normalize_stat, parse_month, run
+from app.kpi import kpi_cache
+from app.models import RegionStat
+
+@pytest.mark.parametrize("value", ["2025-09", "2025-09-17", "2025-09-17T13:45:00", "2025-09-30 23:59:59.123", datetime(2025, 9, 5, 8)])
+def test_parse_month_normalizes_to_first_day(value):
+    assert parse_month(value) == datetime(2025, 9, 1)
+
+def test_normalize_stat_defaults():
+    row = normalize_stat({"level": " sigungu ", "region_code": 11010, "as_of": "2025-09-17", "centers_count": "3.0", "risk_score_avg": ""})
+    assert row == {
+        "level": "sigungu", "region_code": "11010", "as_of": datetime(2025, 9, 1),
+        "centers_count": 3, "population": 0, "pet_positive_rate": 0.0, "risk_score_avg": 0.0,
+    }
+
+def test_iter_records_formats(tmp_path):
+    csv_path = tmp_path / "stats.csv"
+    csv_path.write_text("level,region_code,as_of\nsigungu,11010,2025-09\n", encoding="utf-8")
+    jsonl_path = tmp_path / "stats.jsonl.gz"
+    with gzip.open(jsonl_path, "wt", encoding="utf-8") as f:
+        f.write(json.dumps({"level": "sigungu", "region_code": "11010", "as_of": "2025-09"}) + "\n\n")
+    expected = [{"level": "sigungu", "region_code": "11010", "as_of": "2025-09"}]
+    assert list(iter_records(csv_path)) == expected
+    assert list(iter_records(jsonl_path)) == expected
+    with pytest.raises(SystemExit):
+        list(iter_records(tmp_path / "stats.xlsx"))
+
+def test_chunked():
+    assert [len(c) for c in chunked(range(7), 3)] == [3, 3, 1]
+
+def _stats(level: str, code: str, month: datetime) -> list[RegionStat]:
+    with Session(engine) as session:
+        return session.exec(
+            select(RegionStat).where(RegionStat.level == level, RegionStat.region_code == code, RegionStat.as_of == month)
+        ).all()
+
+def test_ingest_stats_upserts_and_rolls_up(restore_seed):
+    month = datetime(2025, 9, 1)
+    before = kpi_cache.get("sigungu", "risk_score", "2025-09")
+    # 같은 키가 다른 날짜 표기로 두 번 오면 마지막 값이 남는다
+    report = ingest_stats([
+        {"level": "sigungu", "region_code": "11010", "as_of": "2025-09-03", "population": 139000, "risk_score_avg": 80},
+        {"level": "sigungu", "region_code": "11010", "as_of": "2025-09-30T10:00:00", "population": 139000, "risk_score_avg": 90},
+        {"level": "sigungu", "region_code": "11999", "as_of": "2025-09", "population": 1000, "risk_score_avg": 10},
+    ], batch_size=1)
+    assert report.rows == 3
+    # 행마다가 아니라 다시 집계할 (월, 시도)만 남긴다
+    assert report.touched == {(month, "11")}
+
+    (row,) = _stats("sigungu", "11010", month)
+    assert row.risk_score_avg == 90.0
+    assert len(_stats("sigungu", "11999", month)) == 1
+    # 상위 시도 행은 세 시군구의 인구 가중 평균으로 다시 집계된다
+    (sido,) = _stats("sido", "11", month)
+    assert sido.population == 139000 + 532000 + 1000
+    # 적재 후 KPI 캐시는 새로 만들어진다
+    after = kpi_cache.get("sigungu", "risk_score", "2025-09")
+    assert after is not before and "11999" in after.region_codes
+
+def test_run_from_file(tmp_path, restore_seed, capsys):
+    path = tmp_path / "stats.csv"
+    path.write_text("level,region_code,as_of,risk_score_avg\nsigungu,11680,2025-09-15,55.5\n", encoding="utf-8")
+    report = run(str(path), batch_size=10)
+    assert report.rows == 1 and "Ingested 1 stats rows" in capsys.readouterr().out
+    (row,) = _stats("sigungu", "11680", datetime(2025, 9, 1))
+    assert row.risk_score_avg == 55.5
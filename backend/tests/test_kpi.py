@@ -0,0 +1,76 @@
+import pytest
+from sqlmodel import Session, select
+
+from app.db import engine
+from app.kpi import kpi_cache
+from app.models import RegionStat
+
+def test_kpi_snapshot_records(client):
+    r = client.get("/geo/kpi", params={"level": "sigungu", "time": "2025-09"})
+    assert r.status_code == 200
+    rows = {row["region_code"]: row for row in r.json()}
+    assert set(rows) == {"11010", "11680"}
+    assert rows["11010"]["value"] == 49.0
+    # 직전 월 48.25 -> 49.0
+    assert rows["11010"]["change_rate"] == 1.55
+    assert rows["11010"]["percentile"] == 75 and rows["11680"]["percentile"] == 25
+
+def test_kpi_rollup_levels(client):
+    rows = client.get("/geo/kpi", params={"level": "sido", "time": "2025-09"}).json()
+    assert [row["region_code"] for row in rows] == ["11"]
+    # 이전 월이 없는 첫 달은 change_rate가 null
+    first = client.get("/geo/kpi", params={"level": "sigungu", "time": "2023-10"}).json()
+    assert all(row["change_rate"] is None for row in first)
+
+def test_snapshot_is_cached_and_invalidated_on_commit(client, restore_seed):
+    snapshot = kpi_cache.get("sigungu", "risk_score", "2025-09")
+    assert kpi_cache.get("sigungu", "risk_score", "2025-09") is snapshot
+    with Session(engine) as session:
+        for row in session.exec(select(RegionStat).where(RegionStat.region_code == "11010")):
+            row.risk_score_avg = 90.0
+            session.add(row)
+        session.commit()
+    rebuilt = kpi_cache.get("sigungu", "risk_score", "2025-09")
+    assert rebuilt is not snapshot
+    assert dict(zip(rebuilt.region_codes, rebuilt.values.tolist()))["11010"] == 90.0
+
+@pytest.mark.parametrize("path", ["/geo/kpi", "/geo/ranking", "/geo/trend", "/geo/shapes/sido", "/geo/stream"])
+def test_unknown_metric_is_rejected(client, path):
+    before = len(kpi_cache._cache)
+    params = {"level": "sigungu", "region_code": "11010", "metric": "bogus", "metrics": "bogus"}
+    r = client.get(path, params=params)
+    assert r.status_code == 400
+    assert r.json()["detail"] == "Unknown metric"
+    assert len(kpi_cache._cache) == before
+
+def test_snapshot_built_across_invalidation_is_not_kept(seeded, monkeypatch):
+    from app import kpi
+    build = kpi.build_snapshot
+
+    def build_then_commit_lands(*args):
+        snapshot = build(*args)
+        kpi_cache.invalidate()  # 만드는 동안 다른 커밋이 무효화
+        return snapshot
+
+    kpi_cache.invalidate()
+    monkeypatch.setattr(kpi, "build_snapshot", build_then_commit_lands)
+    stale = kpi_cache.get("sido", "risk_score", "2025-09")
+    assert ("sido", "risk_score", "2025-09") not in kpi_cache._cache
+    monkeypatch.setattr(kpi, "build_snapshot", build)
+    assert kpi_cache.get("sido", "risk_score", "2025-09") is not stale
+    assert ("sido", "risk_score", "2025-09") in kpi_cache._cache
+
+def test_kpi_arrow_round_trip(client):
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.ipc
+    params = {"level": "sigungu", "time": "2025-09"}
+    rows = client.get("/geo/kpi", params=params).json()
+    r = client.get("/geo/kpi", params=params, headers={"Accept": "application/vnd.apache.arrow.stream"})
+    assert r.status_code == 200 and r.headers["content-type"] == "application/vnd.apache.arrow.stream"
+    table = pa.ipc.open_stream(r.content).read_all()
+    # computed_at은 행마다 반복하지 않고 스키마 메타데이터로
+    assert table.schema.metadata[b"computed_at"].decode() == rows[0]["computed_at"]
+    assert pa.types.is_dictionary(table.schema.field("status").type)
+    decoded = [{**row, "computed_at": rows[0]["computed_at"]} for row in table.to_pylist()]
+    assert decoded == rows
+    assert "Accept" in r.headers["vary"] and r.headers["etag"] != client.get("/geo/kpi", params=params).headers["etag"]
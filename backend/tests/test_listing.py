@@ -0,0 +1,80 @@
+import json
+
+import pytest
+from fastapi import HTTPException
+
+from app.listing import keyset_select, parse_fields
+from app.models import Center
+
+def test_parse_fields():
+    allowed = ("id", "name", "region_code")
+    assert parse_fields(None, allowed) == allowed
+    assert parse_fields(" name, id ,name,", allowed) == ("name", "id")
+    with pytest.raises(HTTPException) as e:
+        parse_fields("name,password_hash", allowed)
+    assert e.value.status_code == 400
+
+def test_keyset_select_adds_key_and_cursor():
+    q = keyset_select(Center.__table__, ["name"], cursor=7)
+    # 요청하지 않은 정렬 키도 조회한다 (응답에서는 빠짐)
+    assert [c.name for c in q.selected_columns] == ["name", "id"]
+    sql = str(q.compile(compile_kwargs={"literal_binds": True}))
+    assert "center.id > 7" in sql and sql.rstrip().endswith("ORDER BY center.id")
+    assert "WHERE" not in str(keyset_select(Center.__table__, ["id", "name"]).compile())
+
+def _all_pages(client, headers, **params) -> tuple[list[dict], list[str]]:
+    rows, cursors, cursor = [], [], None
+    while True:
+        r = client.get("/centers", params={**params, **({"cursor": cursor} if cursor else {})}, headers=headers)
+        assert r.status_code == 200
+        rows += r.json()
+        cursor = r.headers.get("x-next-cursor")
+        if cursor is None:
+            return rows, cursors
+        cursors.append(cursor)
+
+def test_centers_keyset_pages(client, token):
+    headers = token()
+    everything = client.get("/centers", headers=headers).json()
+    assert "x-next-cursor" not in client.get("/centers", headers=headers).headers
+    rows, cursors = _all_pages(client, headers, limit=1)
+    assert rows == everything and len(cursors) == len(everything) - 1
+    # 커서는 직전 페이지 마지막 id
+    assert cursors == [str(row["id"]) for row in everything[:-1]]
+
+def test_centers_fields_without_key(client, token):
+    headers = token()
+    rows, cursors = _all_pages(client, headers, limit=2, fields="name")
+    assert all(list(row) == ["name"] for row in rows)
+    assert len(rows) == 3 and len(cursors) == 1
+    assert client.get("/centers", params={"fields": "password"}, headers=headers).status_code == 400
+
+def test_centers_scope_and_ndjson(client, token):
+    rows = client.get("/centers", headers=token("dist01")).json()
+    assert [row["region_code"] for row in rows] == ["11010"]
+    r = client.get("/centers", params={"format": "ndjson", "fields": "id,region_code"}, headers=token())
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in r.text.splitlines()]
+    assert [row["id"] for row in lines] == sorted(row["id"] for row in lines) and len(lines) == 3
+
+def test_stats_columnar_page(client, token):
+    msgpack = pytest.importorskip("msgpack")
+    params = {"level": "sigungu", "time": "2025-09", "limit": 1, "fields": "region_code"}
+    r = client.get("/geo/stats", params=params, headers={**token(), "Accept": "application/msgpack"})
+    assert r.headers["content-type"] == "application/msgpack"
+    body = msgpack.unpackb(r.content)
+    assert body["columns"] == {"region_code": ["11010"]}
+    # 컬럼 형식에서도 다음 페이지 커서는 헤더로
+    r = client.get("/geo/stats", params={**params, "cursor": r.headers["x-next-cursor"]}, headers={**token(), "Accept": "application/msgpack"})
+    assert msgpack.unpackb(r.content)["columns"] == {"region_code": ["11680"]} and "x-next-cursor" not in r.headers
+
+def test_stats_unpaginated_without_limit_or_cursor(client, token, monkeypatch):
+    from app import main
+    monkeypatch.setattr(main, "DEFAULT_LIMIT", 1)
+    params = {"level": "sigungu", "time": "2025-09", "fields": "region_code"}
+    # 기존 클라이언트: 기본 페이지 크기보다 많아도 잘리지 않는다
+    r = client.get("/geo/stats", params=params, headers=token())
+    assert r.json() == [{"region_code": "11010"}, {"region_code": "11680"}] and "x-next-cursor" not in r.headers
+    # cursor를 주면 페이지 단위 (limit 생략 시 기본 크기)
+    r = client.get("/geo/stats", params={**params, "cursor": 0}, headers=token())
+    assert r.json() == [{"region_code": "11010"}] and "x-next-cursor" in r.headers
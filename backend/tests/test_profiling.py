@@ -0,0 +1,55 @@
+import threading
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app import metrics
+from app.metrics import MetricsMiddleware
+from app.profiling import SlowRequestProfiler, _Recording
+
+def test_slow_request_written_off_loop(tmp_path):
+    profiler = SlowRequestProfiler(10, 1, str(tmp_path / "profiles"))
+    # 샘플링 스레드 없이 기록만 채운다 (테스트 스택이 섞이지 않게)
+    recording = _Recording()
+    recording.samples.update({"app.main:route;app.kpi:build": 3, "app.main:route": 1})
+    assert profiler.stop(_Recording(), "GET /empty", 25) is None
+    assert profiler.stop(recording, "GET /fast", 5) is None
+    path = profiler.stop(recording, "GET /geo/kpi", 25)
+    assert path.name.endswith("-GET_geo_kpi-25ms.folded")
+    assert profiler.flush(timeout=5)
+    assert path.read_text() == "app.main:route;app.kpi:build 3\napp.main:route 1\n"
+
+def test_profile_writes_share_one_bounded_queue(tmp_path, monkeypatch):
+    profiler = SlowRequestProfiler(10, 1, str(tmp_path), queue_size=2)
+    release = threading.Event()
+    written = []
+
+    def write(path, body):
+        release.wait(5)
+        written.append((path, threading.current_thread()))
+
+    monkeypatch.setattr(profiler, "_write", write)
+    recording = _Recording()
+    recording.samples.update({"app.main:route": 1})
+    paths = [profiler.stop(recording, f"GET /{i}", 25) for i in range(5)]
+    # writer가 하나를 붙잡고 있는 동안 큐(2개)가 차면 나머지는 버린다
+    kept = [p for p in paths if p is not None]
+    assert len(kept) in (2, 3) and paths[:2] == kept[:2]
+    assert not profiler.flush(timeout=0.05)
+    release.set()
+    assert profiler.flush(timeout=5)
+    assert [p for p, _ in written] == kept
+    assert len({thread for _, thread in written}) == 1
+
+def test_unprofiled_paths_skip_recording(monkeypatch):
+    started = []
+    monkeypatch.setattr(metrics.profiler, "start", lambda: started.append(1))
+    app = FastAPI()
+    app.get("/stream")(lambda: "open")
+    app.get("/other")(lambda: "done")
+    app.add_middleware(MetricsMiddleware, unprofiled=("/stream",))
+    with TestClient(app) as client:
+        client.get("/stream")
+        assert started == []
+        client.get("/other")
+        assert started == [1]
@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+from sqlmodel import Session, select
+
+from app import resolver
+from app.__main__ import main
+from app.db import engine
+from app.geometry import GeoFeature, GeoLayer
+from app.ingest import ingest_centers
+from app.models import Center
+
+def _box(code: str, min_lng: float, min_lat: float, max_lng: float, max_lat: float, holes=()) -> GeoFeature:
+    ring = np.array([[min_lng, min_lat], [max_lng, min_lat], [max_lng, max_lat], [min_lng, max_lat], [min_lng, min_lat]])
+    return GeoFeature(code=code, name=code, parent_code=None, polygons=((ring, *holes),), bbox=(min_lng, min_lat, max_lng, max_lat))
+
+LAYERS = {
+    "sido": [_box("11", 126, 37, 128, 38), _box("26", 128, 34, 130, 36)],
+    # 11680 안쪽에 구멍 (127.4~127.6, 37.4~37.6)
+    "sigungu": [
+        _box("11010", 126, 37, 127, 38),
+        _box("11680", 127, 37, 128, 38, holes=(np.array([[127.4, 37.4], [127.4, 37.6], [127.6, 37.6], [127.6, 37.4], [127.4, 37.4]]),)),
+    ],
+}
+
+@pytest.fixture
+def fake_layers(monkeypatch):
+    def load_layer(level):
+        features = tuple(LAYERS.get(level, ()))
+        return GeoLayer(level=level, source=None, features=features, bboxes=np.array([f.bbox for f in features]).reshape(-1, 4))
+    monkeypatch.setattr(resolver, "load_layer", load_layer)
+    resolver.get_resolver.cache_clear()
+    yield
+    resolver.get_resolver.cache_clear()
+
+def test_resolve_points(fake_layers):
+    lats = [37.5, 37.5, 37.5, 35.0, 33.0]
+    lngs = [126.5, 127.2, 127.5, 129.0, 126.5]
+    result = resolver.resolve_points(lats, lngs, ("sido", "sigungu", "eupmyeondong"))
+    assert result["sido"] == ["11", "11", "11", "26", None]
+    # 구멍 안의 점은 어느 시군구에도 속하지 않는다
+    assert result["sigungu"] == ["11010", "11680", None, None, None]
+    # 지오메트리가 없는 레벨은 빠진다
+    assert "eupmyeondong" not in result
+
+def test_resolve_center_regions_by_center_level(fake_layers):
+    codes = resolver.resolve_center_regions([
+        ("metro", 37.5, 126.5),
+        ("district", 37.5, 126.5),
+        ("district", None, 126.5),
+        ("unknown", 37.5, 126.5),
+    ])
+    assert codes == ["11", "11010", None, None]
+
+def test_ingest_fills_missing_region_codes(fake_layers, restore_seed):
+    ingest_centers([
+        {"name": "좌표만 있는 센터", "lat": "37.5", "lng": "127.2", "level": "district"},
+        {"name": "코드가 있는 센터", "region_code": "11010", "lat": "37.5", "lng": "127.2", "level": "district"},
+        {"name": "좌표 없는 센터", "level": "district"},
+    ])
+    with Session(engine) as session:
+        codes = {c.name: c.region_code for c in session.exec(select(Center))}
+    assert codes["좌표만 있는 센터"] == "11680"
+    assert codes["코드가 있는 센터"] == "11010"
+    assert codes["좌표 없는 센터"] == ""
+
+def test_backfill_centers_command(fake_layers, restore_seed, capsys):
+    with Session(engine) as session:
+        session.add_all([
+            Center(name="빈 코드", region_code="", address="", lat=37.5, lng=126.5, level="district"),
+            Center(name="다른 코드", region_code="11010", address="", lat=37.5, lng=127.2, level="district"),
+            Center(name="광역", region_code="", address="", lat=35.0, lng=129.0, level="metro"),
+        ])
+        session.commit()
+        mismatched_id = session.exec(select(Center.id).where(Center.name == "다른 코드")).one()
+
+    main(["backfill-centers"])
+    out = capsys.readouterr().out
+    assert "Filled 2 centers" in out
+    assert f"center {mismatched_id}: stored 11010, resolved 11680" in out
+    with Session(engine) as session:
+        codes = {c.name: c.region_code for c in session.exec(select(Center))}
+    assert codes["빈 코드"] == "11010" and codes["광역"] == "26" and codes["다른 코드"] == "11010"
+
+    main(["backfill-centers", "--overwrite"])
+    with Session(engine) as session:
+        assert session.exec(select(Center.region_code).where(Center.name == "다른 코드")).one() == "11680"
+
+def test_busan_resolves_to_administrative_code(fallback_geo, restore_seed):
+    # 부산시청 좌표: korea.json(SGIS 21)만 있어도 행정표준코드 26
+    assert resolver.resolve_points([35.1796], [129.0756], ("sido",)) == {"sido": ["26"]}
+    with Session(engine) as session:
+        session.add(Center(name="부산 광역센터", region_code="", address="", lat=35.1796, lng=129.0756, level="metro"))
+        session.commit()
+    main(["backfill-centers"])
+    with Session(engine) as session:
+        assert session.exec(select(Center.region_code).where(Center.name == "부산 광역센터")).one() == "26"
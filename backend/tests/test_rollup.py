@@ -0,0 +1,108 @@
+from datetime import datetime
+
+import numpy as np
+import pytest
+from sqlmodel import Session, select
+
+from app.__main__ import main
+from app.db import engine
+from app.models import RegionStat
+from app.regions import RegionTree
+from app.rollup import NATIONAL_CODE, aggregate, parent_code, rollup_rows
+
+MONTH = datetime(2025, 9, 1)
+TREE = RegionTree([
+    ("11", "sido", None), ("26", "sido", None),
+    ("11010", "sigungu", "11"), ("11680", "sigungu", "11"), ("26110", "sigungu", "26"),
+    ("11010510", "eupmyeondong", "11010"),
+])
+
+def _row(level: str, code: str, centers: int, population: int, pet: float, risk: float) -> dict:
+    return {
+        "level": level, "region_code": code, "centers_count": centers, "population": population,
+        "pet_positive_rate": pet, "risk_score_avg": risk,
+    }
+
+def test_parent_code_uses_tree_then_prefix():
+    assert parent_code(TREE, "11010510", "eupmyeondong") == "11010"
+    assert parent_code(TREE, "41110", "sigungu") == "41"          # 트리에 없으면 접두 규칙
+    assert parent_code(TREE, "41110250", "eupmyeondong") == "41110"
+    assert parent_code(TREE, "11", "sido") == NATIONAL_CODE
+    assert parent_code(TREE, NATIONAL_CODE, "national") is None
+
+def test_aggregate_population_weighted():
+    keys, out = aggregate(
+        np.array(["11", "11", "26"], dtype=object),
+        {
+            "centers_count": np.array([1.0, 2.0, 3.0]),
+            "population": np.array([100.0, 300.0, 0.0]),
+            "pet_positive_rate": np.array([0.1, 0.3, 0.5]),
+            "risk_score_avg": np.array([40.0, 60.0, 70.0]),
+        },
+    )
+    assert keys.tolist() == ["11", "26"]
+    assert out["centers_count"].tolist() == [3.0, 3.0] and out["population"].tolist() == [400.0, 0.0]
+    np.testing.assert_allclose(out["risk_score_avg"], [55.0, 70.0])
+    np.testing.assert_allclose(out["pet_positive_rate"], [0.25, 0.5])
+
+def test_zero_population_children_use_simple_mean():
+    _, out = aggregate(
+        np.array(["11", "11"], dtype=object),
+        {"centers_count": np.zeros(2), "population": np.zeros(2), "pet_positive_rate": np.array([0.2, 0.4]), "risk_score_avg": np.array([10.0, 30.0])},
+    )
+    np.testing.assert_allclose(out["risk_score_avg"], [20.0])
+
+def test_rollup_rows_chains_levels():
+    rows = rollup_rows([
+        _row("eupmyeondong", "11010510", 1, 100, 0.2, 50.0),
+        _row("sigungu", "11010", 9, 9999, 0.9, 99.0),   # 자식이 있으니 집계값으로 덮인다
+        _row("sigungu", "11680", 2, 300, 0.4, 30.0),
+        _row("sigungu", "26110", 1, 0, 0.1, 10.0),
+        _row("sido", "26", 5, 500, 0.3, 20.0),          # 자식(26110) 인구가 0이라 단순 평균
+    ], MONTH, TREE)
+    by_key = {(r["level"], r["region_code"]): r for r in rows}
+    assert set(by_key) == {("sigungu", "11010"), ("sido", "11"), ("sido", "26"), ("national", NATIONAL_CODE)}
+    assert by_key["sigungu", "11010"]["population"] == 100 and by_key["sigungu", "11010"]["risk_score_avg"] == 50.0
+    seoul = by_key["sido", "11"]
+    assert seoul["population"] == 400 and seoul["centers_count"] == 3
+    assert seoul["risk_score_avg"] == pytest.approx((50 * 100 + 30 * 300) / 400)
+    assert by_key["sido", "26"]["risk_score_avg"] == 10.0 and by_key["sido", "26"]["population"] == 0
+    national = by_key["national", NATIONAL_CODE]
+    assert national["population"] == 400 and national["as_of"] == MONTH
+    # 인구 0인 시도는 가중치 0 (전국 인구 > 0)
+    assert national["risk_score_avg"] == pytest.approx(seoul["risk_score_avg"])
+
+def _value(level: str, code: str, month: datetime = MONTH) -> RegionStat:
+    with Session(engine) as session:
+        return session.exec(
+            select(RegionStat).where(RegionStat.level == level, RegionStat.region_code == code, RegionStat.as_of == month)
+        ).one()
+
+def test_rollup_command_rebuilds_upper_levels(restore_seed, capsys):
+    with Session(engine) as session:
+        for row in session.exec(select(RegionStat).where(RegionStat.level == "sido", RegionStat.as_of == MONTH)):
+            row.risk_score_avg = 0.0
+            session.add(row)
+        session.commit()
+    assert _value("sido", "11").risk_score_avg == 0.0
+
+    main(["rollup", "--month", "2025-09"])
+    assert "Rolled up 2 rows" in capsys.readouterr().out
+    a, b = _value("sigungu", "11010"), _value("sigungu", "11680")
+    expected = (a.risk_score_avg * a.population + b.risk_score_avg * b.population) / (a.population + b.population)
+    assert _value("sido", "11").risk_score_avg == pytest.approx(expected)
+    assert _value("national", NATIONAL_CODE).population == a.population + b.population
+
+def test_seed_bumps_data_version_after_rollup(restore_seed, monkeypatch):
+    from app import seed
+    from app.kpi import kpi_cache
+    rollup_fn = seed.rollup
+
+    def request_before_rollup():
+        # 시드의 ORM 커밋 뒤, 롤업 전에 들어온 요청이 시도 스냅샷(아직 빈)을 캐시한다
+        assert kpi_cache.get("sido", "risk_score", "2025-09").region_codes == ()
+        return rollup_fn()
+
+    monkeypatch.setattr(seed, "rollup", request_before_rollup)
+    seed.run()
+    assert kpi_cache.get("sido", "risk_score", "2025-09").region_codes == ("11",)
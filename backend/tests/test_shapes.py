@@ -0,0 +1,55 @@
+import json
+
+import pytest
+
+from app.config import settings
+from app.shapes import shard_store
+
+def _collection(*codes: str) -> str:
+    features = [{"type": "Feature", "properties": {"region_code": code}, "geometry": None} for code in codes]
+    return json.dumps({"type": "FeatureCollection", "features": features})
+
+@pytest.fixture
+def geo_dir(tmp_path, monkeypatch):
+    """geo/normalized/ 에 시군구 전체 파일과 서울(11) 조각, manifest만 있는 GEO_DATA_DIR"""
+    out = tmp_path / "geo" / "normalized"
+    (out / "sigungu").mkdir(parents=True)
+    (out / "sigungu.geojson").write_text(_collection("11010", "11680"))
+    (out / "sigungu" / "11.geojson").write_text(_collection("11010", "11680"))
+    (out / "manifest.json").write_text('{"levels": {}}')
+    monkeypatch.setattr(settings, "geo_data_dir", str(tmp_path))
+    shard_store.clear()
+    yield out
+    monkeypatch.undo()
+    shard_store.clear()
+
+PARAMS = {"parent_code": "11", "time": "2025-09"}
+
+def test_shard_hit(client, geo_dir):
+    r = client.get("/geo/shapes/sigungu", params=PARAMS)
+    assert r.status_code == 200 and r.headers["etag"].startswith('W/"')
+    body = r.json()
+    assert body["parent_code"] == "11" and body["level"] == "sigungu"
+    assert [f["properties"]["region_code"] for f in body["shapes"]["features"]] == ["11010", "11680"]
+    assert sorted(row["region_code"] for row in body["kpi"]) == ["11010", "11680"]
+    assert client.get("/geo/shapes/sigungu", params=PARAMS, headers={"If-None-Match": r.headers["etag"]}).status_code == 304
+    # 레벨 전체 파일
+    assert client.get("/geo/shapes/sigungu", params={"time": "2025-09"}).status_code == 200
+
+def test_unknown_parent_is_404_and_not_cached(client, geo_dir):
+    for code in ("26", "nope", "../sido"):
+        assert client.get("/geo/shapes/sigungu", params={**PARAMS, "parent_code": code}).status_code == 404
+    assert client.get("/geo/shapes/planet", params=PARAMS).status_code == 404
+    assert set(shard_store._shards) == set()
+
+def test_rerun_pipeline_refreshes_shards(client, geo_dir):
+    before = client.get("/geo/shapes/sigungu", params=PARAMS)
+    assert client.get("/geo/shapes/sigungu", params={**PARAMS, "parent_code": "26"}).status_code == 404
+    # 파이프라인을 다시 돌린 것처럼 조각을 바꾸고 manifest를 새로 쓴다
+    (geo_dir / "sigungu" / "11.geojson").write_text(_collection("11010"))
+    (geo_dir / "sigungu" / "26.geojson").write_text(_collection("26110"))
+    (geo_dir / "manifest.json").write_text('{"levels": {"sigungu": {}}}')
+    after = client.get("/geo/shapes/sigungu", params=PARAMS)
+    assert after.headers["etag"] != before.headers["etag"]
+    assert [f["properties"]["region_code"] for f in after.json()["shapes"]["features"]] == ["11010"]
+    assert client.get("/geo/shapes/sigungu", params={**PARAMS, "parent_code": "26"}).status_code == 200
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from app.schemas import CenterResponse
+from app.spatial import CenterIndex, haversine_km
+
+def _centers(n: int, seed: int = 0) -> list[CenterResponse]:
+    rng = np.random.default_rng(seed)
+    lats = rng.uniform(33.0, 38.6, n)
+    lngs = rng.uniform(124.5, 131.0, n)
+    codes = rng.choice(["11010", "11680", "26110"], n)
+    # id 순서와 입력 순서가 달라도 인덱스는 id 순으로 돌려준다
+    ids = rng.permutation(n) + 1
+    return [
+        CenterResponse(id=int(i), name=f"센터{i}", region_code=str(c), address="", lat=float(la), lng=float(lo), level="district")
+        for i, la, lo, c in zip(ids, lats, lngs, codes)
+    ]
+
+@pytest.fixture(scope="module")
+def centers():
+    return _centers(2000)
+
+@pytest.fixture(scope="module")
+def index(centers):
+    return CenterIndex(centers, cell_deg=0.25)
+
+def test_skips_centers_without_coordinates(centers):
+    extra = CenterResponse(id=99999, name="좌표 없음", region_code="11010", address="", level="district")
+    assert len(CenterIndex(centers + [extra], 0.25)) == len(centers)
+
+def test_bbox_matches_brute_force(index, centers):
+    box = (35.0, 126.0, 36.3, 127.7)
+    expected = sorted(
+        c.id for c in centers if box[0] <= c.lat <= box[2] and box[1] <= c.lng <= box[3]
+    )
+    found, cursor = index.bbox(*box, limit=len(centers))
+    assert [c.id for c in found] == expected and cursor is None
+
+def test_bbox_keyset_pages(index, centers):
+    box = (33.0, 124.5, 38.6, 131.0)
+    pages, cursor = [], None
+    while True:
+        page, cursor = index.bbox(*box, after_id=cursor, limit=300)
+        pages.append([c.id for c in page])
+        if cursor is None:
+            break
+        assert cursor == page[-1].id
+    ids = [i for page in pages for i in page]
+    assert ids == sorted(c.id for c in centers)
+    assert all(len(page) == 300 for page in pages[:-1])
+
+def test_bbox_scope(index):
+    found, _ = index.bbox(33.0, 124.5, 38.6, 131.0, scope=("26110",), limit=5000)
+    assert found and {c.region_code for c in found} == {"26110"}
+
+@pytest.mark.parametrize("point", [(37.5665, 126.978), (35.1, 129.04), (33.0, 124.5), (40.0, 120.0)])
+def test_nearest_matches_brute_force(index, centers, point):
+    lats = np.array([c.lat for c in centers])
+    lngs = np.array([c.lng for c in centers])
+    dist = haversine_km(*point, lats, lngs)
+    expected = np.sort(dist)[:10]
+    found = index.nearest(*point, k=10)
+    assert len(found) == 10
+    np.testing.assert_allclose([d for _, d in found], expected)
+
+def test_nearest_scope_and_small_index(index, centers):
+    found = index.nearest(37.5, 127.0, k=5, scope=("11680",))
+    assert len(found) == 5 and all(c.region_code == "11680" for c, _ in found)
+    # 센터 수보다 큰 k는 있는 만큼
+    small = CenterIndex(centers[:3], 0.25)
+    assert len(small.nearest(37.5, 127.0, k=10)) == 3
+    assert CenterIndex([], 0.25).nearest(37.5, 127.0, k=3) == []
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from app.stats import downsample, panel_stats
+
+def test_ties_share_rank_and_average_percentile():
+    stats = panel_stats(np.array([[10.0, 20.0, 20.0, 30.0]]))
+    assert stats.rank[0].tolist() == [4, 2, 2, 1]
+    # 동점은 평균 순위: (작은 값 수 + 0.5 * 같은 값 수) / 유효 값 수
+    assert stats.percentile[0].tolist() == [12.5, 50.0, 50.0, 87.5]
+
+def test_missing_values_are_excluded_per_row():
+    stats = panel_stats(np.array([[1.0, np.nan, 3.0], [np.nan, np.nan, 5.0]]))
+    assert stats.rank[0, 0] == 2 and stats.rank[0, 2] == 1
+    assert np.isnan(stats.rank[0, 1]) and np.isnan(stats.percentile[1, 0])
+    assert stats.percentile[1, 2] == 50.0
+    assert stats.status[0, 1] == "normal"
+
+def test_rows_do_not_collide_with_large_values():
+    # 값 범위가 크면 실수 오프셋 방식에서는 둘째 행의 1과 2가 같은 키가 됐다
+    stats = panel_stats(np.array([[0.0, 1e16], [1.0, 2.0]]))
+    assert stats.rank[1].tolist() == [2, 1]
+    assert stats.percentile[1].tolist() == [25.0, 75.0]
+
+def test_many_rows_match_per_row_reference():
+    rng = np.random.default_rng(0)
+    panel = rng.integers(0, 5, size=(2000, 7)).astype(np.float64) * 1e12
+    panel[rng.random(panel.shape) < 0.1] = np.nan
+    stats = panel_stats(panel)
+    for i in (0, 999, 1999):
+        row = panel[i][~np.isnan(panel[i])]
+        for j in np.flatnonzero(~np.isnan(panel[i])):
+            less = (row < panel[i, j]).sum()
+            equal = (row == panel[i, j]).sum()
+            assert stats.percentile[i, j] == pytest.approx((less + 0.5 * equal) / row.size * 100)
+            assert stats.rank[i, j] == row.size - less - equal + 1
+
+def test_change_rate_and_status():
+    stats = panel_stats(np.array([[100.0, 0.0, 1.0], [110.0, 5.0, 2.0]]))
+    assert np.isnan(stats.change_rate[0]).all()
+    assert stats.change_rate[1, 0] == pytest.approx(10.0)
+    assert np.isnan(stats.change_rate[1, 1])  # 직전 값 0
+    assert stats.status[1].tolist() == ["warning", "normal", "normal"]  # 83.3, 50, 16.7
+
+def test_rejects_non_2d():
+    with pytest.raises(ValueError):
+        panel_stats(np.array([1.0, 2.0]))
+
+def test_downsample_means():
+    starts, means = downsample(np.array([1.0, 3.0, np.nan, 5.0, 7.0, 9.0]), 3)
+    assert starts.tolist() == [0, 2, 4]
+    assert means.tolist() == [2.0, 5.0, 8.0]
+
+def test_ranking_endpoint(client):
+    body = client.get("/geo/ranking", params={"level": "sigungu", "time": "2025-09", "limit": 1}).json()
+    assert [e["region_code"] for e in body["top"]] == ["11010"]
+    assert [e["region_code"] for e in body["bottom"]] == ["11680"]
+    assert body["top"][0]["rank"] == 1
@@ -0,0 +1,141 @@
+import asyncio
+import json
+
+from sqlmodel import Session, select
+
+from app.db import engine
+from app.models import RegionStat
+from app.stream import STREAM_PATH, StreamingGZipMiddleware, broadcaster
+
+class _Connection:
+    """ASGI 앱에 직접 연결한 클라이언트. TestClient는 응답이 끝날 때까지 본문을 모으므로
+    끝나지 않는 SSE는 청크를 받는 대로 꺼내 볼 수 있게 직접 구동한다"""
+
+    def __init__(self, app, path: str, query: str = "", headers: dict | None = None):
+        self.start: dict | None = None
+        self.chunks: asyncio.Queue = asyncio.Queue()
+        self._requested = False
+        self._disconnected = asyncio.Event()
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+            "path": path, "raw_path": path.encode(), "root_path": "", "query_string": query.encode(),
+            "headers": [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()],
+            "server": ("testserver", 80), "client": ("testclient", 50000),
+        }
+        self.task = asyncio.create_task(app(scope, self._receive, self._send))
+
+    async def _receive(self) -> dict:
+        if not self._requested:
+            self._requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await self._disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def _send(self, message: dict) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+        elif message["type"] == "http.response.body" and message.get("body"):
+            self.chunks.put_nowait(message["body"])
+
+    @property
+    def headers(self) -> dict[str, str]:
+        return {k.decode(): v.decode() for k, v in self.start["headers"]}
+
+    async def next_chunk(self, timeout: float = 5) -> bytes:
+        return await asyncio.wait_for(self.chunks.get(), timeout)
+
+    async def close(self) -> None:
+        self._disconnected.set()
+        await asyncio.wait_for(self.task, 5)
+
+def _parse(chunk: bytes) -> dict:
+    fields = dict(line.split(": ", 1) for line in chunk.decode().strip().split("\n"))
+    return {**fields, "data": json.loads(fields["data"])}
+
+def _set_risk(region_code: str, value: float) -> None:
+    with Session(engine) as session:
+        for row in session.exec(select(RegionStat).where(RegionStat.region_code == region_code)):
+            row.risk_score_avg = value
+            session.add(row)
+        session.commit()
+
+def test_stream_starts_with_snapshot(client):
+    async def run():
+        conn = _Connection(client.app, STREAM_PATH, "level=sigungu&time=2025-09")
+        try:
+            return conn, _parse(await conn.next_chunk())
+        finally:
+            await conn.close()
+
+    conn, event = client.portal.call(run)
+    assert conn.start["status"] == 200
+    assert conn.headers["content-type"].startswith("text/event-stream")
+    assert event["event"] == "snapshot" and event["retry"] == "3000"
+    data = event["data"]
+    assert event["id"] == data["version"]
+    assert (data["level"], data["time"]) == ("sigungu", "2025-09")
+    values = {r["region_code"]: r["value"] for r in data["metrics"]["risk_score"]}
+    assert set(values) == {"11010", "11680"} and values["11010"] == 49.0
+
+def test_stream_pushes_delta_after_commit(client, restore_seed):
+    async def run():
+        conn = _Connection(client.app, STREAM_PATH, "level=sigungu&time=2025-09")
+        try:
+            snapshot = _parse(await conn.next_chunk())
+            await asyncio.to_thread(_set_risk, "11010", 90.0)
+            return snapshot, _parse(await conn.next_chunk())
+        finally:
+            await conn.close()
+
+    snapshot, delta = client.portal.call(run)
+    assert delta["event"] == "delta"
+    assert delta["id"] != snapshot["id"] and delta["id"] == delta["data"]["version"]
+    change = delta["data"]["metrics"]["risk_score"]
+    # 바뀐 지역만 보낸다
+    assert [(r["region_code"], r["value"]) for r in change["upsert"]] == [("11010", 90.0)]
+    assert change["removed"] == []
+
+def test_stream_disconnect_unsubscribes(client):
+    async def run():
+        before = broadcaster.subscribers
+        conn = _Connection(client.app, STREAM_PATH, "level=sido&metrics=risk_score,elderly_ratio&time=2025-09")
+        await conn.next_chunk()
+        connected = broadcaster.subscribers
+        await conn.close()
+        return before, connected, broadcaster.subscribers, set(broadcaster._groups)
+
+    before, connected, after, groups = client.portal.call(run)
+    assert connected == before + 1
+    assert after == before
+    # 마지막 구독자가 나가면 그룹도 지운다
+    assert not any(key[:3] == ("sido", ("risk_score", "elderly_ratio"), "2025-09") for key in groups)
+
+def test_gzip_middleware_passes_event_stream_unbuffered(client):
+    async def run():
+        conn = _Connection(client.app, STREAM_PATH, "level=sigungu&time=2025-09", {"Accept-Encoding": "gzip"})
+        try:
+            # 압축 버퍼에 묶였다면 첫 이벤트가 나오지 않는다
+            return conn, await conn.next_chunk()
+        finally:
+            await conn.close()
+
+    conn, chunk = client.portal.call(run)
+    assert "content-encoding" not in conn.headers
+    assert chunk.startswith(b"retry: 3000\n")
+
+def test_gzip_middleware_still_compresses_other_paths():
+    body = b"x" * 1000
+
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/plain")]})
+        await send({"type": "http.response.body", "body": body})
+
+    async def run(path):
+        conn = _Connection(StreamingGZipMiddleware(app, minimum_size=500), path, headers={"Accept-Encoding": "gzip"})
+        await conn.task
+        return conn.headers, await conn.next_chunk()
+
+    headers, chunk = asyncio.run(run("/geo/stats"))
+    assert headers["content-encoding"] == "gzip" and chunk != body
+    headers, chunk = asyncio.run(run(STREAM_PATH))
+    assert "content-encoding" not in headers and chunk == body
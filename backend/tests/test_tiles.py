@@ -0,0 +1,135 @@
+import gzip
+
+import numpy as np
+import pytest
+
+from app import tiles
+from app.geometry import GeoFeature, GeoLayer, lonlat_to_world, rings_importance, simplify_ring
+
+# ---------- 최소 protobuf 디코더 (varint/길이 구분 필드만) ----------
+def _read_varint(buf: bytes, pos: int) -> tuple[int, int]:
+    shift = value = 0
+    while True:
+        b = buf[pos]
+        pos += 1
+        value |= (b & 0x7F) << shift
+        shift += 7
+        if not b & 0x80:
+            return value, pos
+
+def _fields(buf: bytes) -> list[tuple[int, int | bytes]]:
+    out, pos = [], 0
+    while pos < len(buf):
+        key, pos = _read_varint(buf, pos)
+        number, wire_type = key >> 3, key & 0x7
+        if wire_type == 0:
+            value, pos = _read_varint(buf, pos)
+        else:
+            assert wire_type == 2
+            size, pos = _read_varint(buf, pos)
+            value, pos = buf[pos:pos + size], pos + size
+        out.append((number, value))
+    return out
+
+def _packed(buf: bytes) -> list[int]:
+    out, pos = [], 0
+    while pos < len(buf):
+        value, pos = _read_varint(buf, pos)
+        out.append(value)
+    return out
+
+def _decode_rings(commands: list[int]) -> list[list[tuple[int, int]]]:
+    """MoveTo/LineTo/ClosePath 명령열 -> 절대 좌표 링"""
+    rings, cursor, pos = [], [0, 0], 0
+    while pos < len(commands):
+        cmd, count = commands[pos] & 0x7, commands[pos] >> 3
+        pos += 1
+        if cmd == 7:
+            continue
+        for _ in range(count):
+            for axis in (0, 1):
+                zz = commands[pos]
+                cursor[axis] += (zz >> 1) ^ -(zz & 1)
+                pos += 1
+            if cmd == 1:
+                rings.append([])
+            rings[-1].append(tuple(cursor))
+    return rings
+
+def _square(lo: float, hi: float) -> np.ndarray:
+    return np.array([[lo, lo], [hi, lo], [hi, hi], [lo, hi], [lo, lo]], dtype=np.float64)
+
+@pytest.fixture
+def square_layer(monkeypatch):
+    """(0,0)-(10,10) 정사각형에 (4,4)-(6,6) 구멍, 아래 변에 살짝 튀어나온 점 하나"""
+    exterior = np.array([[0, 0], [5, -0.01], [10, 0], [10, 10], [0, 10], [0, 0]], dtype=np.float64)
+    hole = _square(4, 6)[::-1]
+    feature = GeoFeature(code="11", name="서울", parent_code=None, polygons=((exterior, hole),), bbox=(0.0, -0.01, 10.0, 10.0))
+    layer = GeoLayer(level="sido", source=None, features=(feature,), bboxes=np.array([feature.bbox]))
+    monkeypatch.setattr(tiles, "load_layer", lambda level: layer)
+    tiles._level_rings.cache_clear()
+    tiles._zoom_layer.cache_clear()
+    yield feature
+    tiles._level_rings.cache_clear()
+    tiles._zoom_layer.cache_clear()
+
+def test_varint():
+    assert tiles._varint(1) == b"\x01"
+    assert tiles._varint(300) == b"\xac\x02"
+
+def test_importance_matches_douglas_peucker():
+    ring = np.array([[0, 0], [1, 0.1], [2, -0.05], [3, 0.4], [4, 0], [4, 4], [0, 4], [0, 0]], dtype=np.float64)
+    importance = rings_importance([ring])[0]
+    assert np.isinf(importance[[0, -1]]).all()
+    kept = {tuple(p) for p in simplify_ring(ring, 0.2).tolist()}
+    assert (3, 0.4) in kept and (1, 0.1) not in kept
+    assert len(simplify_ring(ring, 0.01)) == len(ring)
+    for tolerance in (0.01, 0.07, 0.2, 1.0, 10.0):
+        np.testing.assert_array_equal(simplify_ring(ring, tolerance), ring[importance > tolerance])
+    # 4점 이하 링은 그대로
+    assert np.isinf(rings_importance([_square(0, 1)[:4]])[0]).all()
+
+def test_render_tile_decodes(square_layer):
+    body = tiles.render_tile("sido", 0, 0, 0)
+    (layer_field,) = _fields(body)
+    assert layer_field[0] == 3
+    layer = _fields(layer_field[1])
+    assert dict(layer)[15] == 2 and dict(layer)[1] == b"sido" and dict(layer)[5] == tiles.EXTENT
+    assert [v for n, v in layer if n == 3] == [b"region_code", b"region_name", b"parent_code"]
+    values = [_fields(v)[0][1].decode() for n, v in layer if n == 4]
+    assert values == ["11", "서울"]
+
+    (feature,) = [dict(_fields(v)) for n, v in layer if n == 2]
+    assert feature[1] == 1 and feature[3] == 3  # id, POLYGON
+    assert _packed(feature[2]) == [0, 0, 1, 1]
+    exterior, hole = _decode_rings(_packed(feature[4]))
+    expected = np.rint(lonlat_to_world(square_layer.polygons[0][1]) * tiles.EXTENT).astype(int)
+    assert sorted(hole) == sorted(map(tuple, expected[:-1]))
+    # z0에서는 튀어나온 점이 1픽셀 미만이라 단순화로 빠진다
+    assert len(exterior) == 4
+    # 외곽은 양수, 구멍은 음수 면적 (y 아래 방향)
+    assert tiles._ring_area2(np.array(exterior)) > 0 > tiles._ring_area2(np.array(hole))
+
+def test_zoom_layers_keep_more_points_at_higher_zoom(square_layer):
+    tiles.warm_zoom_layers("sido", 14)
+    assert tiles._zoom_layer.cache_info().currsize == 15
+    low, high = (tiles._zoom_layer("sido", z).polygons[0][0][0] for z in (0, 14))
+    assert len(low) == 5 and len(high) == 6
+
+def test_empty_tile(square_layer):
+    assert tiles.render_tile("sido", 2, 0, 0) == b""
+
+def test_tile_route_etag_and_encoding(client):
+    url = "/geo/tiles/sido/0/0/0"
+    r = client.get(url, headers={"Accept-Encoding": "gzip"})
+    if r.status_code == 404:
+        pytest.skip("경계 GeoJSON 없음")
+    assert r.status_code == 200
+    etag = r.headers["etag"]
+    assert r.headers["content-encoding"] == "gzip"
+    assert r.content == tiles.get_tile("sido", 0, 0, 0).raw  # httpx가 풀어서 준다
+    assert gzip.decompress(tiles.get_tile("sido", 0, 0, 0).gzip) == r.content
+    # 약한 비교와 목록 모두 304
+    for header in (etag, f"W/{etag}", f'"other", {etag}', "*"):
+        assert client.get(url, headers={"If-None-Match": header}).status_code == 304
+    assert client.get(url, headers={"If-None-Match": '"other"'}).status_code == 200
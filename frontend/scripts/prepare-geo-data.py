@@ -1,18 +1,68 @@
 #!/usr/bin/env python3
 """
-준비 스크립트: GeoJSON 데이터와 Mock KPI JSON 생성
+준비 스크립트: 원본 GeoJSON -> geo/normalized/ (레벨별 + 상위 지역별 분할, 압축본 포함)
+
+  python frontend/scripts/prepare-geo-data.py [--eupmyeondong emd.geojson] [--workers 4] [--mock-kpi] [--sample-sources]
+
+- 읍면동 원본은 저장소에 없다. 국가공간정보포털/V-World의 행정구역 읍면동 경계(TL_SCCO_EMD, SHP)를
+  ogr2ogr로 WGS84 GeoJSON으로 바꿔 --eupmyeondong에 넘긴다 (frontend/public/geo/README.md 참고)
+
+- 원본은 features 배열을 한 건씩 읽어(스트리밍) 파일 전체를 메모리에 올리지 않는다 (.gz 원본도 가능)
+- 코드/이름/상위 코드를 region_code, region_name, parent_code로 정규화하고 좌표는 --precision 자리로 반올림.
+  korea.json의 시도 코드(SGIS 체계, 21=부산)는 시군구/읍면동과 같은 행정표준코드(26=부산)로 바꾼다
+- 시군구의 상위 코드(앞 두 자리)가 시도 출력에 없으면 실패한다 (읍면동은 경고)
+- 정규화와 압축은 프로세스 풀에서 실행한다 (--workers 0이면 현재 프로세스)
+- 출력: {sido,sigungu,eupmyeon}.geojson, 하위 레벨은 {level}/{parent_code}.geojson 조각도 함께.
+  모든 파일에 .gz(과 brotli 모듈이 있으면 .br)를 만든다
+- manifest.json에 원본 내용 해시와 옵션을 기록해, 다시 실행할 때 바뀌지 않은 레벨은 건너뛴다 (--force로 무시)
 """
+import argparse
+import gzip
+import hashlib
 import json
+import os
 import random
-from pathlib import Path
+import re
+import shutil
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
 from datetime import datetime
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성: 없으면 .gz만 만든다
+    brotli = None
 
 # 기본 경로
-ROOT = Path(__file__).parent.parent.parent
+ROOT = Path(__file__).resolve().parent.parent.parent
 KOREA_JSON = ROOT / 'korea.json'
 GEO_DIR = ROOT / 'frontend' / 'public' / 'geo'
+OUT_DIR = GEO_DIR / 'normalized'
 MOCK_DIR = ROOT / 'frontend' / 'public' / 'mock'
 
+# 레벨 -> (출력 파일 이름, 상위 코드 자리수). 프론트엔드(MapPanel)가 읽는 이름과 같다
+LEVELS = {
+    'sido': ('sido', None),
+    'sigungu': ('sigungu', 2),
+    'eupmyeondong': ('eupmyeon', 5),
+}
+DEFAULT_SOURCES = {
+    'sido': KOREA_JSON,
+    'sigungu': GEO_DIR / 'sigungu.json',
+}
+
+# backend/app/geometry.py 와 같은 속성 키 우선순위
+CODE_KEYS = ('region_code', 'code', 'CD', 'adm_cd', 'ADM_CD', 'SIG_CD', 'EMD_CD')
+NAME_KEYS = ('region_name', 'name', 'NAME', 'adm_nm', 'SIG_KOR_NM', 'EMD_KOR_NM')
+PARENT_KEYS = ('parent_code', 'parent', 'PARENT')
+
+# 출력 형식이 바뀌면 올려서 기존 manifest를 무효화
+PIPELINE_VERSION = 2
+BATCH_SIZE = 200
+READ_CHUNK = 1 << 20
+
 # 한글 주소명
 SIDO_NAMES = {
     '11': '서울특별시',
@@ -30,7 +80,7 @@ SIDO_NAMES = {
     '46': '전라남도',
     '47': '경상북도',
     '48': '경상남도',
-    '50': '제주도',
+    '50': '제주특별자치도',
 }
 
 SIGUNGU_MAP = {
@@ -81,34 +131,78 @@ SIGUNGU_MAP = {
     ],
 }
 
-def create_sample_geojson(properties_list):
-    """샘플 지오메트리와 함께 GeoJSON 생성"""
+# SGIS(통계청) 시도 코드 -> 행정표준코드. korea.json은 SGIS 코드이고 시군구/읍면동 코드의 앞 두 자리와
+# SIDO_NAMES는 행정표준코드라 그대로 쓰면 21(부산)에 자식이 없고 26이 울산이 된다
+# (backend/app/geometry.py도 korea.json을 직접 읽을 때 같은 표를 쓴다)
+SGIS_SIDO_CODES = {
+    '11': '11',  # 서울
+    '21': '26',  # 부산
+    '22': '27',  # 대구
+    '23': '28',  # 인천
+    '24': '29',  # 광주
+    '25': '30',  # 대전
+    '26': '31',  # 울산
+    '29': '36',  # 세종
+    '31': '41',  # 경기
+    '32': '42',  # 강원
+    '33': '43',  # 충북
+    '34': '44',  # 충남
+    '35': '45',  # 전북
+    '36': '46',  # 전남
+    '37': '47',  # 경북
+    '38': '48',  # 경남
+    '39': '50',  # 제주
+}
+
+# 시도별 대략적 중심 좌표 [lon, lat] (한반도)
+SIDO_CENTROIDS = {
+    '11': [127.0, 37.5],  # 서울
+    '26': [129.0, 35.1],  # 부산
+    '27': [128.6, 35.9],  # 대구
+    '28': [126.7, 37.5],  # 인천
+    '29': [126.9, 35.2],  # 광주
+    '30': [127.4, 36.4],  # 대전
+    '31': [129.3, 35.5],  # 울산
+    '41': [127.1, 37.3],  # 경기
+    '42': [128.3, 37.8],  # 강원
+    '43': [127.5, 36.8],  # 충북
+    '44': [127.0, 36.3],  # 충남
+    '45': [127.1, 35.8],  # 전북
+    '46': [127.0, 34.8],  # 전남
+    '47': [129.1, 36.5],  # 경북
+    '48': [128.4, 35.4],  # 경남
+    '50': [126.5, 33.4],  # 제주
+}
+
+def synthetic_national_regions(rng=None, sigungu_total=250, eupmyeondong_per_sigungu=14):
+    """전국 규모 합성 지역 코드 (벤치마크용)
+
+    SIGUNGU_MAP에 있는 시군구는 그대로 쓰고, 나머지 시도에 시군구를 고르게 채워
+    약 sigungu_total개 시군구와 시군구마다 eupmyeondong_per_sigungu개 안팎의 읍면동을 만든다.
+    반환: [(code, name, level, parent_code)] (시도 -> 시군구 -> 읍면동 순)
+    """
+    rng = rng or random.Random(0)
+    regions = [(code, name, 'sido', None) for code, name in SIDO_NAMES.items()]
+    sigungu = [(code, name, sido) for sido, items in SIGUNGU_MAP.items() for code, name in items]
+    others = [code for code in SIDO_NAMES if code not in SIGUNGU_MAP]
+    per_sido = max(1, -(-(sigungu_total - len(sigungu)) // max(1, len(others))))
+    for sido in others:
+        for i in range(per_sido):
+            sigungu.append((f"{sido}{(i + 1) * 10:03d}", f"{SIDO_NAMES[sido]} 시군{i + 1}", sido))
+    regions += [(code, name, 'sigungu', sido) for code, name, sido in sigungu]
+    for code, name, _ in sigungu:
+        count = max(1, eupmyeondong_per_sigungu + rng.randint(-3, 3))
+        regions += [(f"{code}{j + 1:03d}", f"{name} {j + 1}동", 'eupmyeondong', code) for j in range(count)]
+    return regions
+
+def create_sample_geojson(properties_list, rng=None):
+    """속성 목록 -> 시도 중심(SIDO_CENTROIDS) 근처 직사각형 폴리곤 FeatureCollection (--sample-sources)"""
+    rng = rng or random.Random(0)
     features = []
-    # 간단한 폴리곤 좌표 (한반도 대략적 위치)
-    coord_base = {
-        '11': [127.0, 37.5],  # 서울
-        '26': [129.0, 35.1],  # 부산
-        '27': [128.6, 35.9],  # 대구
-        '28': [126.7, 37.5],  # 인천
-        '41': [127.1, 37.3],  # 경기
-        '42': [128.3, 37.8],  # 강원
-        '43': [127.5, 36.8],  # 충북
-        '44': [127.0, 36.3],  # 충남
-        '45': [127.1, 35.8],  # 전북
-        '46': [127.0, 34.8],  # 전남
-        '47': [129.1, 36.5],  # 경북
-        '48': [128.4, 35.4],  # 경남
-    }
-    
     for props in properties_list:
-        code = props['region_code']
-        base_lon, base_lat = coord_base.get(code[:2], [127.0, 37.0])
-        offset_x = random.uniform(-0.5, 0.5)
-        offset_y = random.uniform(-0.5, 0.5)
-        
-        # 간단한 직사각형 폴리곤
-        lon, lat = base_lon + offset_x, base_lat + offset_y
-        feature = {
+        base_lon, base_lat = SIDO_CENTROIDS.get(props['region_code'][:2], [127.0, 37.0])
+        lon, lat = base_lon + rng.uniform(-0.5, 0.5), base_lat + rng.uniform(-0.5, 0.5)
+        features.append({
             'type': 'Feature',
             'properties': props,
             'geometry': {
@@ -119,107 +213,367 @@ def create_sample_geojson(properties_list):
                     [lon + 0.25, lat + 0.25],
                     [lon - 0.25, lat + 0.25],
                     [lon - 0.25, lat - 0.25],
-                ]]
-            }
-        }
-        features.append(feature)
-    
+                ]],
+            },
+        })
+    return {'type': 'FeatureCollection', 'features': features}
+
+def write_sample_sources(seed=0):
+    """경계 원본이 없을 때 쓰는 샘플 geo/sido.json, geo/sigungu.json (SIGUNGU_MAP에 없는 시도는 시군 3개씩)"""
+    rng = random.Random(seed)
+    sido = [{'region_code': code, 'region_name': name, 'parent_code': None} for code, name in SIDO_NAMES.items()]
+    sigungu = []
+    for sido_code, sido_name in SIDO_NAMES.items():
+        items = SIGUNGU_MAP.get(sido_code) or [(f"{sido_code}{(i + 1) * 10:02d}", f"{sido_name} 시군{i + 1}") for i in range(3)]
+        sigungu += [{'region_code': code, 'region_name': name, 'parent_code': sido_code} for code, name in items]
+    GEO_DIR.mkdir(parents=True, exist_ok=True)
+    for name, props in (('sido.json', sido), ('sigungu.json', sigungu)):
+        with open(GEO_DIR / name, 'w', encoding='utf-8') as f:
+            json.dump(create_sample_geojson(props, rng), f, ensure_ascii=False, indent=2)
+    return len(sido), len(sigungu)
+
+# ---------- 스트리밍 읽기 ----------
+_FEATURES_START = re.compile(r'"features"\s*:\s*\[')
+_SEPARATORS = re.compile(r'[\s,]*')
+
+def _open_text(path):
+    if path.suffix == '.gz':
+        return gzip.open(path, 'rt', encoding='utf-8')
+    return open(path, encoding='utf-8')
+
+def iter_features(path, chunk_size=READ_CHUNK):
+    """FeatureCollection의 features 배열 원소를 한 개씩 yield (버퍼에는 읽는 중인 feature만 남는다)"""
+    decoder = json.JSONDecoder()
+    with _open_text(path) as f:
+        buf = ''
+        while (m := _FEATURES_START.search(buf)) is None:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            buf = buf[-64:] + chunk
+        pos = m.end()
+        while True:
+            pos = _SEPARATORS.match(buf, pos).end()
+            if pos < len(buf):
+                if buf[pos] == ']':
+                    return
+                try:
+                    feature, pos = decoder.raw_decode(buf, pos)
+                except json.JSONDecodeError:
+                    pass  # 버퍼 끝에서 잘린 feature: 더 읽어서 다시 시도
+                else:
+                    yield feature
+                    continue
+            # 남은 조각만큼은 더 읽어 큰 feature도 재시도 횟수가 로그 수준에 머물게 한다
+            chunk = f.read(max(chunk_size, len(buf) - pos))
+            if not chunk:
+                raise ValueError(f'{path}: features 배열이 닫히지 않았습니다')
+            buf, pos = buf[pos:] + chunk, 0
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(READ_CHUNK), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+# ---------- 정규화 (워커) ----------
+_KNOWN_NAMES = {**SIDO_NAMES, **{code: name for items in SIGUNGU_MAP.values() for code, name in items}}
+
+def _first(props, keys):
+    for key in keys:
+        value = props.get(key)
+        if value not in (None, ''):
+            return str(value)
+    return None
+
+def _ring(ring, precision):
+    # 2D로 자르고 반올림, 반올림 후 연속 중복 점 제거
+    out = []
+    for point in ring:
+        xy = [round(point[0], precision), round(point[1], precision)]
+        if not out or out[-1] != xy:
+            out.append(xy)
+    return out if len(out) >= 4 else None
+
+def _geometry(geometry, precision):
+    if not geometry:
+        return None
+    if geometry.get('type') == 'Polygon':
+        parts = [geometry['coordinates']]
+    elif geometry.get('type') == 'MultiPolygon':
+        parts = geometry['coordinates']
+    else:
+        return None
+    polygons = []
+    for poly in parts:
+        exterior = _ring(poly[0], precision) if poly else None
+        if exterior is not None:
+            holes = (_ring(ring, precision) for ring in poly[1:])
+            polygons.append([exterior, *(h for h in holes if h is not None)])
+    if not polygons:
+        return None
+    if len(polygons) == 1:
+        return {'type': 'Polygon', 'coordinates': polygons[0]}
+    return {'type': 'MultiPolygon', 'coordinates': polygons}
+
+def normalize_feature(feature, parent_digits, precision, code_map=None):
+    """-> (region_code, parent_code, 한 줄 JSON) / 코드나 폴리곤이 없으면 None. code_map은 원본 코드 -> 출력 코드"""
+    props = feature.get('properties') or {}
+    code = _first(props, CODE_KEYS)
+    geometry = _geometry(feature.get('geometry'), precision)
+    if code is None or geometry is None:
+        return None
+    if code_map:
+        code = code_map.get(code, code)
+    parent = _first(props, PARENT_KEYS)
+    if parent is None and parent_digits and len(code) > parent_digits:
+        parent = code[:parent_digits]
+    properties = {
+        'region_code': code,
+        'region_name': _first(props, NAME_KEYS) or _KNOWN_NAMES.get(code, code),
+        'parent_code': parent,
+    }
+    line = json.dumps(
+        {'type': 'Feature', 'properties': properties, 'geometry': geometry},
+        ensure_ascii=False, separators=(',', ':'),
+    )
+    return code, parent, line
+
+def normalize_batch(features, parent_digits, precision, code_map=None):
+    return [normalize_feature(f, parent_digits, precision, code_map) for f in features]
+
+def compress_file(path):
+    """path.gz (+ path.br). 같은 입력이면 같은 바이트가 나오도록 gzip mtime은 0"""
+    data = Path(path).read_bytes()
+    outputs = [f'{path}.gz']
+    with open(outputs[0], 'wb') as raw, gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=9, mtime=0) as gz:
+        gz.write(data)
+    if brotli is not None:
+        outputs.append(f'{path}.br')
+        Path(outputs[1]).write_bytes(brotli.compress(data, quality=11))
+    return outputs
+
+# ---------- 파이프라인 ----------
+class _Inline:
+    """--workers 0: 풀 없이 같은 인터페이스로 실행"""
+
+    def submit(self, fn, *args):
+        future = Future()
+        future.set_result(fn(*args))
+        return future
+
+def _bounded_map(pool, fn, items, *args, window=8):
+    """순서를 지키며 결과를 내보내되, 진행 중인 작업은 window개로 제한 (원본을 미리 다 읽지 않도록)"""
+    pending = deque()
+    for item in items:
+        pending.append(pool.submit(fn, item, *args))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+def _batches(iterable, size):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+class _CollectionWriter:
+    """FeatureCollection을 한 feature씩 이어 쓰고, 닫을 때 원자적으로 교체"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._tmp = self.path.with_name(self.path.name + '.tmp')
+        self._f = open(self._tmp, 'w', encoding='utf-8')
+        self._f.write('{"type":"FeatureCollection","features":[')
+        self.count = 0
+
+    def write(self, line):
+        if self.count:
+            self._f.write(',')
+        self._f.write(line)
+        self.count += 1
+
+    def close(self):
+        self._f.write(']}')
+        self._f.close()
+        os.replace(self._tmp, self.path)
+
+def _rel(path):
+    return Path(path).relative_to(OUT_DIR).as_posix()
+
+def _display(path):
+    # manifest에는 저장소 안의 원본이면 상대 경로로 남긴다
+    path = Path(path).resolve()
+    return path.relative_to(ROOT).as_posix() if path.is_relative_to(ROOT) else str(path)
+
+def load_manifest():
+    path = OUT_DIR / 'manifest.json'
+    if path.is_file():
+        return json.loads(path.read_text(encoding='utf-8'))
+    return {'levels': {}}
+
+def save_manifest(manifest):
+    path = OUT_DIR / 'manifest.json'
+    path.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding='utf-8')
+
+def is_fresh(entry, fingerprint):
+    if not entry or {k: entry.get(k) for k in fingerprint} != fingerprint:
+        return False
+    return all((OUT_DIR / rel).is_file() for rel in entry.get('outputs', ()))
+
+def build_level(level, source, pool, precision, code_map=None):
+    """원본 한 개 -> 레벨 파일 + 상위 지역별 조각. 압축은 풀에서 파일 단위로"""
+    stem, parent_digits = LEVELS[level]
+    shard_dir = OUT_DIR / level
+    if shard_dir.exists():
+        shutil.rmtree(shard_dir)  # 없어진 상위 지역의 조각이 남지 않도록
+    whole = _CollectionWriter(OUT_DIR / f'{stem}.geojson')
+    shards = {}
+    skipped = 0
+    seen = set()
+    batches = _batches(iter_features(source), BATCH_SIZE)
+    for results in _bounded_map(pool, normalize_batch, batches, parent_digits, precision, code_map):
+        for result in results:
+            if result is None or result[0] in seen:
+                skipped += 1
+                continue
+            code, parent, line = result
+            seen.add(code)
+            whole.write(line)
+            if parent_digits and parent:
+                shard = shards.get(parent)
+                if shard is None:
+                    shard = shards[parent] = _CollectionWriter(shard_dir / f'{parent}.geojson')
+                shard.write(line)
+    for writer in (whole, *shards.values()):
+        writer.close()
+
+    written = [whole.path, *(s.path for s in shards.values())]
+    outputs = list(written)
+    for compressed in _bounded_map(pool, compress_file, map(str, written)):
+        outputs += compressed
     return {
-        'type': 'FeatureCollection',
-        'features': features
+        'features': whole.count,
+        'skipped': skipped,
+        'parents': sorted(shards),
+        'outputs': sorted(_rel(p) for p in outputs),
     }
 
-def main():
-    GEO_DIR.mkdir(parents=True, exist_ok=True)
-    MOCK_DIR.mkdir(parents=True, exist_ok=True)
-    
-    print("🔄 GeoJSON 데이터 생성 중...")
-    
-    # 1. SIDO 레벨 GeoJSON
-    sido_features = []
-    sido_kpi = []
-    
-    for code, name in SIDO_NAMES.items():
-        sido_features.append({
-            'region_code': code,
-            'region_name': name,
-            'parent_code': None,
-        })
-        
-        # Mock KPI 데이터
-        value = random.uniform(40, 85)
-        sido_kpi.append({
-            'region_code': code,
-            'region_name': name,
-            'value': round(value, 1),
-            'change_rate': round(random.uniform(-5, 5), 1),
-            'percentile': random.randint(10, 90),
-            'status': 'critical' if value < 50 else 'warning' if value < 70 else 'normal',
-            'computed_at': datetime.now().isoformat() + 'Z',
-        })
-    
-    sido_geojson = create_sample_geojson(sido_features)
-    with open(GEO_DIR / 'sido.json', 'w', encoding='utf-8') as f:
-        json.dump(sido_geojson, f, ensure_ascii=False, indent=2)
-    print(f"✅ {len(sido_features)} Sido GeoJSON 생성: {GEO_DIR / 'sido.json'}")
-    
-    # 2. SIGUNGU 레벨 GeoJSON
-    sigungu_features = []
-    sigungu_kpi = []
-    all_sigungu = []
-    
-    for sido_code in SIDO_NAMES.keys():
-        if sido_code in SIGUNGU_MAP:
-            for sig_code, sig_name in SIGUNGU_MAP[sido_code]:
-                sigungu_features.append({
-                    'region_code': sig_code,
-                    'region_name': sig_name,
-                    'parent_code': sido_code,
-                })
-                all_sigungu.append({
-                    'region_code': sig_code,
-                    'region_name': sig_name,
-                    'value': round(random.uniform(40, 85), 1),
-                    'change_rate': round(random.uniform(-5, 5), 1),
-                    'percentile': random.randint(10, 90),
-                    'status': 'critical' if random.random() < 0.2 else 'warning' if random.random() < 0.4 else 'normal',
-                    'computed_at': datetime.now().isoformat() + 'Z',
-                })
+def check_parents(manifest):
+    """하위 레벨의 상위 코드가 바로 위 레벨 출력에 있는지.
+    시군구 -> 시도가 비면 SystemExit. 읍면동은 저장소의 시군구 경계가 일부뿐이라 경고만 한다"""
+    levels = list(LEVELS)
+    problems = []
+    for upper, level in zip(levels, levels[1:]):
+        entry = manifest['levels'].get(level)
+        upper_path = OUT_DIR / f'{LEVELS[upper][0]}.geojson'
+        if not entry or not upper_path.is_file():
+            continue
+        known = {feature['properties']['region_code'] for feature in iter_features(upper_path)}
+        missing = sorted(set(entry['parents']) - known)
+        if not missing:
+            continue
+        message = f"{level}: {upper}에 없는 상위 코드 {len(missing)}개 ({', '.join(missing[:10])})"
+        if level == 'sigungu':
+            problems.append(message)
         else:
-            # 다른 지역도 예시로 추가
-            for i in range(3):
-                code = f"{sido_code}{(i+1)*10:02d}"
-                name = f"{SIDO_NAMES[sido_code]} 시군{i+1}"
-                sigungu_features.append({
-                    'region_code': code,
-                    'region_name': name,
-                    'parent_code': sido_code,
-                })
-                all_sigungu.append({
-                    'region_code': code,
-                    'region_name': name,
-                    'value': round(random.uniform(40, 85), 1),
-                    'change_rate': round(random.uniform(-5, 5), 1),
-                    'percentile': random.randint(10, 90),
-                    'status': 'critical' if random.random() < 0.2 else 'warning' if random.random() < 0.4 else 'normal',
-                    'computed_at': datetime.now().isoformat() + 'Z',
-                })
-    
-    sigungu_geojson = create_sample_geojson(sigungu_features)
-    with open(GEO_DIR / 'sigungu.json', 'w', encoding='utf-8') as f:
-        json.dump(sigungu_geojson, f, ensure_ascii=False, indent=2)
-    print(f"✅ {len(sigungu_features)} Sigungu GeoJSON 생성: {GEO_DIR / 'sigungu.json'}")
-    
-    # 3. 통합 Mock KPI JSON (모든 레벨)
-    all_kpi = sido_kpi + all_sigungu
+            print(f"⚠️  {message}")
+    if problems:
+        raise SystemExit('❌ ' + '\n❌ '.join(problems))
+
+def write_mock_kpi(seed=0):
+    """정규화된 시도/시군구 코드로 결정적인 Mock KPI (geoApi.ts mock 어댑터용)"""
+    rng = random.Random(seed)
+    computed_at = datetime.now().isoformat() + 'Z'
+    rows = []
+    for level in ('sido', 'sigungu'):
+        path = OUT_DIR / f'{LEVELS[level][0]}.geojson'
+        if not path.is_file():
+            continue
+        for feature in iter_features(path):
+            props = feature['properties']
+            value = round(rng.uniform(40, 85), 1)
+            rows.append({
+                'region_code': props['region_code'],
+                'region_name': props['region_name'],
+                'value': value,
+                'change_rate': round(rng.uniform(-5, 5), 1),
+                'percentile': rng.randint(10, 90),
+                'status': 'critical' if value < 50 else 'warning' if value < 70 else 'normal',
+                'computed_at': computed_at,
+            })
+    MOCK_DIR.mkdir(parents=True, exist_ok=True)
     with open(MOCK_DIR / 'geo-kpi.json', 'w', encoding='utf-8') as f:
-        json.dump(all_kpi, f, ensure_ascii=False, indent=2)
-    print(f"✅ {len(all_kpi)}개 Mock KPI 레코드 생성: {MOCK_DIR / 'geo-kpi.json'}")
-    
-    print("\n✨ 모든 데이터 준비 완료!")
-    print(f"  - Sido: {len(sido_features)}개 지역")
-    print(f"  - Sigungu: {len(sigungu_features)}개 지역")
-    print(f"  - Total KPI: {len(all_kpi)}개 레코드")
+        json.dump(rows, f, ensure_ascii=False, separators=(',', ':'))
+    return len(rows)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='원본 GeoJSON을 정규화해 geo/normalized/에 레벨별/상위 지역별로 저장')
+    for level in LEVELS:
+        default = DEFAULT_SOURCES.get(level)
+        parser.add_argument(f'--{level}', type=Path, default=default,
+                            help=f'{level} 원본 GeoJSON (.gz 가능, 기본 {default.relative_to(ROOT) if default else "없음"})')
+    parser.add_argument('--sido-codes', choices=('sgis', 'admin'), default='sgis',
+                        help='시도 원본의 코드 체계 (기본 sgis: korea.json, admin이면 그대로)')
+    parser.add_argument('--precision', type=int, default=6, help='좌표 소수 자리 (기본 6, 약 0.1m)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='프로세스 수 (0이면 현재 프로세스)')
+    parser.add_argument('--force', action='store_true', help='manifest 해시와 관계없이 다시 생성')
+    parser.add_argument('--mock-kpi', action='store_true', help='public/mock/geo-kpi.json도 다시 생성')
+    parser.add_argument('--sample-sources', action='store_true',
+                        help='SIDO_NAMES/SIGUNGU_MAP으로 샘플 원본 geo/sido.json, geo/sigungu.json(직사각형)을 먼저 다시 생성')
+    args = parser.parse_args(argv)
+
+    if args.sample_sources:
+        sido_count, sigungu_count = write_sample_sources()
+        print(f"✅ 샘플 원본: 시도 {sido_count}개, 시군구 {sigungu_count}개 -> {GEO_DIR}")
+    OUT_DIR.mkdir(parents=True, exist_ok=True)
+    manifest = load_manifest()
+    manifest['version'] = PIPELINE_VERSION
+    pool = ProcessPoolExecutor(args.workers) if args.workers > 0 else _Inline()
+    print(f"🔄 GeoJSON 정규화 -> {OUT_DIR} (workers={args.workers}, brotli={'on' if brotli else 'off'})")
+    try:
+        for level in LEVELS:
+            source = getattr(args, level)
+            if source is None or not source.is_file():
+                print(f"⏭️  {level}: 원본 없음{f' ({source})' if source else ''}")
+                continue
+            fingerprint = {
+                'source_sha256': file_sha256(source),
+                'precision': args.precision,
+                'pipeline': PIPELINE_VERSION,
+            }
+            code_map = None
+            if level == 'sido':
+                fingerprint['codes'] = args.sido_codes
+                code_map = SGIS_SIDO_CODES if args.sido_codes == 'sgis' else None
+            entry = manifest['levels'].get(level)
+            if not args.force and is_fresh(entry, fingerprint):
+                print(f"⏭️  {level}: 변경 없음 ({entry['features']}개)")
+                continue
+            started = time.perf_counter()
+            result = build_level(level, source, pool, args.precision, code_map)
+            manifest['levels'][level] = {'source': _display(source), **fingerprint, **result}
+            save_manifest(manifest)  # 레벨마다 저장해 중간에 실패해도 끝난 레벨은 건너뛰게
+            size = (OUT_DIR / f'{LEVELS[level][0]}.geojson').stat().st_size
+            print(
+                f"✅ {level}: {result['features']}개 (건너뜀 {result['skipped']}), "
+                f"상위 지역 {len(result['parents'])}개, {size / 1024:,.0f} KB, {time.perf_counter() - started:.1f}s"
+            )
+    finally:
+        if isinstance(pool, ProcessPoolExecutor):
+            pool.shutdown()
+    save_manifest(manifest)
+    check_parents(manifest)
+
+    if args.mock_kpi:
+        print(f"✅ {write_mock_kpi()}개 Mock KPI 레코드: {MOCK_DIR / 'geo-kpi.json'}")
 
 if __name__ == '__main__':
     main()